@@ -1,8 +1,10 @@
 import os
 import tempfile
 
+import numpy
+
 from weyfusion.filesystem import create_directory, is_directory, is_file, remove_directory
-from weyfusion.typing import JobStatus
+from weyfusion.typing import Face, JobStatus
 
 
 def is_test_job_file(file_path : str, job_status : JobStatus) -> bool:
@@ -42,3 +44,27 @@ def prepare_test_output_directory() -> bool:
 	remove_directory(test_outputs_directory)
 	create_directory(test_outputs_directory)
 	return is_directory(test_outputs_directory)
+
+
+def create_face() -> Face:
+	return Face(
+		bounding_box = numpy.array([ 10, 20, 30, 40 ], dtype = numpy.float32),
+		score_set =
+		{
+			'detector': 0.9,
+			'landmarker': 0.8
+		},
+		landmark_set =
+		{
+			'5': numpy.ones((5, 2), dtype = numpy.float32),
+			'5/68': numpy.ones((5, 2), dtype = numpy.float32),
+			'68': numpy.zeros((68, 2), dtype = numpy.float32),
+			'68/5': numpy.zeros((68, 2), dtype = numpy.float32)
+		},
+		angle = 90,
+		embedding = numpy.arange(512, dtype = numpy.float32),
+		normed_embedding = numpy.arange(512, dtype = numpy.float32) / 512,
+		gender = 'female',
+		age = range(20, 29),
+		race = 'white'
+	)
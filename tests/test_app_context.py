@@ -0,0 +1,43 @@
+import sys
+import threading
+from typing import List
+from unittest.mock import patch
+
+from weyfusion import state_manager
+from weyfusion.app_context import detect_app_context, init_app_context, reset_app_context, set_app_context
+from weyfusion.typing import AppContext
+
+
+def collect_app_context(app_contexts : List[AppContext]) -> None:
+	app_contexts.append(detect_app_context())
+
+
+def test_detect_app_context() -> None:
+	app_contexts : List[AppContext] = []
+
+	assert detect_app_context() == 'cli'
+
+	init_app_context('ui')
+	app_context_token = set_app_context('cli')
+	thread = threading.Thread(target = collect_app_context, args = (app_contexts,))
+	thread.start()
+	thread.join()
+
+	assert detect_app_context() == 'cli'
+	assert app_contexts == [ 'ui' ]
+
+	reset_app_context(app_context_token)
+
+	assert detect_app_context() == 'ui'
+
+	init_app_context('cli')
+
+	assert detect_app_context() == 'cli'
+
+
+def test_detect_app_context_without_stack_inspection() -> None:
+	with patch('sys._getframe', wraps = sys._getframe) as getframe_mock:
+		assert detect_app_context() == 'cli'
+		state_manager.get_item('face_detector_score')
+
+	getframe_mock.assert_not_called()
@@ -37,3 +37,10 @@ def test_swap_face_to_video() -> None:
 
 	assert subprocess.run(commands).returncode == 0
 	assert is_test_output_file('test-swap-face-to-video.mp4') is True
+
+
+def test_swap_and_enhance_face_to_video() -> None:
+	commands = [ sys.executable, 'weyfusion.py', 'headless-run', '--jobs-path', get_test_jobs_directory(), '--processors', 'face_swapper', 'face_enhancer', '-s', get_test_example_file('source.jpg'), '-t', get_test_example_file('target-240p.mp4'), '-o', get_test_output_file('test-swap-and-enhance-face-to-video.mp4'), '--trim-frame-end', '1' ]
+
+	assert subprocess.run(commands).returncode == 0
+	assert is_test_output_file('test-swap-and-enhance-face-to-video.mp4') is True
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import pytest
+
+from weyfusion.jobs.job_manager import clear_jobs, create_job, init_jobs
+from .helper import get_test_jobs_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	clear_jobs(get_test_jobs_directory())
+	init_jobs(get_test_jobs_directory())
+	create_job('test-job-list-startup')
+
+
+def test_job_list_startup() -> None:
+	commands = [ sys.executable, '-X', 'importtime', 'weyfusion.py', 'job-list', 'drafted', '--jobs-path', get_test_jobs_directory() ]
+	run = subprocess.run(commands, stderr = subprocess.PIPE)
+	module_names = [ line.split('|')[-1].strip() for line in run.stderr.decode().splitlines() if line.startswith('import time:') ]
+
+	assert run.returncode == 0
+	assert 'weyfusion.cli' in module_names
+	assert not [ module_name for module_name in module_names if module_name.split('.')[0] in [ 'cv2', 'numpy', 'onnx', 'onnxruntime', 'scipy' ] ]
+	assert not [ module_name for module_name in module_names if module_name.startswith('weyfusion.processors.modules') ]
+	assert not [ module_name for module_name in module_names if module_name in [ 'weyfusion.core', 'weyfusion.execution', 'weyfusion.processors.core' ] ]
@@ -1,4 +1,7 @@
-from weyfusion.execution import create_inference_execution_providers, get_available_execution_providers, has_execution_provider
+import os
+from unittest.mock import patch
+
+from weyfusion.execution import create_inference_execution_providers, get_available_execution_providers, has_execution_provider, resolve_execution_device_id
 
 
 def test_has_execution_provider() -> None:
@@ -16,9 +19,24 @@ def test_create_inference_execution_providers() -> None:
 		('CUDAExecutionProvider',
 		{
 			'device_id': '1',
-			'cudnn_conv_algo_search': 'EXHAUSTIVE'
+			'cudnn_conv_algo_search': 'EXHAUSTIVE',
+			'arena_extend_strategy': 'kNextPowerOfTwo'
 		}),
 		'CPUExecutionProvider'
 	]
 
-	assert create_inference_execution_providers('1', [ 'cpu', 'cuda' ]) == execution_providers
+	assert create_inference_execution_providers('1', [ 'cpu', 'cuda' ], 'next_power_of_two') == execution_providers
+	assert create_inference_execution_providers('1', [ 'rocm' ], 'disable') == [ ('ROCMExecutionProvider', { 'device_id': '1', 'arena_extend_strategy': 'kSameAsRequested' }) ]
+
+
+def test_resolve_execution_device_id() -> None:
+	with patch.dict(os.environ, clear = True):
+		assert resolve_execution_device_id(2, 'GPU-1234') == '2'
+
+	with patch.dict(os.environ, { 'CUDA_VISIBLE_DEVICES': '3,1' }):
+		assert resolve_execution_device_id(1, 'GPU-1234') == '1'
+		assert resolve_execution_device_id(3, 'GPU-1234') == '0'
+		assert resolve_execution_device_id(0, 'GPU-1234') is None
+
+	with patch.dict(os.environ, { 'CUDA_VISIBLE_DEVICES': 'GPU-12' }):
+		assert resolve_execution_device_id(5, 'GPU-1234') == '0'
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+import numpy
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.face_cache import clear_cache_connections, get_cached_faces, get_cached_source_identity, pack_faces, pack_source_identity, reset_face_cache_context, set_cached_faces, set_cached_source_identity, set_face_cache_context, unpack_faces, unpack_source_identity
+from weyfusion.typing import SourceIdentity
+from .helper import create_face
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	target_path = os.path.join(tempfile.mkdtemp(), 'target.mp4')
+
+	with open(target_path, 'wb') as target_file:
+		target_file.write(os.urandom(1024))
+	state_manager.init_item('cache_path', tempfile.mkdtemp())
+	state_manager.init_item('target_path', target_path)
+	state_manager.init_item('trim_frame_start', None)
+	state_manager.init_item('output_video_fps', 25.0)
+	state_manager.init_item('face_detector_model', 'yoloface')
+	state_manager.init_item('face_detector_size', '640x640')
+	state_manager.init_item('face_detector_angles', [ 0 ])
+	state_manager.init_item('face_detector_score', 0.5)
+	state_manager.init_item('face_landmarker_model', '2dfan4')
+	state_manager.init_item('face_landmarker_score', 0.5)
+
+
+def test_pack_and_unpack_faces() -> None:
+	face = create_face()
+	unpack_face = unpack_faces(*pack_faces([ face ]))[0]
+
+	assert numpy.array_equal(unpack_face.bounding_box, face.bounding_box)
+	assert unpack_face.score_set == face.score_set
+	assert list(unpack_face.landmark_set.keys()) == list(face.landmark_set.keys())
+	assert numpy.array_equal(unpack_face.landmark_set.get('68'), face.landmark_set.get('68'))
+	assert numpy.array_equal(unpack_face.normed_embedding, face.normed_embedding)
+	assert unpack_face.age == face.age
+	assert unpack_faces(*pack_faces([])) == []
+
+
+def test_get_and_set_cached_faces() -> None:
+	vision_frame = numpy.zeros((226, 426, 3), dtype = numpy.uint8)
+
+	set_cached_faces(vision_frame, [ create_face() ])
+	assert get_cached_faces(vision_frame) is None
+
+	face_cache_token = set_face_cache_context(10, vision_frame)
+	assert get_cached_faces(vision_frame) is None
+	set_cached_faces(vision_frame, [ create_face() ])
+	assert len(get_cached_faces(vision_frame)) == 1
+	assert get_cached_faces(vision_frame.copy()) is None
+	reset_face_cache_context(face_cache_token)
+
+	clear_cache_connections()
+	face_cache_token = set_face_cache_context(10, vision_frame)
+	assert len(get_cached_faces(vision_frame)) == 1
+	reset_face_cache_context(face_cache_token)
+
+	face_cache_token = set_face_cache_context(11, vision_frame)
+	assert get_cached_faces(vision_frame) is None
+	set_cached_faces(vision_frame, [])
+	assert get_cached_faces(vision_frame) == []
+	reset_face_cache_context(face_cache_token)
+
+
+def test_pack_and_unpack_source_identity() -> None:
+	source_identity : SourceIdentity =\
+	{
+		'source_face': create_face(),
+		'source_embeddings':
+		{
+			'inswapper_128.onnx': numpy.ones((1, 512))
+		}
+	}
+	temp_source_identity = unpack_source_identity(*pack_source_identity(source_identity))
+
+	assert numpy.array_equal(temp_source_identity.get('source_face').embedding, create_face().embedding)
+	assert numpy.array_equal(temp_source_identity.get('source_embeddings').get('inswapper_128.onnx'), numpy.ones((1, 512)))
+	assert unpack_source_identity(*pack_source_identity({ 'source_face': None, 'source_embeddings': {} })) == { 'source_face': None, 'source_embeddings': {} }
+
+
+def test_get_and_set_cached_source_identity() -> None:
+	assert get_cached_source_identity('identity') is None
+
+	set_cached_source_identity('identity', { 'source_face': create_face(), 'source_embeddings': {} })
+
+	assert numpy.array_equal(get_cached_source_identity('identity').get('source_face').bounding_box, create_face().bounding_box)
+
+	clear_cache_connections()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+from typing import Iterator
+
+import numpy
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.face_store import clear_static_faces, create_frame_hash, get_face_store, get_source_face, get_static_faces, set_source_face, set_static_faces
+from weyfusion.typing import Face
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	face_store_limit = state_manager.get_item('face_store_limit')
+	yield
+	state_manager.init_item('face_store_limit', face_store_limit)
+
+
+def test_create_frame_hash() -> None:
+	vision_frame = numpy.random.randint(0, 255, (226, 426, 3), dtype = numpy.uint8)
+	other_vision_frame = vision_frame.copy()
+	other_vision_frame[100:120, 200:220] = 255 - other_vision_frame[100:120, 200:220]
+
+	assert create_frame_hash(vision_frame) == create_frame_hash(vision_frame.copy())
+	assert create_frame_hash(vision_frame) != create_frame_hash(other_vision_frame)
+	assert create_frame_hash(vision_frame) != create_frame_hash(vision_frame[:, :200])
+	assert create_frame_hash(numpy.zeros((226, 426, 3), dtype = numpy.uint8)) is None
+
+
+def test_static_faces_eviction() -> None:
+	state_manager.init_item('face_store_limit', 2)
+	clear_static_faces()
+	vision_frames = [ numpy.full((226, 426, 3), index + 1, dtype = numpy.uint8) for index in range(3) ]
+
+	set_static_faces(vision_frames[0], [])
+	set_static_faces(vision_frames[1], [])
+	assert get_static_faces(vision_frames[0]) == []
+	set_static_faces(vision_frames[2], [])
+
+	assert get_static_faces(vision_frames[0]) == []
+	assert get_static_faces(vision_frames[1]) is None
+	assert get_static_faces(vision_frames[2]) == []
+	assert len(get_face_store().get('static_faces')) == 2
+	assert get_face_store().get('static_face_counts') ==\
+	{
+		'hits': 3,
+		'misses': 1,
+		'evictions': 1
+	}
+	clear_static_faces()
+
+
+def test_source_face() -> None:
+	source_path = os.path.join(tempfile.mkdtemp(), 'source.jpg')
+	source_face = Face(bounding_box = None, score_set = None, landmark_set = None, angle = 0, embedding = None, normed_embedding = None, gender = None, age = None, race = None)
+	state_manager.init_item('face_detector_score', 0.5)
+
+	with open(source_path, 'wb') as source_file:
+		source_file.write(b'source')
+
+	assert get_source_face(source_path) is None
+	set_source_face(source_path, source_face)
+	assert get_source_face(source_path) == source_face
+
+	state_manager.init_item('face_detector_score', 0.7)
+	assert get_source_face(source_path) is None
+
+	state_manager.init_item('face_detector_score', 0.5)
+	os.utime(source_path, (0, 0))
+	assert get_source_face(source_path) is None
@@ -0,0 +1,95 @@
+import cv2
+import numpy
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.face_tracker import FACE_TRACKER_ANCHORS, clear_face_tracker_anchors, detect_face_tracker_anchor, track_faces
+from weyfusion.typing import Face, VisionFrame
+from .helper import create_face
+
+
+def create_vision_frame(scale : int = 1) -> VisionFrame:
+	vision_frame = numpy.random.default_rng(0).integers(0, 255, (240 * scale, 320 * scale, 3), dtype = numpy.uint8)
+	return cv2.GaussianBlur(vision_frame, (5, 5), 0)
+
+
+def create_track_face() -> Face:
+	face_landmark_5 = numpy.array([ [ 140, 110 ], [ 180, 110 ], [ 160, 130 ], [ 145, 150 ], [ 175, 150 ] ], dtype = numpy.float32)
+	face_landmark_68 = numpy.stack(numpy.meshgrid(numpy.linspace(130, 190, 17), numpy.linspace(100, 160, 4)), axis = -1).reshape(-1, 2).astype(numpy.float32)
+	return create_face()._replace(
+		bounding_box = numpy.array([ 120, 80, 200, 170 ], dtype = numpy.float32),
+		landmark_set =
+		{
+			'5': face_landmark_5,
+			'5/68': face_landmark_5,
+			'68': face_landmark_68,
+			'68/5': face_landmark_68
+		}
+	)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_face_tracker_anchors()
+	state_manager.init_item('target_path', 'target.mp4')
+	state_manager.init_item('face_detector_interval', 4)
+
+
+def test_track_faces() -> None:
+	vision_frame = create_vision_frame()
+	shift_vision_frame = numpy.roll(vision_frame, (3, 5), axis = (0, 1))
+	face = create_track_face()
+
+	assert track_faces(shift_vision_frame, 1) is None
+
+	detect_face_tracker_anchor(vision_frame, 0, [ face ])
+	track_face = track_faces(shift_vision_frame, 1)[0]
+
+	assert numpy.allclose(track_face.bounding_box, face.bounding_box + [ 5, 3, 5, 3 ], atol = 1)
+	assert numpy.allclose(track_face.landmark_set.get('5'), face.landmark_set.get('5') + [ 5, 3 ], atol = 1)
+	assert track_face.normed_embedding is face.normed_embedding
+	assert track_face.gender == face.gender
+	assert track_faces(shift_vision_frame, 4) is None
+	assert len(track_faces(shift_vision_frame, 3)) == 1
+
+
+def test_track_faces_on_scene_cut() -> None:
+	vision_frame = create_vision_frame()
+
+	detect_face_tracker_anchor(vision_frame, 0, [ create_track_face() ])
+	assert track_faces(numpy.zeros_like(vision_frame), 1) is None
+
+
+def test_track_faces_without_interval() -> None:
+	vision_frame = create_vision_frame()
+	state_manager.init_item('face_detector_interval', 1)
+
+	detect_face_tracker_anchor(vision_frame, 0, [ create_track_face() ])
+	assert track_faces(vision_frame, 1) is None
+
+
+def test_track_faces_from_last_detection() -> None:
+	vision_frame = create_vision_frame()
+	shift_vision_frame = numpy.roll(vision_frame, (3, 5), axis = (0, 1))
+
+	detect_face_tracker_anchor(vision_frame, 0, [ create_track_face() ])
+	detect_face_tracker_anchor(vision_frame, 5, [ create_track_face() ])
+
+	assert list(FACE_TRACKER_ANCHORS.keys()) == [ 0, 5 ]
+	assert track_faces(shift_vision_frame, 4) is None
+	assert len(track_faces(shift_vision_frame, 6)) == 1
+	assert len(track_faces(shift_vision_frame, 8)) == 1
+	assert track_faces(shift_vision_frame, 9) is None
+
+
+def test_track_faces_with_downscale() -> None:
+	vision_frame = create_vision_frame(4)
+	shift_vision_frame = numpy.roll(vision_frame, (12, 20), axis = (0, 1))
+	face = create_track_face()
+	face = face._replace(bounding_box = face.bounding_box * 4, landmark_set = { key: value * 4 for key, value in face.landmark_set.items() })
+
+	detect_face_tracker_anchor(vision_frame, 0, [ face ])
+	track_face = track_faces(shift_vision_frame, 1)[0]
+
+	assert FACE_TRACKER_ANCHORS.get(0).get('gray_frame').shape == (480, 640)
+	assert numpy.allclose(track_face.landmark_set.get('5'), face.landmark_set.get('5') + [ 20, 12 ], atol = 4)
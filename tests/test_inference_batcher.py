@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Union
+from unittest.mock import patch
+
+import numpy
+import pytest
+from onnx import TensorProto, helper
+from onnxruntime import GraphOptimizationLevel, InferenceSession
+
+from weyfusion import state_manager
+from weyfusion.inference_batcher import get_batch_context, is_batchable, run_inference, scatter_batch_outputs
+from weyfusion.inference_manager import create_session_options, group_inference_tasks, submit_inference_task
+from weyfusion.typing import BatchRequest
+
+
+def create_double_session(batch_axis : Union[str, int]) -> InferenceSession:
+	input_node = helper.make_tensor_value_info('input', TensorProto.FLOAT, [ batch_axis, 3 ])
+	output_node = helper.make_tensor_value_info('output', TensorProto.FLOAT, [ batch_axis, 3 ])
+	graph = helper.make_graph([ helper.make_node('Add', [ 'input', 'input' ], [ 'output' ]) ], 'double', [ input_node ], [ output_node ])
+	model = helper.make_model(graph, opset_imports = [ helper.make_opsetid('', 13) ])
+	model.ir_version = 8
+	return InferenceSession(model.SerializeToString(), providers = [ 'CPUExecutionProvider' ])
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('execution_batch_size', 4)
+	state_manager.init_item('execution_batch_latency', 50)
+	state_manager.init_item('execution_device_ids', [ '0' ])
+
+
+def test_is_batchable() -> None:
+	assert is_batchable(create_double_session('batch')) is True
+	assert is_batchable(create_double_session(1)) is False
+
+
+def test_run_inference() -> None:
+	inference_session = create_double_session('batch')
+	input_frames = [ numpy.full((1, 3), index, dtype = numpy.float32) for index in range(8) ]
+
+	with ThreadPoolExecutor(max_workers = 4) as executor:
+		outputs = list(executor.map(lambda input_frame : run_inference(inference_session, { 'input': input_frame })[0], input_frames))
+
+	for input_frame, output in zip(input_frames, outputs):
+		assert numpy.array_equal(output, input_frame * 2)
+	assert get_batch_context(inference_session).get('requests') == []
+
+
+def test_run_inference_with_fixed_batch() -> None:
+	inference_session = create_double_session(1)
+	input_frame = numpy.ones((1, 3), dtype = numpy.float32)
+
+	assert numpy.array_equal(run_inference(inference_session, { 'input': input_frame })[0], input_frame * 2)
+
+
+def test_run_inference_without_batch_size() -> None:
+	inference_session = create_double_session('batch')
+	input_frame = numpy.ones((1, 3), dtype = numpy.float32)
+	state_manager.init_item('execution_batch_size', None)
+
+	try:
+		assert numpy.array_equal(run_inference(inference_session, { 'input': input_frame })[0], input_frame * 2)
+	finally:
+		state_manager.init_item('execution_batch_size', 4)
+
+
+def test_scatter_batch_outputs() -> None:
+	inference_session = create_double_session('batch')
+	batch_requests : List[BatchRequest] =\
+	[
+		{ 'inputs': { 'input': numpy.full((2, 3), index, dtype = numpy.float32) }, 'outputs': None, 'exception': None } for index in range(3)
+	]
+	scatter_batch_outputs(batch_requests, inference_session)
+
+	for index, batch_request in enumerate(batch_requests):
+		assert numpy.array_equal(batch_request.get('outputs')[0], numpy.full((2, 3), index * 2, dtype = numpy.float32))
+
+
+def test_run_inference_with_queue() -> None:
+	inference_session = create_double_session('batch')
+	input_frames = [ numpy.full((1, 3), index, dtype = numpy.float32) for index in range(8) ]
+
+	with patch('weyfusion.inference_manager.has_inference_queue', return_value = True):
+		with ThreadPoolExecutor(max_workers = 4) as executor:
+			outputs = list(executor.map(lambda input_frame : run_inference(inference_session, { 'input': input_frame })[0], input_frames))
+
+	for input_frame, output in zip(input_frames, outputs):
+		assert numpy.array_equal(output, input_frame * 2)
+
+
+def test_submit_inference_task() -> None:
+	inference_session = create_double_session(1)
+	input_frame = numpy.ones((1, 3), dtype = numpy.float32)
+
+	assert numpy.array_equal(submit_inference_task(inference_session, { 'input': input_frame }, 1).result()[0], input_frame * 2)
+
+	with pytest.raises(Exception):
+		submit_inference_task(inference_session, { 'input': numpy.ones((2, 4), dtype = numpy.float32) }, 1).result()
+
+
+def test_submit_inference_task_with_failing_dispatch() -> None:
+	inference_session = create_double_session(1)
+	input_frame = numpy.ones((1, 3), dtype = numpy.float32)
+
+	with patch('weyfusion.inference_manager.group_inference_tasks', side_effect = RuntimeError):
+		with pytest.raises(RuntimeError):
+			submit_inference_task(inference_session, { 'input': input_frame }, 1).result(timeout = 5)
+
+	inference_future = submit_inference_task(inference_session, { 'input': input_frame }, 1)
+	inference_future.cancel()
+
+	assert numpy.array_equal(submit_inference_task(inference_session, { 'input': input_frame }, 1).result(timeout = 5)[0], input_frame * 2)
+
+
+def test_group_inference_tasks() -> None:
+	inference_session_1 = create_double_session('batch')
+	inference_session_2 = create_double_session('batch')
+	inference_tasks =\
+	[
+		{ 'inference_session': inference_session_1, 'inputs': {}, 'batch_size': 2, 'future': None },
+		{ 'inference_session': inference_session_2, 'inputs': {}, 'batch_size': 2, 'future': None },
+		{ 'inference_session': inference_session_1, 'inputs': {}, 'batch_size': 2, 'future': None },
+		{ 'inference_session': inference_session_1, 'inputs': {}, 'batch_size': 2, 'future': None },
+		{ 'inference_session': inference_session_2, 'inputs': {}, 'batch_size': 1, 'future': None }
+	]
+
+	assert [ len(inference_task_group) for inference_task_group in group_inference_tasks(inference_tasks) ] == [ 2, 1, 1, 1 ] #type:ignore[arg-type]
+
+
+def test_create_session_options() -> None:
+	session_options = create_session_options([ 'cpu' ])
+
+	assert session_options.intra_op_num_threads == max(1, (os.cpu_count() or 1) // 4)
+	assert session_options.inter_op_num_threads == 1
+	assert session_options.graph_optimization_level == GraphOptimizationLevel.ORT_ENABLE_ALL
+	assert session_options.enable_cpu_mem_arena is True
+	assert session_options.enable_mem_pattern is True
+	assert create_session_options([ 'directml' ]).enable_mem_pattern is False
+
+	state_manager.init_item('execution_intra_op_thread_count', 2)
+	state_manager.init_item('execution_inter_op_thread_count', 3)
+	state_manager.init_item('execution_graph_optimization', 'basic')
+	state_manager.init_item('execution_memory_arena', 'disable')
+	state_manager.init_item('execution_skip_memory_pattern', True)
+
+	try:
+		session_options = create_session_options([ 'cpu' ])
+
+		assert session_options.intra_op_num_threads == 2
+		assert session_options.inter_op_num_threads == 3
+		assert session_options.graph_optimization_level == GraphOptimizationLevel.ORT_ENABLE_BASIC
+		assert session_options.enable_cpu_mem_arena is False
+		assert session_options.enable_mem_pattern is False
+	finally:
+		for state_key in [ 'execution_intra_op_thread_count', 'execution_inter_op_thread_count', 'execution_graph_optimization', 'execution_memory_arena', 'execution_skip_memory_pattern' ]:
+			state_manager.init_item(state_key, None)
@@ -1,31 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
 from unittest.mock import patch
 
 import pytest
 from onnxruntime import InferenceSession
 
 from weyfusion import content_analyser, state_manager
-from weyfusion.inference_manager import INFERENCE_POOLS, get_inference_pool
+from weyfusion.inference_manager import INFERENCE_POOLS, INFERENCE_SESSION_POOLS, checkout_inference_session, clear_inference_pool, get_inference_pool, release_inference_pools, reset_execution_device_context, retain_inference_pools, set_execution_device_context
 
 
 @pytest.fixture(scope = 'module', autouse = True)
 def before_all() -> None:
-	state_manager.init_item('execution_device_id', 0)
+	state_manager.init_item('execution_device_ids', [ '0' ])
 	state_manager.init_item('execution_providers', [ 'cpu' ])
 	state_manager.init_item('download_providers', [ 'github' ])
 	content_analyser.pre_check()
 
 
+def hold_inference_session(inference_session : InferenceSession) -> InferenceSession:
+	with checkout_inference_session(inference_session) as checkout_session:
+		sleep(0.01)
+		return checkout_session
+
+
 def test_get_inference_pool() -> None:
 	model_sources = content_analyser.get_model_options().get('sources')
 
 	with patch('weyfusion.inference_manager.detect_app_context', return_value = 'cli'):
 		get_inference_pool('test', model_sources)
 
-		assert isinstance(INFERENCE_POOLS.get('cli').get('test.cpu').get('content_analyser'), InferenceSession)
+		assert isinstance(INFERENCE_POOLS.get('cli').get('test.0.cpu').get('content_analyser'), InferenceSession)
 
 	with patch('weyfusion.inference_manager.detect_app_context', return_value = 'ui'):
 		get_inference_pool('test', model_sources)
 
-		assert isinstance(INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser'), InferenceSession)
+		assert isinstance(INFERENCE_POOLS.get('ui').get('test.0.cpu').get('content_analyser'), InferenceSession)
+
+	assert INFERENCE_POOLS.get('cli').get('test.0.cpu').get('content_analyser') == INFERENCE_POOLS.get('ui').get('test.0.cpu').get('content_analyser')
+
+
+def test_retain_inference_pools() -> None:
+	model_sources = content_analyser.get_model_options().get('sources')
+
+	with patch('weyfusion.inference_manager.detect_app_context', return_value = 'cli'):
+		retain_inference_pools()
+		get_inference_pool('test-retain', model_sources)
+		clear_inference_pool('test-retain')
+		release_inference_pools(True)
+
+		assert INFERENCE_POOLS.get('cli').get('test-retain.0.cpu')
+
+		retain_inference_pools()
+		get_inference_pool('test-retain', model_sources)
+		clear_inference_pool('test-retain')
+		release_inference_pools(True)
+
+		assert INFERENCE_POOLS.get('cli').get('test-retain.0.cpu')
+
+		retain_inference_pools()
+		release_inference_pools(True)
+
+		assert INFERENCE_POOLS.get('cli').get('test-retain.0.cpu') is None
+
+		retain_inference_pools()
+		get_inference_pool('test-retain', model_sources)
+		clear_inference_pool('test-retain')
+		release_inference_pools(False)
+
+		assert INFERENCE_POOLS.get('cli').get('test-retain.0.cpu') is None
+
+		get_inference_pool('test-retain', model_sources)
+		clear_inference_pool('test-retain')
+
+		assert INFERENCE_POOLS.get('cli').get('test-retain.0.cpu') is None
+
+
+def test_checkout_inference_session() -> None:
+	model_sources = content_analyser.get_model_options().get('sources')
+	state_manager.init_item('execution_session_limits', [ 'test-checkout:2' ])
+
+	with patch('weyfusion.inference_manager.detect_app_context', return_value = 'cli'):
+		inference_session = get_inference_pool('test-checkout', model_sources).get('content_analyser')
+
+		assert INFERENCE_SESSION_POOLS.get(inference_session).qsize() == 2
+
+		with checkout_inference_session(inference_session) as checkout_session_1, checkout_inference_session(inference_session) as checkout_session_2:
+			assert checkout_session_1 is not checkout_session_2
+			assert INFERENCE_SESSION_POOLS.get(inference_session).qsize() == 0
+
+		with ThreadPoolExecutor(max_workers = 4) as executor:
+			checkout_sessions = list(executor.map(lambda _ : hold_inference_session(inference_session), range(8)))
+
+		assert len(set(checkout_sessions)) <= 2
+
+		clear_inference_pool('test-checkout')
+
+		assert inference_session not in INFERENCE_SESSION_POOLS
+
+	state_manager.init_item('execution_session_limits', None)
+
+
+def test_get_inference_pool_per_device() -> None:
+	model_sources = content_analyser.get_model_options().get('sources')
+	state_manager.init_item('execution_device_ids', [ '0', '1' ])
+
+	with patch('weyfusion.inference_manager.detect_app_context', return_value = 'cli'):
+		get_inference_pool('test-device', model_sources)
+		execution_device_token = set_execution_device_context('1')
+		get_inference_pool('test-device', model_sources)
+		reset_execution_device_context(execution_device_token)
+
+		assert INFERENCE_POOLS.get('cli').get('test-device.0.cpu').get('content_analyser') != INFERENCE_POOLS.get('cli').get('test-device.1.cpu').get('content_analyser')
+
+		clear_inference_pool('test-device')
+
+		assert INFERENCE_POOLS.get('cli').get('test-device.0.cpu') is None
+		assert INFERENCE_POOLS.get('cli').get('test-device.1.cpu') is None
 
-	assert INFERENCE_POOLS.get('cli').get('test.cpu').get('content_analyser') == INFERENCE_POOLS.get('ui').get('test.cpu').get('content_analyser')
+	state_manager.init_item('execution_device_ids', [ '0' ])
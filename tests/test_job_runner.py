@@ -1,18 +1,24 @@
 import subprocess
+import tempfile
+from typing import Iterator
 
 import pytest
 
 from weyfusion import state_manager
 from weyfusion.download import conditional_download
 from weyfusion.filesystem import copy_file
-from weyfusion.jobs.job_manager import add_step, clear_jobs, create_job, init_jobs, submit_job, submit_jobs
-from weyfusion.jobs.job_runner import collect_output_set, finalize_steps, run_job, run_jobs, run_steps
+from weyfusion.jobs.job_helper import get_step_output_path
+from weyfusion.jobs.job_manager import add_step, clear_jobs, create_job, get_steps, init_jobs, submit_job, submit_jobs
+from weyfusion.jobs.job_runner import collect_output_set, create_step_dependencies, finalize_steps, run_job, run_jobs, run_steps
 from weyfusion.typing import Args
 from .helper import get_test_example_file, get_test_examples_directory, get_test_jobs_directory, get_test_output_file, is_test_output_file, prepare_test_output_directory
 
 
 @pytest.fixture(scope = 'module', autouse = True)
-def before_all() -> None:
+def before_all() -> Iterator[None]:
+	temp_path = state_manager.get_item('temp_path')
+	log_level = state_manager.get_item('log_level')
+
 	conditional_download(get_test_examples_directory(),
 	[
 		'https://github.com/weyfusion/weyfusion-assets/releases/download/examples-3.0.0/source.jpg',
@@ -20,6 +26,11 @@ def before_all() -> None:
 	])
 	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vframes', '1', get_test_example_file('target-240p.jpg') ])
 	state_manager.init_item('output_audio_encoder', 'aac')
+	state_manager.init_item('temp_path', tempfile.gettempdir())
+	state_manager.init_item('log_level', 'info')
+	yield
+	state_manager.init_item('temp_path', temp_path)
+	state_manager.init_item('log_level', log_level)
 
 
 @pytest.fixture(scope = 'function', autouse = True)
@@ -33,6 +44,10 @@ def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 	return copy_file(step_args.get('target_path'), step_args.get('output_path'))
 
 
+def process_failing_step(job_id : str, step_index : int, step_args : Args) -> bool:
+	raise RuntimeError(step_args.get('output_path'))
+
+
 def test_run_job() -> None:
 	args_1 =\
 	{
@@ -145,6 +160,66 @@ def test_run_steps() -> None:
 	assert run_steps('job-test-run-steps', process_step) is True
 
 
+def test_run_concurrent_steps() -> None:
+	args_1 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-1.mp4')
+	}
+	args_2 =\
+	{
+		'source_path': get_test_example_file('source.jpg'),
+		'target_path': get_test_example_file('source.jpg'),
+		'output_path': get_test_output_file('output-1.jpg')
+	}
+
+	create_job('job-test-run-concurrent-steps')
+	add_step('job-test-run-concurrent-steps', args_1)
+	add_step('job-test-run-concurrent-steps', args_2)
+	add_step('job-test-run-concurrent-steps', args_1)
+	state_manager.init_item('job_step_concurrency', 2)
+
+	try:
+		assert run_steps('job-test-run-concurrent-steps', process_step) is True
+		assert [ step.get('status') for step in get_steps('job-test-run-concurrent-steps') ] == [ 'completed', 'completed', 'completed' ]
+
+		create_job('job-test-run-concurrent-failing-steps')
+		add_step('job-test-run-concurrent-failing-steps', args_1)
+		add_step('job-test-run-concurrent-failing-steps', args_2)
+
+		assert run_steps('job-test-run-concurrent-failing-steps', process_failing_step) is False
+		assert [ step.get('status') for step in get_steps('job-test-run-concurrent-failing-steps') ] == [ 'failed', 'failed' ]
+	finally:
+		state_manager.init_item('job_step_concurrency', 1)
+
+
+def test_create_step_dependencies() -> None:
+	args_1 =\
+	{
+		'target_path': get_test_example_file('target-240p.mp4'),
+		'output_path': get_test_output_file('output-1.mp4')
+	}
+	args_2 =\
+	{
+		'target_path': get_test_example_file('source.jpg'),
+		'output_path': get_test_output_file('output-1.jpg')
+	}
+	args_3 =\
+	{
+		'target_path': get_step_output_path('job-test-create-step-dependencies', 1, get_test_output_file('output-1.jpg')),
+		'output_path': get_test_output_file('output-2.jpg')
+	}
+
+	create_job('job-test-create-step-dependencies')
+	add_step('job-test-create-step-dependencies', args_1)
+	add_step('job-test-create-step-dependencies', args_2)
+	add_step('job-test-create-step-dependencies', args_3)
+	add_step('job-test-create-step-dependencies', args_1)
+
+	assert create_step_dependencies('job-test-create-step-dependencies', get_steps('job-test-create-step-dependencies')) == [ [], [], [ 1 ], [ 0 ] ]
+
+
 def test_finalize_steps() -> None:
 	args_1 =\
 	{
@@ -0,0 +1,136 @@
+import os
+import subprocess
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.filesystem import copy_file, create_directory, is_file
+from weyfusion.jobs.job_manager import add_step, clear_jobs, create_job, find_job_ids, get_steps, init_jobs, set_step_status, submit_job
+from weyfusion.jobs.job_worker import claim_lease, get_heartbeat_path, get_lease_path, get_step_lease_name, get_worker_id, init_worker, read_lease_owner, reclaim_lease, release_lease, run_worker, start_heartbeat, stop_heartbeat
+from weyfusion.typing import Args
+from .helper import get_test_example_file, get_test_examples_directory, get_test_jobs_directory, get_test_output_file, is_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	create_directory(get_test_examples_directory())
+	subprocess.run([ 'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=size=320x240', '-vframes', '1', get_test_example_file('target-240p-worker.jpg') ])
+	state_manager.init_item('job_lease_timeout', 10)
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	clear_jobs(get_test_jobs_directory())
+	init_jobs(get_test_jobs_directory())
+	init_worker()
+	prepare_test_output_directory()
+
+
+def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
+	return copy_file(step_args.get('target_path'), step_args.get('output_path'))
+
+
+def create_lease(lease_name : str, lease_owner : str) -> None:
+	create_directory(get_lease_path(lease_name))
+
+	with open(os.path.join(get_lease_path(lease_name), 'owner'), 'w') as owner_file:
+		owner_file.write(lease_owner)
+
+
+def test_claim_lease() -> None:
+	start_heartbeat()
+
+	assert claim_lease('job-test-claim-lease.0.lease') is True
+	assert claim_lease('job-test-claim-lease.0.lease') is False
+	assert reclaim_lease('job-test-claim-lease.0.lease') is False
+	assert release_lease('job-test-claim-lease.0.lease') is True
+	assert claim_lease('job-test-claim-lease.0.lease') is True
+
+	stop_heartbeat()
+
+
+def test_reclaim_lease() -> None:
+	create_lease('job-test-reclaim-lease.0.lease', 'worker-gone')
+	start_heartbeat()
+
+	assert claim_lease('job-test-reclaim-lease.0.lease') is False
+	assert release_lease('job-test-reclaim-lease.0.lease') is False
+	assert reclaim_lease('job-test-reclaim-lease.0.lease') is True
+	assert claim_lease('job-test-reclaim-lease.0.lease') is True
+
+	stop_heartbeat()
+
+
+def test_reclaim_lease_with_fresh_owner() -> None:
+	start_heartbeat()
+
+	assert claim_lease('job-test-reclaim-fresh.0.lease') is True
+
+	with patch('weyfusion.jobs.job_worker.is_lease_expired', return_value = True):
+		assert reclaim_lease('job-test-reclaim-fresh.0.lease') is False
+
+	assert read_lease_owner(get_lease_path('job-test-reclaim-fresh.0.lease')) == get_worker_id()
+	assert release_lease('job-test-reclaim-fresh.0.lease') is True
+
+	stop_heartbeat()
+
+
+def test_stop_heartbeat() -> None:
+	heartbeat_path = get_heartbeat_path(get_worker_id())
+	touch_start_event = threading.Event()
+	touch_end_event = threading.Event()
+
+	def touch_heartbeat(worker_id : str) -> bool:
+		touch_start_event.set()
+		time.sleep(0.5)
+		with open(heartbeat_path, 'a'):
+			os.utime(heartbeat_path)
+		touch_end_event.set()
+		return True
+
+	state_manager.init_item('job_lease_timeout', 1)
+	start_heartbeat()
+
+	with patch('weyfusion.jobs.job_worker.touch_heartbeat', side_effect = touch_heartbeat):
+		assert touch_start_event.wait(2)
+		assert stop_heartbeat() is True
+		assert touch_end_event.wait(2)
+
+	assert is_file(heartbeat_path) is False
+
+	state_manager.init_item('job_lease_timeout', 10)
+
+
+def test_run_worker() -> None:
+	args_1 =\
+	{
+		'target_path': get_test_example_file('target-240p-worker.jpg'),
+		'output_path': get_test_output_file('output-1.jpg')
+	}
+	args_2 =\
+	{
+		'target_path': get_test_example_file('target-240p-worker.jpg'),
+		'output_path': get_test_output_file('output-2.jpg')
+	}
+
+	assert run_worker(process_step) is True
+
+	create_job('job-test-run-worker-1')
+	add_step('job-test-run-worker-1', args_1)
+	submit_job('job-test-run-worker-1')
+	create_job('job-test-run-worker-2')
+	add_step('job-test-run-worker-2', args_2)
+	add_step('job-test-run-worker-2', args_2)
+	submit_job('job-test-run-worker-2')
+	set_step_status('job-test-run-worker-2', 0, 'started')
+	create_lease(get_step_lease_name('job-test-run-worker-2', 0), 'worker-gone')
+
+	assert run_worker(process_step) is True
+	assert find_job_ids('completed') == [ 'job-test-run-worker-1', 'job-test-run-worker-2' ]
+	assert [ step.get('status') for step in get_steps('job-test-run-worker-2') ] == [ 'completed', 'completed' ]
+	assert is_test_output_file('output-1.jpg') is True
+	assert is_test_output_file('output-2.jpg') is True
+	assert os.listdir(os.path.dirname(get_lease_path('job-test-run-worker-2'))) == []
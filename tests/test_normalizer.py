@@ -1,4 +1,4 @@
-from weyfusion.normalizer import normalize_fps, normalize_padding
+from weyfusion.normalizer import normalize_fps, normalize_padding, normalize_session_limits
 
 
 def test_normalize_padding() -> None:
@@ -14,3 +14,10 @@ def test_normalize_fps() -> None:
 	assert normalize_fps(25.0) == 25.0
 	assert normalize_fps(61.0) == 60.0
 	assert normalize_fps(None) is None
+
+
+def test_normalize_session_limits() -> None:
+	assert normalize_session_limits([ 'face_detector:2', 'face_swapper:4' ]) == { 'face_detector': 2, 'face_swapper': 4 }
+	assert normalize_session_limits([ 'face_detector:32' ]) == { 'face_detector': 16 }
+	assert normalize_session_limits([ 'face_detector', 'face_swapper:many', ':2' ]) == {}
+	assert normalize_session_limits(None) == {}
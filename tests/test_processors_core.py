@@ -0,0 +1,118 @@
+import subprocess
+from queue import Queue
+from typing import Iterator, Optional
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from weyfusion import process_manager, state_manager
+from weyfusion.download import conditional_download
+from weyfusion.face_store import clear_static_faces, get_static_faces, set_static_faces
+from weyfusion.processors.core import calc_stage_queue_limit, create_queue_payloads, forward_static_faces, get_processors_modules, read_fused_frames
+from weyfusion.typing import FramePayload
+from weyfusion.vision import clear_video_frame_readers, get_video_frame, read_image
+from .helper import create_face, get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	conditional_download(get_test_examples_directory(),
+	[
+		'https://github.com/weyfusion/weyfusion-assets/releases/download/examples-3.0.0/target-240p.mp4'
+	])
+	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vframes', '1', get_test_example_file('target-240p.jpg') ])
+	subprocess.run([ 'ffmpeg', '-i', get_test_example_file('target-240p.mp4'), '-vf', 'fps=25', get_test_example_file('target-240p-25fps.mp4') ])
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	state_items = { key: state_manager.get_item(key) for key in [ 'processors', 'target_path', 'trim_frame_start', 'trim_frame_end' ] }
+	yield
+	for key, value in state_items.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+
+
+def test_forward_static_faces() -> None:
+	face_debugger_module, frame_enhancer_module, lip_syncer_module = get_processors_modules([ 'face_debugger', 'frame_enhancer', 'lip_syncer' ])
+	target_vision_frame = numpy.random.randint(0, 255, (226, 426, 3), dtype = numpy.uint8)
+	face = create_face()
+
+	clear_static_faces()
+	set_static_faces(target_vision_frame, [ face ])
+
+	output_vision_frame = numpy.random.randint(0, 255, (226, 426, 3), dtype = numpy.uint8)
+	forward_static_faces(lip_syncer_module, target_vision_frame, output_vision_frame)
+
+	assert get_static_faces(output_vision_frame) is None
+
+	forward_static_faces(face_debugger_module, target_vision_frame, output_vision_frame)
+
+	assert get_static_faces(output_vision_frame) == [ face ]
+
+	output_vision_frame = numpy.random.randint(0, 255, (452, 852, 3), dtype = numpy.uint8)
+	forward_static_faces(frame_enhancer_module, target_vision_frame, output_vision_frame)
+	output_face = get_static_faces(output_vision_frame)[0]
+
+	assert numpy.array_equal(output_face.bounding_box, face.bounding_box * 2)
+	assert numpy.array_equal(output_face.landmark_set.get('5/68'), face.landmark_set.get('5/68') * 2)
+	assert numpy.array_equal(output_face.embedding, face.embedding)
+
+	output_vision_frame = numpy.random.randint(0, 255, (452, 426, 3), dtype = numpy.uint8)
+	forward_static_faces(frame_enhancer_module, target_vision_frame, output_vision_frame)
+
+	assert get_static_faces(output_vision_frame) is None
+
+
+def test_forward_static_faces_with_geometry() -> None:
+	face_swapper_module = get_processors_modules([ 'face_swapper' ])[0]
+	target_vision_frame = numpy.random.randint(0, 255, (226, 426, 3), dtype = numpy.uint8)
+	output_vision_frame = numpy.random.randint(0, 255, (226, 426, 3), dtype = numpy.uint8)
+	face = create_face()
+	embedding = numpy.ones(512, dtype = numpy.float32)
+
+	clear_static_faces()
+	set_static_faces(target_vision_frame, [ face ])
+
+	with patch('weyfusion.processors.core.calc_embedding', return_value = (embedding, embedding)), patch('weyfusion.processors.core.classify_face', return_value = ('male', range(30, 39), 'asian')):
+		forward_static_faces(face_swapper_module, target_vision_frame, output_vision_frame)
+	output_face = get_static_faces(output_vision_frame)[0]
+
+	assert numpy.array_equal(output_face.bounding_box, face.bounding_box)
+	assert numpy.array_equal(output_face.embedding, embedding)
+	assert output_face.gender == 'male'
+
+
+def test_calc_stage_queue_limit() -> None:
+	state_manager.init_item('execution_thread_count', 4)
+	state_manager.init_item('execution_queue_count', 2)
+
+	assert calc_stage_queue_limit() == 8
+
+
+def test_read_fused_frames() -> None:
+	state_manager.init_item('processors', [ 'expression_restorer' ])
+	state_manager.init_item('target_path', get_test_example_file('target-240p-25fps.mp4'))
+	state_manager.init_item('trim_frame_start', 10)
+	state_manager.init_item('trim_frame_end', None)
+	queue_payloads = create_queue_payloads([ get_test_example_file('target-240p.jpg') ])
+	read_queue : Queue[Optional[FramePayload]] = Queue()
+
+	process_manager.start()
+	read_fused_frames(queue_payloads, 5, 25.0, read_queue, 1)
+	frame_payload = read_queue.get()
+
+	assert frame_payload.get('frame_number') == 5
+	assert numpy.array_equal(frame_payload.get('source_vision_frame'), get_video_frame(get_test_example_file('target-240p-25fps.mp4'), 16))
+	assert numpy.array_equal(frame_payload.get('vision_frame'), read_image(get_test_example_file('target-240p.jpg')))
+	assert read_queue.get() is None
+
+	state_manager.init_item('processors', [ 'face_swapper' ])
+	read_fused_frames(queue_payloads, 5, 25.0, read_queue, 1)
+	frame_payload = read_queue.get()
+
+	assert frame_payload.get('source_vision_frame') is None
+	assert read_queue.get() is None
+
+	process_manager.end()
+	clear_video_frame_readers()
@@ -0,0 +1,43 @@
+import subprocess
+import tempfile
+
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.filesystem import create_directory
+from weyfusion.jobs import job_store
+from weyfusion.segment_manager import complete_video_segment, create_video_segments, get_segment_path, init_segment_manifest
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	create_directory(get_test_examples_directory())
+	subprocess.run([ 'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=size=320x240:rate=25', '-t', '4', '-c:v', 'libx264', '-g', '25', '-pix_fmt', 'yuv420p', get_test_example_file('target-240p-keyframes.mp4') ])
+	state_manager.init_item('temp_path', tempfile.mkdtemp())
+	state_manager.init_item('target_path', get_test_example_file('target-240p-keyframes.mp4'))
+	job_store.register_step_keys([ 'trim_frame_start' ])
+
+
+def test_create_video_segments() -> None:
+	video_segments = create_video_segments(get_test_example_file('target-240p-keyframes.mp4'), 10, 100, 20)
+
+	assert [ (video_segment.get('frame_start'), video_segment.get('frame_end')) for video_segment in video_segments ] == [ (10, 50), (50, 75), (75, 100) ]
+	assert create_video_segments(get_test_example_file('target-240p-keyframes.mp4'), 0, 100, 100)[0].get('frame_end') == 100
+
+
+def test_init_segment_manifest() -> None:
+	target_path = get_test_example_file('target-240p-keyframes.mp4')
+	segment_manifest = init_segment_manifest(target_path, create_video_segments(target_path, 0, 100, 25))
+
+	assert len(segment_manifest.get('segments')) == 4
+	assert complete_video_segment(target_path, segment_manifest, 0)
+	assert init_segment_manifest(target_path, create_video_segments(target_path, 0, 100, 25)).get('segments')[0].get('is_completed') is False
+
+	with open(get_segment_path(target_path, 0), 'wb') as segment_file:
+		segment_file.write(b'segment')
+	assert complete_video_segment(target_path, segment_manifest, 0)
+	assert init_segment_manifest(target_path, create_video_segments(target_path, 0, 100, 25)).get('segments')[0].get('is_completed') is True
+
+	state_manager.init_item('trim_frame_start', 10)
+	assert init_segment_manifest(target_path, create_video_segments(target_path, 0, 100, 25)).get('segments')[0].get('is_completed') is False
@@ -0,0 +1,73 @@
+import subprocess
+import tempfile
+from typing import List
+from unittest.mock import patch
+
+import numpy
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.face_cache import clear_cache_connections, set_cached_source_identity
+from weyfusion.filesystem import create_directory
+from weyfusion.source_identity import clear_identity_keys, clear_source_identities, create_identity_key, get_source_identity_embedding, get_source_identity_face
+from weyfusion.typing import Embedding, Face
+from .helper import create_face, get_test_example_file, get_test_examples_directory
+
+PREPARE_CALLS : List[Face] = []
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	create_directory(get_test_examples_directory())
+	subprocess.run([ 'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=size=320x240', '-vframes', '1', get_test_example_file('source-identity.jpg') ])
+	state_manager.init_item('cache_path', tempfile.mkdtemp())
+	state_manager.init_item('face_detector_model', 'yoloface')
+	state_manager.init_item('face_detector_size', '640x640')
+	state_manager.init_item('face_detector_angles', [ 0 ])
+	state_manager.init_item('face_detector_score', 0.5)
+	state_manager.init_item('face_landmarker_model', '2dfan4')
+	state_manager.init_item('face_landmarker_score', 0.5)
+
+
+def prepare_source_embedding(source_face : Face) -> Embedding:
+	PREPARE_CALLS.append(source_face)
+	return source_face.embedding.reshape(1, -1) * 2
+
+
+def test_create_identity_key() -> None:
+	identity_key = create_identity_key([ get_test_example_file('source-identity.jpg') ])
+
+	assert create_identity_key([ get_test_example_file('source-identity.jpg'), 'invalid.mp3' ]) == identity_key
+	with patch('weyfusion.source_identity.create_target_fingerprint', return_value = 'fingerprint') as create_target_fingerprint:
+		create_identity_key([ get_test_example_file('source-identity.jpg') ])
+		assert create_target_fingerprint.call_count == 0
+		clear_identity_keys()
+		create_identity_key([ get_test_example_file('source-identity.jpg') ])
+		assert create_target_fingerprint.call_count == 1
+	clear_identity_keys()
+	state_manager.init_item('face_detector_score', 0.6)
+	assert create_identity_key([ get_test_example_file('source-identity.jpg') ]) != identity_key
+	state_manager.init_item('face_detector_score', 0.5)
+
+
+def test_get_source_identity_embedding() -> None:
+	source_paths = [ get_test_example_file('source-identity.jpg') ]
+	set_cached_source_identity(create_identity_key(source_paths), { 'source_face': create_face(), 'source_embeddings': {} })
+	source_face = get_source_identity_face(source_paths)
+
+	assert numpy.array_equal(get_source_identity_embedding(source_paths, source_face, 'inswapper_128.onnx', prepare_source_embedding), create_face().embedding.reshape(1, -1) * 2)
+	assert numpy.array_equal(get_source_identity_embedding(source_paths, source_face, 'inswapper_128.onnx', prepare_source_embedding), create_face().embedding.reshape(1, -1) * 2)
+	assert len(PREPARE_CALLS) == 1
+
+	clear_source_identities()
+	source_face = get_source_identity_face(source_paths)
+	get_source_identity_embedding(source_paths, source_face, 'inswapper_128.onnx', prepare_source_embedding)
+
+	assert len(PREPARE_CALLS) == 1
+
+	get_source_identity_embedding(source_paths, source_face._replace(embedding = numpy.zeros(512)), 'inswapper_128.onnx', prepare_source_embedding)
+	get_source_identity_embedding(source_paths, source_face, 'simswap_256.onnx', prepare_source_embedding)
+
+	assert len(PREPARE_CALLS) == 3
+
+	clear_cache_connections()
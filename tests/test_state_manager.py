@@ -0,0 +1,67 @@
+import threading
+from typing import Any, List, Optional
+
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.typing import RunConfig
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> None:
+	state_manager.init_item('face_detector_score', 0.5)
+
+
+def collect_item(run_config : Optional[RunConfig], items : List[Any]) -> None:
+	state_manager.set_run_config(run_config)
+	items.append(state_manager.get_item('face_detector_score'))
+
+
+@state_manager.cache_run_value
+def create_cached_score() -> List[Any]:
+	return [ state_manager.get_item('face_detector_score') ]
+
+
+def test_create_run_config() -> None:
+	run_config = state_manager.create_run_config()
+
+	assert run_config.state.get('face_detector_score') == 0.5
+
+	with pytest.raises(TypeError):
+		run_config.state['face_detector_score'] = 0.7 #type:ignore[index]
+
+
+def test_get_item_with_run_config() -> None:
+	items : List[Any] = []
+	run_config = state_manager.create_run_config()
+	run_config_token = state_manager.set_run_config(run_config)
+	state_manager.set_item('face_detector_score', 0.7)
+
+	assert state_manager.get_item('face_detector_score') == 0.7
+	assert run_config.state.get('face_detector_score') == 0.5
+
+	for thread_run_config in [ run_config, None ]:
+		thread = threading.Thread(target = collect_item, args = (thread_run_config, items))
+		thread.start()
+		thread.join()
+
+	assert items == [ 0.5, 0.7 ]
+
+	state_manager.reset_run_config(run_config_token)
+
+	assert state_manager.get_item('face_detector_score') == 0.7
+
+
+def test_cache_run_value() -> None:
+	assert create_cached_score() is not create_cached_score()
+
+	run_config_token = state_manager.set_run_config(state_manager.create_run_config())
+
+	assert create_cached_score() is create_cached_score()
+	assert create_cached_score() == [ 0.5 ]
+
+	state_manager.set_item('face_detector_score', 0.7)
+
+	assert create_cached_score() == [ 0.7 ]
+
+	state_manager.reset_run_config(run_config_token)
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import tempfile
+
+import pytest
+
+from weyfusion import state_manager
+from weyfusion.filesystem import create_directory
+from weyfusion.video_index import detect_keyframe_positions, get_keyframe_index_path, get_keyframe_positions
+from .helper import get_test_example_file, get_test_examples_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	create_directory(get_test_examples_directory())
+	subprocess.run([ 'ffmpeg', '-y', '-f', 'lavfi', '-i', 'testsrc=size=320x240:rate=25', '-t', '4', '-c:v', 'libx264', '-g', '25', '-pix_fmt', 'yuv420p', get_test_example_file('target-240p-keyframes.mp4') ])
+	state_manager.init_item('temp_path', tempfile.mkdtemp())
+
+
+def test_detect_keyframe_positions() -> None:
+	assert detect_keyframe_positions(get_test_example_file('target-240p-keyframes.mp4'), 25.0) == [ 0, 25, 50, 75 ]
+	assert detect_keyframe_positions('invalid', 25.0) == []
+
+
+def test_get_keyframe_positions() -> None:
+	assert get_keyframe_positions(get_test_example_file('target-240p-keyframes.mp4'), 25.0) == [ 0, 25, 50, 75 ]
+	assert os.path.isfile(get_keyframe_index_path(get_test_example_file('target-240p-keyframes.mp4')))
+	assert get_keyframe_positions(get_test_example_file('target-240p-keyframes.mp4'), 25.0) == [ 0, 25, 50, 75 ]
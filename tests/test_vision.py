@@ -1,9 +1,13 @@
 import subprocess
+from typing import List
+from unittest.mock import patch
 
+import numpy
 import pytest
 
 from weyfusion.download import conditional_download
-from weyfusion.vision import calc_histogram_difference, count_trim_frame_total, count_video_frame_total, create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution, get_video_frame, match_frame_color, normalize_resolution, pack_resolution, read_image, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, unpack_resolution
+from weyfusion.typing import Fps
+from weyfusion.vision import calc_histogram_difference, clear_video_frame_readers, count_trim_frame_total, count_video_frame_total, create_image_resolutions, create_tile_frames, create_video_resolutions, detect_image_resolution, detect_video_duration, detect_video_fps, detect_video_resolution, get_video_frame, get_video_frame_reader, match_frame_color, merge_tile_frames, normalize_resolution, pack_resolution, parse_frame_rate, probe_video, probe_video_streams, read_image, read_video_frame, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, unpack_resolution
 from .helper import get_test_example_file, get_test_examples_directory
 
 
@@ -54,6 +58,77 @@ def test_get_video_frame() -> None:
 	assert get_video_frame('invalid') is None
 
 
+def test_read_video_frame() -> None:
+	for frame_number in [ 0, 1, 2, 10, 5, 269, 100 ]:
+		assert numpy.array_equal(read_video_frame(get_test_example_file('target-240p-25fps.mp4'), frame_number), get_video_frame(get_test_example_file('target-240p-25fps.mp4'), frame_number))
+	assert read_video_frame('invalid') is None
+
+	clear_video_frame_readers()
+
+
+def test_read_video_frame_with_keyframe_scan() -> None:
+	video_frame_reader = get_video_frame_reader(get_test_example_file('target-240p-25fps.mp4'))
+
+	def get_keyframe_positions(video_path : str, video_fps : Fps) -> List[int]:
+		assert not video_frame_reader.get('lock').locked()
+		return [ 0, 100 ]
+
+	with patch('weyfusion.vision.get_keyframe_positions', side_effect = get_keyframe_positions):
+		assert numpy.array_equal(read_video_frame(get_test_example_file('target-240p-25fps.mp4'), 200), get_video_frame(get_test_example_file('target-240p-25fps.mp4'), 200))
+
+	assert video_frame_reader.get('keyframe_positions') == [ 0, 100 ]
+
+	clear_video_frame_readers()
+
+
+def test_probe_video() -> None:
+	video_probe = probe_video(get_test_example_file('target-240p-25fps.mp4'))
+
+	assert video_probe.get('video_fps') == 25.0
+	assert video_probe.get('video_frame_total') == 270
+	assert video_probe.get('video_resolution') == (426, 226)
+	assert video_probe.get('video_codec')
+	assert probe_video('invalid') is None
+
+
+def test_probe_video_streams_with_variable_frame_rate() -> None:
+	media_probe =\
+	{
+		'streams':
+		[
+			{
+				'codec_type': 'video',
+				'codec_name': 'h264',
+				'r_frame_rate': '60/1',
+				'avg_frame_rate': '30000/1001',
+				'duration': '10',
+				'width': 1280,
+				'height': 720
+			}
+		]
+	}
+
+	with patch('weyfusion.vision.probe_media', return_value = media_probe):
+		video_probe = probe_video_streams('target.mp4')
+
+	assert round(video_probe.get('video_fps'), 2) == 29.97
+	assert video_probe.get('video_frame_total') == 300
+
+	media_probe['streams'][0]['avg_frame_rate'] = '0/0'
+
+	with patch('weyfusion.vision.probe_media', return_value = media_probe):
+		video_probe = probe_video_streams('target.mp4')
+
+	assert video_probe.get('video_fps') == 60.0
+
+
+def test_parse_frame_rate() -> None:
+	assert parse_frame_rate('25/1') == 25.0
+	assert round(parse_frame_rate('30000/1001'), 2) == 29.97
+	assert parse_frame_rate('0/0') == 0.0
+	assert parse_frame_rate(None) == 0.0
+
+
 def test_count_video_frame_total() -> None:
 	assert count_video_frame_total(get_test_example_file('target-240p-25fps.mp4')) == 270
 	assert count_video_frame_total(get_test_example_file('target-240p-30fps.mp4')) == 324
@@ -151,3 +226,11 @@ def test_match_frame_color() -> None:
 	output_vision_frame = match_frame_color(source_vision_frame, target_vision_frame)
 
 	assert calc_histogram_difference(source_vision_frame, output_vision_frame) > 0.5
+
+
+def test_create_and_merge_tile_frames() -> None:
+	vision_frame = read_image(get_test_example_file('target-240p.jpg'))
+	tile_vision_frames, pad_width, pad_height = create_tile_frames(vision_frame, (128, 8, 2))
+	merge_vision_frame = numpy.full((pad_height, pad_width, 3), 255, dtype = numpy.uint8)
+
+	assert numpy.array_equal(merge_tile_frames(tile_vision_frames, 426, 226, merge_vision_frame, (128, 8, 2)), vision_frame)
@@ -4,7 +4,7 @@ import os
 
 os.environ['OMP_NUM_THREADS'] = '1'
 
-from weyfusion import core
+from weyfusion import cli
 
 if __name__ == '__main__':
-	core.cli()
+	cli.cli()
@@ -1,16 +1,25 @@
-import os
-import sys
+from contextvars import ContextVar, Token
+from typing import Optional
 
 from weyfusion.typing import AppContext
 
+ROOT_APP_CONTEXT : AppContext = 'cli'
+APP_CONTEXT : ContextVar[Optional[AppContext]] = ContextVar('app_context', default = None)
+
+
+def init_app_context(app_context : AppContext) -> None:
+	global ROOT_APP_CONTEXT
+
+	ROOT_APP_CONTEXT = app_context
+
 
 def detect_app_context() -> AppContext:
-	frame = sys._getframe(1)
-
-	while frame:
-		if os.path.join('weyfusion', 'jobs') in frame.f_code.co_filename:
-			return 'cli'
-		if os.path.join('weyfusion', 'uis') in frame.f_code.co_filename:
-			return 'ui'
-		frame = frame.f_back
-	return 'cli'
+	return APP_CONTEXT.get() or ROOT_APP_CONTEXT
+
+
+def set_app_context(app_context : AppContext) -> Token[Optional[AppContext]]:
+	return APP_CONTEXT.set(app_context)
+
+
+def reset_app_context(token : Token[Optional[AppContext]]) -> None:
+	APP_CONTEXT.reset(token)
@@ -1,10 +1,11 @@
+from typing import List, Optional
+
 from weyfusion import state_manager
-from weyfusion.filesystem import is_image, is_video, list_directory
+from weyfusion.filesystem import is_image, is_video
 from weyfusion.jobs import job_store
 from weyfusion.normalizer import normalize_fps, normalize_padding
-from weyfusion.processors.core import get_processors_modules
+from weyfusion.processors import registry as processors_registry
 from weyfusion.typing import ApplyStateItem, Args
-from weyfusion.vision import create_image_resolutions, create_video_resolutions, detect_image_resolution, detect_video_fps, detect_video_resolution, pack_resolution
 
 
 def reduce_step_args(args : Args) -> Args:
@@ -23,10 +24,10 @@ def reduce_job_args(args : Args) -> Args:
 	return job_args
 
 
-def collect_step_args() -> Args:
+def collect_step_args(exclude_keys : Optional[List[str]] = None) -> Args:
 	step_args =\
 	{
-		key: state_manager.get_item(key) for key in job_store.get_step_keys() #type:ignore[arg-type]
+		key: state_manager.get_item(key) for key in job_store.get_step_keys() if key not in (exclude_keys or []) #type:ignore[arg-type]
 	}
 	return step_args
 
@@ -45,6 +46,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	# paths
 	apply_state_item('temp_path', args.get('temp_path'))
 	apply_state_item('jobs_path', args.get('jobs_path'))
+	apply_state_item('cache_path', args.get('cache_path'))
 	apply_state_item('source_paths', args.get('source_paths'))
 	apply_state_item('target_path', args.get('target_path'))
 	apply_state_item('output_path', args.get('output_path'))
@@ -57,6 +59,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('face_detector_size', args.get('face_detector_size'))
 	apply_state_item('face_detector_angles', args.get('face_detector_angles'))
 	apply_state_item('face_detector_score', args.get('face_detector_score'))
+	apply_state_item('face_detector_interval', args.get('face_detector_interval'))
 	# face landmarker
 	apply_state_item('face_landmarker_model', args.get('face_landmarker_model'))
 	apply_state_item('face_landmarker_score', args.get('face_landmarker_score'))
@@ -81,10 +84,14 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('trim_frame_start', args.get('trim_frame_start'))
 	apply_state_item('trim_frame_end', args.get('trim_frame_end'))
 	apply_state_item('temp_frame_format', args.get('temp_frame_format'))
+	apply_state_item('frame_extraction_mode', args.get('frame_extraction_mode'))
+	apply_state_item('video_segment_size', args.get('video_segment_size'))
 	apply_state_item('keep_temp', args.get('keep_temp'))
 	# output creation
 	apply_state_item('output_image_quality', args.get('output_image_quality'))
 	if is_image(args.get('target_path')):
+		from weyfusion.vision import create_image_resolutions, detect_image_resolution, pack_resolution
+
 		output_image_resolution = detect_image_resolution(args.get('target_path'))
 		output_image_resolutions = create_image_resolutions(output_image_resolution)
 		if args.get('output_image_resolution') in output_image_resolutions:
@@ -96,6 +103,8 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('output_video_preset', args.get('output_video_preset'))
 	apply_state_item('output_video_quality', args.get('output_video_quality'))
 	if is_video(args.get('target_path')):
+		from weyfusion.vision import create_video_resolutions, detect_video_resolution, pack_resolution
+
 		output_video_resolution = detect_video_resolution(args.get('target_path'))
 		output_video_resolutions = create_video_resolutions(output_video_resolution)
 		if args.get('output_video_resolution') in output_video_resolutions:
@@ -103,32 +112,44 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 		else:
 			apply_state_item('output_video_resolution', pack_resolution(output_video_resolution))
 	if args.get('output_video_fps') or is_video(args.get('target_path')):
+		from weyfusion.vision import detect_video_fps
+
 		output_video_fps = normalize_fps(args.get('output_video_fps')) or detect_video_fps(args.get('target_path'))
 		apply_state_item('output_video_fps', output_video_fps)
 	apply_state_item('skip_audio', args.get('skip_audio'))
 	# processors
-	available_processors = [ file.get('name') for file in list_directory('weyfusion/processors/modules') ]
 	apply_state_item('processors', args.get('processors'))
-	for processor_module in get_processors_modules(available_processors):
-		processor_module.apply_args(args, apply_state_item)
+	processors_registry.apply_args(args, apply_state_item)
 	# uis
 	apply_state_item('open_browser', args.get('open_browser'))
 	apply_state_item('ui_layouts', args.get('ui_layouts'))
 	apply_state_item('ui_workflow', args.get('ui_workflow'))
 	# execution
-	apply_state_item('execution_device_id', args.get('execution_device_id'))
+	apply_state_item('execution_device_ids', [ args.get('execution_device_id') ] if args.get('execution_device_id') else args.get('execution_device_ids'))
 	apply_state_item('execution_providers', args.get('execution_providers'))
 	apply_state_item('execution_thread_count', args.get('execution_thread_count'))
+	apply_state_item('execution_backend', args.get('execution_backend'))
 	apply_state_item('execution_queue_count', args.get('execution_queue_count'))
+	apply_state_item('execution_batch_size', args.get('execution_batch_size'))
+	apply_state_item('execution_batch_latency', args.get('execution_batch_latency'))
+	apply_state_item('execution_session_limits', args.get('execution_session_limits'))
+	apply_state_item('execution_intra_op_thread_count', args.get('execution_intra_op_thread_count'))
+	apply_state_item('execution_inter_op_thread_count', args.get('execution_inter_op_thread_count'))
+	apply_state_item('execution_graph_optimization', args.get('execution_graph_optimization'))
+	apply_state_item('execution_memory_arena', args.get('execution_memory_arena'))
+	apply_state_item('execution_skip_memory_pattern', args.get('execution_skip_memory_pattern'))
 	# download
 	apply_state_item('download_providers', args.get('download_providers'))
 	apply_state_item('download_scope', args.get('download_scope'))
 	# memory
 	apply_state_item('video_memory_strategy', args.get('video_memory_strategy'))
 	apply_state_item('system_memory_limit', args.get('system_memory_limit'))
+	apply_state_item('face_store_limit', args.get('face_store_limit'))
 	# misc
 	apply_state_item('log_level', args.get('log_level'))
 	# jobs
 	apply_state_item('job_id', args.get('job_id'))
 	apply_state_item('job_status', args.get('job_status'))
+	apply_state_item('job_lease_timeout', args.get('job_lease_timeout'))
+	apply_state_item('job_step_concurrency', args.get('job_step_concurrency'))
 	apply_state_item('step_index', args.get('step_index'))
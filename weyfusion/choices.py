@@ -2,7 +2,7 @@ import logging
 from typing import List, Sequence
 
 from weyfusion.common_helper import create_float_range, create_int_range
-from weyfusion.typing import Angle, DownloadProvider, DownloadProviderSet, DownloadScope, ExecutionProvider, ExecutionProviderSet, FaceDetectorModel, FaceDetectorSet, FaceLandmarkerModel, FaceMaskRegion, FaceMaskRegionSet, FaceMaskType, FaceOccluderModel, FaceParserModel, FaceSelectorMode, FaceSelectorOrder, Gender, JobStatus, LogLevel, LogLevelSet, OutputAudioEncoder, OutputVideoEncoder, OutputVideoPreset, Race, Score, TempFrameFormat, UiWorkflow, VideoMemoryStrategy
+from weyfusion.typing import Angle, DownloadProvider, DownloadProviderSet, DownloadScope, ExecutionBackend, ExecutionGraphOptimization, ExecutionMemoryArena, ExecutionProvider, ExecutionProviderSet, FaceDetectorModel, FaceDetectorSet, FaceLandmarkerModel, FaceMaskRegion, FaceMaskRegionSet, FaceMaskType, FaceOccluderModel, FaceParserModel, FaceSelectorMode, FaceSelectorOrder, FrameExtractionMode, Gender, JobStatus, LogLevel, LogLevelSet, OutputAudioEncoder, OutputVideoEncoder, OutputVideoPreset, Race, Score, TempFrameFormat, UiWorkflow, VideoMemoryStrategy
 
 face_detector_set : FaceDetectorSet =\
 {
@@ -35,6 +35,7 @@ face_mask_region_set : FaceMaskRegionSet =\
 }
 face_mask_regions : List[FaceMaskRegion] = list(face_mask_region_set.keys())
 temp_frame_formats : List[TempFrameFormat] = [ 'bmp', 'jpg', 'png' ]
+frame_extraction_modes : List[FrameExtractionMode] = [ 'disk', 'stream' ]
 output_audio_encoders : List[OutputAudioEncoder] = [ 'aac', 'libmp3lame', 'libopus', 'libvorbis' ]
 output_video_encoders : List[OutputVideoEncoder] = [ 'libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf', 'h264_qsv', 'hevc_qsv', 'h264_videotoolbox', 'hevc_videotoolbox' ]
 output_video_presets : List[OutputVideoPreset] = [ 'ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow' ]
@@ -53,6 +54,9 @@ execution_provider_set : ExecutionProviderSet =\
 	'tensorrt': 'TensorrtExecutionProvider'
 }
 execution_providers : List[ExecutionProvider] = list(execution_provider_set.keys())
+execution_backends : List[ExecutionBackend] = [ 'thread', 'process' ]
+execution_graph_optimizations : List[ExecutionGraphOptimization] = [ 'disable', 'basic', 'extended', 'all' ]
+execution_memory_arenas : List[ExecutionMemoryArena] = [ 'next_power_of_two', 'same_as_requested', 'disable' ]
 download_provider_set : DownloadProviderSet =\
 {
 	'github':
@@ -84,10 +88,19 @@ ui_workflows : List[UiWorkflow] = [ 'instant_runner', 'job_runner', 'job_manager
 job_statuses : List[JobStatus] = [ 'drafted', 'queued', 'completed', 'failed' ]
 
 execution_thread_count_range : Sequence[int] = create_int_range(1, 32, 1)
+execution_intra_op_thread_count_range : Sequence[int] = create_int_range(0, 32, 1)
+execution_inter_op_thread_count_range : Sequence[int] = create_int_range(0, 32, 1)
 execution_queue_count_range : Sequence[int] = create_int_range(1, 4, 1)
+execution_batch_size_range : Sequence[int] = create_int_range(1, 32, 1)
+execution_batch_latency_range : Sequence[int] = create_int_range(0, 100, 1)
 system_memory_limit_range : Sequence[int] = create_int_range(0, 128, 4)
+face_store_limit_range : Sequence[int] = create_int_range(0, 16384, 256)
+job_lease_timeout_range : Sequence[int] = create_int_range(10, 600, 10)
+job_step_concurrency_range : Sequence[int] = create_int_range(1, 16, 1)
 face_detector_angles : Sequence[Angle] = create_int_range(0, 270, 90)
 face_detector_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
+face_detector_interval_range : Sequence[int] = create_int_range(1, 30, 1)
+video_segment_size_range : Sequence[int] = create_int_range(0, 10000, 50)
 face_landmarker_score_range : Sequence[Score] = create_float_range(0.0, 1.0, 0.05)
 face_mask_blur_range : Sequence[float] = create_float_range(0.0, 1.0, 0.05)
 face_mask_padding_range : Sequence[int] = create_int_range(0, 100, 1)
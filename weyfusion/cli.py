@@ -0,0 +1,115 @@
+import signal
+
+from weyfusion import logger, state_manager, wording
+from weyfusion.app_context import init_app_context
+from weyfusion.args import apply_args, reduce_step_args
+from weyfusion.exit_helper import graceful_exit, hard_exit
+from weyfusion.jobs import job_manager
+from weyfusion.jobs.job_list import compose_job_list
+from weyfusion.memory import limit_system_memory
+from weyfusion.program import create_program
+from weyfusion.program_helper import validate_args
+from weyfusion.typing import Args, ErrorCode
+
+
+def cli() -> None:
+	signal.signal(signal.SIGINT, lambda signal_number, frame: graceful_exit(0))
+	init_app_context('cli')
+	program = create_program()
+
+	if validate_args(program):
+		args = vars(program.parse_args())
+		apply_args(args, state_manager.init_item)
+
+		if state_manager.get_item('command'):
+			logger.init(state_manager.get_item('log_level'))
+			route(args)
+		else:
+			program.print_help()
+	else:
+		hard_exit(2)
+
+
+def route(args : Args) -> None:
+	system_memory_limit = state_manager.get_item('system_memory_limit')
+	if system_memory_limit and system_memory_limit > 0:
+		limit_system_memory(system_memory_limit)
+	if state_manager.get_item('command') in [ 'job-list', 'job-create', 'job-submit', 'job-submit-all', 'job-delete', 'job-delete-all', 'job-add-step', 'job-remix-step', 'job-insert-step', 'job-remove-step' ]:
+		if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
+			hard_exit(1)
+		error_code = route_job_manager(args)
+		hard_exit(error_code)
+	from weyfusion import core
+
+	core.route(args)
+
+
+def route_job_manager(args : Args) -> ErrorCode:
+	if state_manager.get_item('command') == 'job-list':
+		job_headers, job_contents = compose_job_list(state_manager.get_item('job_status'))
+
+		if job_contents:
+			logger.table(job_headers, job_contents)
+			return 0
+		return 1
+	if state_manager.get_item('command') == 'job-create':
+		if job_manager.create_job(state_manager.get_item('job_id')):
+			logger.info(wording.get('job_created').format(job_id = state_manager.get_item('job_id')), __name__)
+			return 0
+		logger.error(wording.get('job_not_created').format(job_id = state_manager.get_item('job_id')), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-submit':
+		if job_manager.submit_job(state_manager.get_item('job_id')):
+			logger.info(wording.get('job_submitted').format(job_id = state_manager.get_item('job_id')), __name__)
+			return 0
+		logger.error(wording.get('job_not_submitted').format(job_id = state_manager.get_item('job_id')), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-submit-all':
+		if job_manager.submit_jobs():
+			logger.info(wording.get('job_all_submitted'), __name__)
+			return 0
+		logger.error(wording.get('job_all_not_submitted'), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-delete':
+		if job_manager.delete_job(state_manager.get_item('job_id')):
+			logger.info(wording.get('job_deleted').format(job_id = state_manager.get_item('job_id')), __name__)
+			return 0
+		logger.error(wording.get('job_not_deleted').format(job_id = state_manager.get_item('job_id')), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-delete-all':
+		if job_manager.delete_jobs():
+			logger.info(wording.get('job_all_deleted'), __name__)
+			return 0
+		logger.error(wording.get('job_all_not_deleted'), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-add-step':
+		step_args = reduce_step_args(args)
+
+		if job_manager.add_step(state_manager.get_item('job_id'), step_args):
+			logger.info(wording.get('job_step_added').format(job_id = state_manager.get_item('job_id')), __name__)
+			return 0
+		logger.error(wording.get('job_step_not_added').format(job_id = state_manager.get_item('job_id')), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-remix-step':
+		step_args = reduce_step_args(args)
+
+		if job_manager.remix_step(state_manager.get_item('job_id'), state_manager.get_item('step_index'), step_args):
+			logger.info(wording.get('job_remix_step_added').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
+			return 0
+		logger.error(wording.get('job_remix_step_not_added').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-insert-step':
+		step_args = reduce_step_args(args)
+
+		if job_manager.insert_step(state_manager.get_item('job_id'), state_manager.get_item('step_index'), step_args):
+			logger.info(wording.get('job_step_inserted').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
+			return 0
+		logger.error(wording.get('job_step_not_inserted').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
+		return 1
+	if state_manager.get_item('command') == 'job-remove-step':
+		if job_manager.remove_step(state_manager.get_item('job_id'), state_manager.get_item('step_index')):
+			logger.info(wording.get('job_step_removed').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
+			return 0
+		logger.error(wording.get('job_step_not_removed').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
+		return 1
+	return 1
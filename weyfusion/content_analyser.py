@@ -7,7 +7,6 @@ from tqdm import tqdm
 from weyfusion import inference_manager, state_manager, wording
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import conditional_thread_semaphore
 from weyfusion.typing import DownloadScope, Fps, InferencePool, ModelOptions, ModelSet, VisionFrame
 from weyfusion.vision import detect_video_fps, get_video_frame, read_image
 from weyfusion.model_helper import generate_model_file
@@ -58,6 +57,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	return create_static_model_set('full').get('open_nsfw')
 
@@ -86,11 +86,10 @@ def analyse_frame(vision_frame : VisionFrame) -> bool:
 def forward(vision_frame : VisionFrame) -> float:
 	content_analyser = get_inference_pool().get('content_analyser')
 
-	with conditional_thread_semaphore():
-		probability = content_analyser.run(None,
-		{
-			'input': vision_frame
-		})[0][0][1]
+	probability = inference_manager.run_inference_session(content_analyser,
+	{
+		'input': vision_frame
+	})[0][0][1]
 
 	return probability
 
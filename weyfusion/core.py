@@ -1,65 +1,46 @@
+import hashlib
 import itertools
+import json
 import shutil
-import signal
 import sys
 from time import time
+from types import ModuleType
+from typing import List, Set
 
 import numpy
 
 # Import repo_helper first to ensure encrypted URLs are available
 from weyfusion import repo_helper
-from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, logger, process_manager, state_manager, voice_extractor, wording
-from weyfusion.args import apply_args, collect_job_args, reduce_job_args, reduce_step_args
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, voice_extractor, wording
+from weyfusion.args import apply_args, collect_job_args, collect_step_args, reduce_job_args, reduce_step_args
 from weyfusion.common_helper import get_first
 from weyfusion.content_analyser import analyse_image, analyse_video
 from weyfusion.download import conditional_download_hashes, conditional_download_sources
-from weyfusion.exit_helper import conditional_exit, graceful_exit, hard_exit
+from weyfusion.execution import get_available_execution_providers
+from weyfusion.exit_helper import conditional_exit, hard_exit
 from weyfusion.face_analyser import get_average_face, get_many_faces, get_one_face
 from weyfusion.face_selector import sort_and_filter_faces
 from weyfusion.face_store import append_reference_face, clear_reference_faces, get_reference_faces
-from weyfusion.ffmpeg import copy_image, extract_frames, finalize_image, merge_video, replace_audio, restore_audio
-from weyfusion.filesystem import filter_audio_paths, is_image, is_video, list_directory, resolve_file_pattern
-from weyfusion.jobs import job_helper, job_manager, job_runner
-from weyfusion.jobs.job_list import compose_job_list
-from weyfusion.memory import limit_system_memory
-from weyfusion.processors.core import get_processors_modules
-from weyfusion.program import create_program
-from weyfusion.program_helper import validate_args
+from weyfusion.face_tracker import clear_face_tracker_anchors
+from weyfusion.ffmpeg import close_stream, concat_video, copy_image, extract_frames, finalize_image, merge_video, open_extract_stream, open_merge_stream, read_stream_frames, replace_audio, restore_audio, write_stream_frame
+from weyfusion.filesystem import filter_audio_paths, is_image, is_video, remove_file, resolve_file_pattern
+from weyfusion.jobs import job_helper, job_manager, job_runner, job_worker
+from weyfusion.processors.core import get_processors_modules, multi_process_fused_frames, multi_process_stream
+from weyfusion.processors.registry import get_available_processors
+from weyfusion.segment_manager import clear_segments_directory, complete_video_segment, create_video_segments, get_segment_path, get_segment_paths, init_segment_manifest
+from weyfusion.source_identity import clear_identity_keys
 from weyfusion.statistics import conditional_log_statistics
 from weyfusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, get_temp_frame_paths, move_temp_file
-from weyfusion.typing import Args, ErrorCode
-from weyfusion.vision import get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, unpack_resolution
+from weyfusion.typing import Args, ErrorCode, Fps
+from weyfusion.vision import clear_video_frame_readers, count_trim_frame_total, detect_video_fps, get_video_frame, pack_resolution, read_image, read_static_images, restrict_image_resolution, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, unpack_resolution
 
-
-def cli() -> None:
-	signal.signal(signal.SIGINT, lambda signal_number, frame: graceful_exit(0))
-	program = create_program()
-
-	if validate_args(program):
-		args = vars(program.parse_args())
-		apply_args(args, state_manager.init_item)
-
-		if state_manager.get_item('command'):
-			logger.init(state_manager.get_item('log_level'))
-			route(args)
-		else:
-			program.print_help()
-	else:
-		hard_exit(2)
+PRE_CHECK_KEYS : Set[str] = set()
 
 
 def route(args : Args) -> None:
-	system_memory_limit = state_manager.get_item('system_memory_limit')
-	if system_memory_limit and system_memory_limit > 0:
-		limit_system_memory(system_memory_limit)
 	if state_manager.get_item('command') == 'force-download':
 		error_code = force_download()
 		return conditional_exit(error_code)
-	if state_manager.get_item('command') in [ 'job-list', 'job-create', 'job-submit', 'job-submit-all', 'job-delete', 'job-delete-all', 'job-add-step', 'job-remix-step', 'job-insert-step', 'job-remove-step' ]:
-		if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
-			hard_exit(1)
-		error_code = route_job_manager(args)
-		hard_exit(error_code)
 	if not pre_check():
 		return conditional_exit(2)
 	if state_manager.get_item('command') == 'run':
@@ -82,7 +63,7 @@ def route(args : Args) -> None:
 			hard_exit(1)
 		error_core = process_batch(args)
 		hard_exit(error_core)
-	if state_manager.get_item('command') in [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all' ]:
+	if state_manager.get_item('command') in [ 'job-run', 'job-run-all', 'job-retry', 'job-retry-all', 'job-worker' ]:
 		if not job_manager.init_jobs(state_manager.get_item('jobs_path')):
 			hard_exit(1)
 		error_code = route_job_runner()
@@ -99,6 +80,10 @@ def pre_check() -> bool:
 	if not shutil.which('ffmpeg'):
 		logger.error(wording.get('ffmpeg_not_installed'), __name__)
 		return False
+	for execution_provider in state_manager.get_item('execution_providers') or []:
+		if execution_provider not in get_available_execution_providers():
+			logger.error(wording.get('execution_provider_not_available').format(execution_provider = execution_provider), __name__)
+			return False
 	return True
 
 
@@ -114,16 +99,35 @@ def common_pre_check() -> bool:
 		voice_extractor
 	]
 
-	return all(module.pre_check() for module in common_modules)
+	return conditional_pre_check(common_modules)
 
 
 def processors_pre_check() -> bool:
-	for processor_module in get_processors_modules(state_manager.get_item('processors')):
-		if not processor_module.pre_check():
-			return False
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	return conditional_pre_check(processor_modules)
+
+
+def conditional_pre_check(modules : List[ModuleType]) -> bool:
+	pre_check_key = create_pre_check_key()
+
+	for module in modules:
+		if module.__name__ + '.' + pre_check_key not in PRE_CHECK_KEYS:
+			if not module.pre_check():
+				return False
+			PRE_CHECK_KEYS.add(module.__name__ + '.' + pre_check_key)
 	return True
 
 
+def create_pre_check_key() -> str:
+	pre_check_values =\
+	{
+		'download_providers': state_manager.get_item('download_providers'),
+		'download_scope': state_manager.get_item('download_scope')
+	}
+	pre_check_values.update(collect_step_args([ 'source_paths', 'target_path', 'output_path' ]))
+	return hashlib.sha1(json.dumps(pre_check_values, sort_keys = True, default = str).encode()).hexdigest()
+
+
 def force_download() -> ErrorCode:
 	common_modules =\
 	[
@@ -135,7 +139,7 @@ def force_download() -> ErrorCode:
 		face_recognizer,
 		voice_extractor
 	]
-	available_processors = [ file.get('name') for file in list_directory('weyfusion/processors/modules') ]
+	available_processors = get_available_processors()
 	processor_modules = get_processors_modules(available_processors)
 
 	for module in common_modules + processor_modules:
@@ -151,77 +155,6 @@ def force_download() -> ErrorCode:
 	return 0
 
 
-def route_job_manager(args : Args) -> ErrorCode:
-	if state_manager.get_item('command') == 'job-list':
-		job_headers, job_contents = compose_job_list(state_manager.get_item('job_status'))
-
-		if job_contents:
-			logger.table(job_headers, job_contents)
-			return 0
-		return 1
-	if state_manager.get_item('command') == 'job-create':
-		if job_manager.create_job(state_manager.get_item('job_id')):
-			logger.info(wording.get('job_created').format(job_id = state_manager.get_item('job_id')), __name__)
-			return 0
-		logger.error(wording.get('job_not_created').format(job_id = state_manager.get_item('job_id')), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-submit':
-		if job_manager.submit_job(state_manager.get_item('job_id')):
-			logger.info(wording.get('job_submitted').format(job_id = state_manager.get_item('job_id')), __name__)
-			return 0
-		logger.error(wording.get('job_not_submitted').format(job_id = state_manager.get_item('job_id')), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-submit-all':
-		if job_manager.submit_jobs():
-			logger.info(wording.get('job_all_submitted'), __name__)
-			return 0
-		logger.error(wording.get('job_all_not_submitted'), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-delete':
-		if job_manager.delete_job(state_manager.get_item('job_id')):
-			logger.info(wording.get('job_deleted').format(job_id = state_manager.get_item('job_id')), __name__)
-			return 0
-		logger.error(wording.get('job_not_deleted').format(job_id = state_manager.get_item('job_id')), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-delete-all':
-		if job_manager.delete_jobs():
-			logger.info(wording.get('job_all_deleted'), __name__)
-			return 0
-		logger.error(wording.get('job_all_not_deleted'), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-add-step':
-		step_args = reduce_step_args(args)
-
-		if job_manager.add_step(state_manager.get_item('job_id'), step_args):
-			logger.info(wording.get('job_step_added').format(job_id = state_manager.get_item('job_id')), __name__)
-			return 0
-		logger.error(wording.get('job_step_not_added').format(job_id = state_manager.get_item('job_id')), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-remix-step':
-		step_args = reduce_step_args(args)
-
-		if job_manager.remix_step(state_manager.get_item('job_id'), state_manager.get_item('step_index'), step_args):
-			logger.info(wording.get('job_remix_step_added').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
-			return 0
-		logger.error(wording.get('job_remix_step_not_added').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-insert-step':
-		step_args = reduce_step_args(args)
-
-		if job_manager.insert_step(state_manager.get_item('job_id'), state_manager.get_item('step_index'), step_args):
-			logger.info(wording.get('job_step_inserted').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
-			return 0
-		logger.error(wording.get('job_step_not_inserted').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
-		return 1
-	if state_manager.get_item('command') == 'job-remove-step':
-		if job_manager.remove_step(state_manager.get_item('job_id'), state_manager.get_item('step_index')):
-			logger.info(wording.get('job_step_removed').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
-			return 0
-		logger.error(wording.get('job_step_not_removed').format(job_id = state_manager.get_item('job_id'), step_index = state_manager.get_item('step_index')), __name__)
-		return 1
-	return 1
-
-
 def route_job_runner() -> ErrorCode:
 	if state_manager.get_item('command') == 'job-run':
 		logger.info(wording.get('running_job').format(job_id = state_manager.get_item('job_id')), __name__)
@@ -251,6 +184,13 @@ def route_job_runner() -> ErrorCode:
 			return 0
 		logger.info(wording.get('processing_jobs_failed'), __name__)
 		return 1
+	if state_manager.get_item('command') == 'job-worker':
+		logger.info(wording.get('running_job_worker').format(worker_id = job_worker.get_worker_id()), __name__)
+		if job_worker.run_worker(process_step):
+			logger.info(wording.get('processing_jobs_succeed'), __name__)
+			return 0
+		logger.info(wording.get('processing_jobs_failed'), __name__)
+		return 1
 	return 2
 
 
@@ -300,21 +240,34 @@ def process_step(job_id : str, step_index : int, step_args : Args) -> bool:
 
 	logger.info(wording.get('processing_step').format(step_current = step_index + 1, step_total = step_total), __name__)
 	if common_pre_check() and processors_pre_check():
-		error_code = conditional_process()
+		inference_manager.retain_inference_pools()
+		error_code : ErrorCode = 1
+
+		try:
+			error_code = conditional_process()
+		finally:
+			inference_manager.release_inference_pools(error_code == 0 and step_index + 1 < step_total)
 		return error_code == 0
 	return False
 
 
 def conditional_process() -> ErrorCode:
 	start_time = time()
-	for processor_module in get_processors_modules(state_manager.get_item('processors')):
-		if not processor_module.pre_process('output'):
-			return 2
-	conditional_append_reference_faces()
-	if is_image(state_manager.get_item('target_path')):
-		return process_image(start_time)
-	if is_video(state_manager.get_item('target_path')):
-		return process_video(start_time)
+	run_config_token = state_manager.set_run_config(state_manager.create_run_config())
+	clear_identity_keys()
+
+	try:
+		for processor_module in get_processors_modules(state_manager.get_item('processors')):
+			if not processor_module.pre_process('output'):
+				return 2
+		conditional_append_reference_faces()
+		if is_image(state_manager.get_item('target_path')):
+			return process_image(start_time)
+		if is_video(state_manager.get_item('target_path')):
+			return process_video(start_time)
+	finally:
+		clear_video_frame_readers()
+		state_manager.reset_run_config(run_config_token)
 	return 0
 
 
@@ -400,44 +353,18 @@ def process_video(start_time : float) -> ErrorCode:
 	# create temp
 	logger.debug(wording.get('creating_temp'), __name__)
 	create_temp_directory(state_manager.get_item('target_path'))
-	# extract frames
+	clear_face_tracker_anchors()
 	process_manager.start()
 	temp_video_resolution = pack_resolution(restrict_video_resolution(state_manager.get_item('target_path'), unpack_resolution(state_manager.get_item('output_video_resolution'))))
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
-	if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end):
-		logger.debug(wording.get('extracting_frames_succeed'), __name__)
-	else:
-		if is_process_stopping():
-			process_manager.end()
-			return 4
-		logger.error(wording.get('extracting_frames_failed'), __name__)
-		process_manager.end()
-		return 1
-	# process frames
-	temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
-	if temp_frame_paths:
-		for processor_module in get_processors_modules(state_manager.get_item('processors')):
-			logger.info(wording.get('processing'), processor_module.__name__)
-			processor_module.process_video(state_manager.get_item('source_paths'), temp_frame_paths)
-			processor_module.post_process()
-		if is_process_stopping():
-			return 4
-	else:
-		logger.error(wording.get('temp_frames_not_found'), __name__)
-		process_manager.end()
-		return 1
-	# merge video
-	logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__)
-	if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
-		logger.debug(wording.get('merging_video_succeed'), __name__)
+	if state_manager.get_item('video_segment_size'):
+		error_code = process_video_segments(temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end)
+	elif state_manager.get_item('frame_extraction_mode') == 'stream':
+		error_code = stream_video(temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end, 0)
 	else:
-		if is_process_stopping():
-			process_manager.end()
-			return 4
-		logger.error(wording.get('merging_video_failed'), __name__)
-		process_manager.end()
-		return 1
+		error_code = extract_and_merge_video(temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end, 0)
+	if error_code:
+		return error_code
 	# handle audio
 	if state_manager.get_item('skip_audio'):
 		logger.info(wording.get('skipping_audio'), __name__)
@@ -467,6 +394,7 @@ def process_video(start_time : float) -> ErrorCode:
 	clear_temp_directory(state_manager.get_item('target_path'))
 	# validate video
 	if is_video(state_manager.get_item('output_path')):
+		clear_segments_directory(state_manager.get_item('target_path'))
 		seconds = '{:.2f}'.format((time() - start_time))
 		logger.info(wording.get('processing_video_succeed').format(seconds = seconds), __name__)
 		conditional_log_statistics()
@@ -478,6 +406,120 @@ def process_video(start_time : float) -> ErrorCode:
 	return 0
 
 
+def process_video_segments(temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> ErrorCode:
+	video_fps = detect_video_fps(state_manager.get_item('target_path'))
+	video_segments = create_video_segments(state_manager.get_item('target_path'), trim_frame_start, trim_frame_end, state_manager.get_item('video_segment_size'))
+	segment_manifest = init_segment_manifest(state_manager.get_item('target_path'), video_segments)
+	segment_total = len(segment_manifest.get('segments'))
+
+	for index, video_segment in enumerate(segment_manifest.get('segments')):
+		if video_segment.get('is_completed'):
+			logger.info(wording.get('skipping_segment').format(index = index + 1, total = segment_total), __name__)
+			continue
+		logger.info(wording.get('processing_segment').format(index = index + 1, total = segment_total, frame_start = video_segment.get('frame_start'), frame_end = video_segment.get('frame_end')), __name__)
+		for temp_frame_path in get_temp_frame_paths(state_manager.get_item('target_path')):
+			remove_file(temp_frame_path)
+		frame_offset = round((video_segment.get('frame_start') - trim_frame_start) * temp_video_fps / video_fps)
+		if state_manager.get_item('frame_extraction_mode') == 'stream':
+			error_code = stream_video(temp_video_resolution, temp_video_fps, video_segment.get('frame_start'), video_segment.get('frame_end'), frame_offset)
+		else:
+			error_code = extract_and_merge_video(temp_video_resolution, temp_video_fps, video_segment.get('frame_start'), video_segment.get('frame_end'), frame_offset)
+		if error_code:
+			return error_code
+		if not move_temp_file(state_manager.get_item('target_path'), get_segment_path(state_manager.get_item('target_path'), index)):
+			logger.error(wording.get('merging_video_failed'), __name__)
+			process_manager.end()
+			return 1
+		complete_video_segment(state_manager.get_item('target_path'), segment_manifest, index)
+	# concat segments
+	logger.info(wording.get('concating_segments').format(total = segment_total), __name__)
+	if concat_video(get_temp_file_path(state_manager.get_item('target_path')), get_segment_paths(state_manager.get_item('target_path'), segment_manifest)):
+		logger.debug(wording.get('concating_segments_succeed'), __name__)
+	else:
+		if is_process_stopping():
+			process_manager.end()
+			return 4
+		logger.error(wording.get('concating_segments_failed'), __name__)
+		process_manager.end()
+		return 1
+	return 0
+
+
+def extract_and_merge_video(temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int, frame_offset : int) -> ErrorCode:
+	# extract frames
+	logger.info(wording.get('extracting_frames').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
+	if extract_frames(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end):
+		logger.debug(wording.get('extracting_frames_succeed'), __name__)
+	else:
+		if is_process_stopping():
+			process_manager.end()
+			return 4
+		logger.error(wording.get('extracting_frames_failed'), __name__)
+		process_manager.end()
+		return 1
+	# process frames
+	temp_frame_paths = get_temp_frame_paths(state_manager.get_item('target_path'))
+	if temp_frame_paths:
+		logger.info(wording.get('processing'), __name__)
+		multi_process_fused_frames(state_manager.get_item('source_paths'), temp_frame_paths, frame_offset)
+		for processor_module in get_processors_modules(state_manager.get_item('processors')):
+			processor_module.post_process()
+		if is_process_stopping():
+			return 4
+	else:
+		logger.error(wording.get('temp_frames_not_found'), __name__)
+		process_manager.end()
+		return 1
+	# merge video
+	logger.info(wording.get('merging_video').format(resolution = state_manager.get_item('output_video_resolution'), fps = state_manager.get_item('output_video_fps')), __name__)
+	if merge_video(state_manager.get_item('target_path'), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps')):
+		logger.debug(wording.get('merging_video_succeed'), __name__)
+	else:
+		if is_process_stopping():
+			process_manager.end()
+			return 4
+		logger.error(wording.get('merging_video_failed'), __name__)
+		process_manager.end()
+		return 1
+	return 0
+
+
+def stream_video(temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int, frame_offset : int) -> ErrorCode:
+	stream_frame_total = count_trim_frame_total(state_manager.get_item('target_path'), trim_frame_start, trim_frame_end)
+	extract_process = open_extract_stream(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end)
+	merge_process = None
+	is_stream_written = True
+	is_stream_merged = False
+
+	logger.info(wording.get('streaming_video').format(resolution = temp_video_resolution, fps = temp_video_fps), __name__)
+	try:
+		for output_vision_frame in multi_process_stream(state_manager.get_item('source_paths'), read_stream_frames(extract_process, temp_video_resolution), stream_frame_total, frame_offset):
+			if not merge_process:
+				output_vision_height, output_vision_width = output_vision_frame.shape[:2]
+				merge_process = open_merge_stream(state_manager.get_item('target_path'), pack_resolution((output_vision_width, output_vision_height)), state_manager.get_item('output_video_resolution'), state_manager.get_item('output_video_fps'))
+			if not write_stream_frame(merge_process, output_vision_frame):
+				is_stream_written = False
+				break
+	finally:
+		close_stream(extract_process)
+		if merge_process:
+			is_stream_merged = close_stream(merge_process)
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_module.post_process()
+	if is_stream_merged and is_stream_written:
+		if is_process_stopping():
+			return 4
+		logger.debug(wording.get('streaming_video_succeed'), __name__)
+	else:
+		if is_process_stopping():
+			process_manager.end()
+			return 4
+		logger.error(wording.get('streaming_video_failed'), __name__)
+		process_manager.end()
+		return 1
+	return 0
+
+
 def is_process_stopping() -> bool:
 	if process_manager.is_stopping():
 		process_manager.end()
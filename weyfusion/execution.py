@@ -1,3 +1,4 @@
+import os
 import shutil
 import subprocess
 import xml.etree.ElementTree as ElementTree
@@ -7,7 +8,7 @@ from typing import Any, List, Optional
 from onnxruntime import get_available_providers, set_default_logger_severity
 
 import weyfusion.choices
-from weyfusion.typing import ExecutionDevice, ExecutionProvider, ValueAndUnit
+from weyfusion.typing import ExecutionDevice, ExecutionMemoryArena, ExecutionProvider, ValueAndUnit
 
 set_default_logger_severity(3)
 
@@ -16,6 +17,7 @@ def has_execution_provider(execution_provider : ExecutionProvider) -> bool:
 	return execution_provider in get_available_execution_providers()
 
 
+@lru_cache(maxsize = None)
 def get_available_execution_providers() -> List[ExecutionProvider]:
 	inference_execution_providers = get_available_providers()
 	available_execution_providers = []
@@ -27,7 +29,7 @@ def get_available_execution_providers() -> List[ExecutionProvider]:
 	return available_execution_providers
 
 
-def create_inference_execution_providers(execution_device_id : str, execution_providers : List[ExecutionProvider]) -> List[Any]:
+def create_inference_execution_providers(execution_device_id : str, execution_providers : List[ExecutionProvider], execution_memory_arena : ExecutionMemoryArena) -> List[Any]:
 	inference_execution_providers : List[Any] = []
 
 	for execution_provider in execution_providers:
@@ -35,7 +37,8 @@ def create_inference_execution_providers(execution_device_id : str, execution_pr
 			inference_execution_providers.append((weyfusion.choices.execution_provider_set.get(execution_provider),
 			{
 				'device_id': execution_device_id,
-				'cudnn_conv_algo_search': 'DEFAULT' if is_geforce_16_series() else 'EXHAUSTIVE'
+				'cudnn_conv_algo_search': 'DEFAULT' if is_geforce_16_series() else 'EXHAUSTIVE',
+				'arena_extend_strategy': resolve_arena_extend_strategy(execution_memory_arena)
 			}))
 		if execution_provider == 'tensorrt':
 			inference_execution_providers.append((weyfusion.choices.execution_provider_set.get(execution_provider),
@@ -53,11 +56,17 @@ def create_inference_execution_providers(execution_device_id : str, execution_pr
 				'device_type': 'GPU' if execution_device_id == '0' else 'GPU.' + execution_device_id,
 				'precision': 'FP32'
 			}))
-		if execution_provider in [ 'directml', 'rocm' ]:
+		if execution_provider == 'directml':
 			inference_execution_providers.append((weyfusion.choices.execution_provider_set.get(execution_provider),
 			{
 				'device_id': execution_device_id
 			}))
+		if execution_provider == 'rocm':
+			inference_execution_providers.append((weyfusion.choices.execution_provider_set.get(execution_provider),
+			{
+				'device_id': execution_device_id,
+				'arena_extend_strategy': resolve_arena_extend_strategy(execution_memory_arena)
+			}))
 		if execution_provider == 'coreml':
 			inference_execution_providers.append(weyfusion.choices.execution_provider_set.get(execution_provider))
 
@@ -67,6 +76,12 @@ def create_inference_execution_providers(execution_device_id : str, execution_pr
 	return inference_execution_providers
 
 
+def resolve_arena_extend_strategy(execution_memory_arena : ExecutionMemoryArena) -> str:
+	if execution_memory_arena in [ 'same_as_requested', 'disable' ]:
+		return 'kSameAsRequested'
+	return 'kNextPowerOfTwo'
+
+
 def is_geforce_16_series() -> bool:
 	execution_devices = detect_static_execution_devices()
 	product_names = ('GeForce GTX 1630', 'GeForce GTX 1650', 'GeForce GTX 1660')
@@ -93,9 +108,10 @@ def detect_execution_devices() -> List[ExecutionDevice]:
 	except Exception:
 		root_element = ElementTree.Element('xml')
 
-	for gpu_element in root_element.findall('gpu'):
+	for gpu_index, gpu_element in enumerate(root_element.findall('gpu')):
 		execution_devices.append(
 		{
+			'id': resolve_execution_device_id(gpu_index, gpu_element.findtext('uuid')),
 			'driver_version': root_element.findtext('driver_version'),
 			'framework':
 			{
@@ -127,6 +143,19 @@ def detect_execution_devices() -> List[ExecutionDevice]:
 	return execution_devices
 
 
+def resolve_execution_device_id(gpu_index : int, gpu_uuid : Optional[str]) -> Optional[str]:
+	visible_devices = os.environ.get('CUDA_VISIBLE_DEVICES')
+
+	if visible_devices is None:
+		return str(gpu_index)
+	for execution_device_id, visible_device in enumerate(visible_devices.split(',')):
+		visible_device = visible_device.strip()
+
+		if visible_device == str(gpu_index) or gpu_uuid and visible_device.startswith('GPU-') and gpu_uuid.startswith(visible_device):
+			return str(execution_device_id)
+	return None
+
+
 def create_value_and_unit(text : str) -> Optional[ValueAndUnit]:
 	if ' ' in text:
 		value, unit = text.split(' ')
@@ -4,13 +4,18 @@ import numpy
 
 from weyfusion import state_manager
 from weyfusion.common_helper import get_first
+from weyfusion.face_cache import get_cached_faces, get_face_cache_frame_number, set_cached_faces
 from weyfusion.face_classifier import classify_face
 from weyfusion.face_detector import detect_faces, detect_rotated_faces
 from weyfusion.face_helper import apply_nms, convert_to_face_landmark_5, estimate_face_angle, get_nms_threshold
 from weyfusion.face_landmarker import detect_face_landmarks, estimate_face_landmark_68_5
 from weyfusion.face_recognizer import calc_embedding
-from weyfusion.face_store import get_static_faces, set_static_faces
+from weyfusion.face_selector import sort_faces_by_order
+from weyfusion.face_store import get_source_face, get_static_faces, set_source_face, set_static_faces
+from weyfusion.face_tracker import detect_face_tracker_anchor, track_faces
+from weyfusion.filesystem import filter_image_paths
 from weyfusion.typing import BoundingBox, Face, FaceLandmark5, FaceLandmarkSet, FaceScoreSet, Score, VisionFrame
+from weyfusion.vision import read_static_image
 
 
 def create_faces(vision_frame : VisionFrame, bounding_boxes : List[BoundingBox], face_scores : List[Score], face_landmarks_5 : List[FaceLandmark5]) -> List[Face]:
@@ -99,26 +104,57 @@ def get_many_faces(vision_frames : List[VisionFrame]) -> List[Face]:
 	for vision_frame in vision_frames:
 		if numpy.any(vision_frame):
 			static_faces = get_static_faces(vision_frame)
+			cached_faces = None if static_faces else get_cached_faces(vision_frame)
 			if static_faces:
 				many_faces.extend(static_faces)
+			elif cached_faces is not None:
+				many_faces.extend(cached_faces)
+				set_static_faces(vision_frame, cached_faces)
 			else:
-				all_bounding_boxes = []
-				all_face_scores = []
-				all_face_landmarks_5 = []
-
-				for face_detector_angle in state_manager.get_item('face_detector_angles'):
-					if face_detector_angle == 0:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
-					else:
-						bounding_boxes, face_scores, face_landmarks_5 = detect_rotated_faces(vision_frame, face_detector_angle)
-					all_bounding_boxes.extend(bounding_boxes)
-					all_face_scores.extend(face_scores)
-					all_face_landmarks_5.extend(face_landmarks_5)
-
-				if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
-					faces = create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
-
-					if faces:
-						many_faces.extend(faces)
-						set_static_faces(vision_frame, faces)
+				frame_number = get_face_cache_frame_number(vision_frame)
+				faces = track_faces(vision_frame, frame_number) if frame_number is not None else None
+
+				if faces is None:
+					faces = detect_many_faces(vision_frame)
+					if frame_number is not None:
+						detect_face_tracker_anchor(vision_frame, frame_number, faces)
+				if faces:
+					many_faces.extend(faces)
+					set_static_faces(vision_frame, faces)
+				set_cached_faces(vision_frame, faces)
 	return many_faces
+
+
+def get_source_faces(source_paths : List[str]) -> List[Face]:
+	source_faces = []
+
+	for source_path in filter_image_paths(source_paths):
+		source_face = get_source_face(source_path)
+
+		if not source_face:
+			temp_faces = sort_faces_by_order(get_many_faces([ read_static_image(source_path) ]), 'large-small')
+			source_face = get_first(temp_faces)
+			if source_face:
+				set_source_face(source_path, source_face)
+		if source_face:
+			source_faces.append(source_face)
+	return source_faces
+
+
+def detect_many_faces(vision_frame : VisionFrame) -> List[Face]:
+	all_bounding_boxes = []
+	all_face_scores = []
+	all_face_landmarks_5 = []
+
+	for face_detector_angle in state_manager.get_item('face_detector_angles'):
+		if face_detector_angle == 0:
+			bounding_boxes, face_scores, face_landmarks_5 = detect_faces(vision_frame)
+		else:
+			bounding_boxes, face_scores, face_landmarks_5 = detect_rotated_faces(vision_frame, face_detector_angle)
+		all_bounding_boxes.extend(bounding_boxes)
+		all_face_scores.extend(face_scores)
+		all_face_landmarks_5.extend(face_landmarks_5)
+
+	if all_bounding_boxes and all_face_scores and all_face_landmarks_5 and state_manager.get_item('face_detector_score') > 0:
+		return create_faces(vision_frame, all_bounding_boxes, all_face_scores, all_face_landmarks_5)
+	return []
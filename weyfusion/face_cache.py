@@ -0,0 +1,209 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+
+from weyfusion import state_manager
+from weyfusion.common_helper import get_first
+from weyfusion.typing import Face, FaceCacheContext, SourceIdentity, VisionFrame
+
+FACE_CACHE_LOCK : threading.Lock = threading.Lock()
+FACE_CACHE_CONNECTIONS : Dict[str, sqlite3.Connection] = {}
+FACE_CACHE_CONTEXT : ContextVar[Optional[FaceCacheContext]] = ContextVar('face_cache_context', default = None)
+
+
+def set_face_cache_context(frame_number : int, vision_frame : VisionFrame) -> Token[Optional[FaceCacheContext]]:
+	return FACE_CACHE_CONTEXT.set(
+	{
+		'frame_number': frame_number,
+		'vision_frame': vision_frame
+	})
+
+
+def reset_face_cache_context(token : Token[Optional[FaceCacheContext]]) -> None:
+	FACE_CACHE_CONTEXT.reset(token)
+
+
+def get_face_cache_frame_number(vision_frame : VisionFrame) -> Optional[int]:
+	face_cache_context = FACE_CACHE_CONTEXT.get()
+
+	if face_cache_context and face_cache_context.get('vision_frame') is vision_frame:
+		return face_cache_context.get('frame_number')
+	return None
+
+
+def get_cached_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
+	cache_key = create_cache_key(vision_frame)
+	connection = get_cache_connection()
+
+	if cache_key and connection:
+		with FACE_CACHE_LOCK:
+			row = connection.execute('SELECT face_metadata, face_arrays FROM faces WHERE cache_key = ?', (cache_key,)).fetchone()
+		if row:
+			return unpack_faces(row[0], row[1])
+	return None
+
+
+def set_cached_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
+	cache_key = create_cache_key(vision_frame)
+	connection = get_cache_connection()
+
+	if cache_key and connection:
+		face_metadata, face_arrays = pack_faces(faces)
+		with FACE_CACHE_LOCK:
+			connection.execute('INSERT OR REPLACE INTO faces (cache_key, face_metadata, face_arrays) VALUES (?, ?, ?)', (cache_key, face_metadata, face_arrays))
+			connection.commit()
+
+
+def get_cached_source_identity(identity_key : str) -> Optional[SourceIdentity]:
+	connection = get_cache_connection()
+
+	if connection:
+		with FACE_CACHE_LOCK:
+			row = connection.execute('SELECT face_metadata, face_arrays, embedding_arrays FROM source_identities WHERE identity_key = ?', (identity_key,)).fetchone()
+		if row:
+			return unpack_source_identity(row[0], row[1], row[2])
+	return None
+
+
+def set_cached_source_identity(identity_key : str, source_identity : SourceIdentity) -> None:
+	connection = get_cache_connection()
+
+	if connection:
+		face_metadata, face_arrays, embedding_arrays = pack_source_identity(source_identity)
+		with FACE_CACHE_LOCK:
+			connection.execute('INSERT OR REPLACE INTO source_identities (identity_key, face_metadata, face_arrays, embedding_arrays) VALUES (?, ?, ?, ?)', (identity_key, face_metadata, face_arrays, embedding_arrays))
+			connection.commit()
+
+
+def create_cache_key(vision_frame : VisionFrame) -> Optional[str]:
+	face_cache_context = FACE_CACHE_CONTEXT.get()
+	target_path = state_manager.get_item('target_path')
+
+	if face_cache_context and face_cache_context.get('vision_frame') is vision_frame and target_path and os.path.isfile(target_path):
+		cache_values =\
+		[
+			create_target_fingerprint(target_path, os.path.getsize(target_path), os.path.getmtime(target_path)),
+			face_cache_context.get('frame_number'),
+			state_manager.get_item('trim_frame_start'),
+			state_manager.get_item('output_video_fps'),
+			vision_frame.shape,
+			state_manager.get_item('face_detector_model'),
+			state_manager.get_item('face_detector_size'),
+			state_manager.get_item('face_detector_angles'),
+			state_manager.get_item('face_detector_score'),
+			state_manager.get_item('face_detector_interval'),
+			state_manager.get_item('face_landmarker_model'),
+			state_manager.get_item('face_landmarker_score')
+		]
+		return hashlib.sha1(json.dumps(cache_values).encode()).hexdigest()
+	return None
+
+
+@lru_cache(maxsize = None)
+def create_target_fingerprint(target_path : str, target_size : int, target_mtime : float) -> str:
+	chunk_size = 1024 * 1024
+	target_hash = hashlib.sha1(str(target_size).encode())
+
+	with open(target_path, 'rb') as target_file:
+		target_hash.update(target_file.read(chunk_size))
+		target_file.seek(max(target_size - chunk_size, 0))
+		target_hash.update(target_file.read(chunk_size))
+	return target_hash.hexdigest()
+
+
+def get_cache_connection() -> Optional[sqlite3.Connection]:
+	cache_path = state_manager.get_item('cache_path')
+
+	if cache_path:
+		with FACE_CACHE_LOCK:
+			if cache_path not in FACE_CACHE_CONNECTIONS:
+				os.makedirs(cache_path, exist_ok = True)
+				connection = sqlite3.connect(os.path.join(cache_path, 'faces.db'), timeout = 30, check_same_thread = False)
+				connection.execute('PRAGMA journal_mode = WAL')
+				connection.execute('PRAGMA synchronous = NORMAL')
+				connection.execute('CREATE TABLE IF NOT EXISTS faces (cache_key TEXT PRIMARY KEY, face_metadata TEXT, face_arrays BLOB)')
+				connection.execute('CREATE TABLE IF NOT EXISTS source_identities (identity_key TEXT PRIMARY KEY, face_metadata TEXT, face_arrays BLOB, embedding_arrays BLOB)')
+				connection.commit()
+				FACE_CACHE_CONNECTIONS[cache_path] = connection
+			return FACE_CACHE_CONNECTIONS.get(cache_path)
+	return None
+
+
+def clear_cache_connections() -> None:
+	with FACE_CACHE_LOCK:
+		for connection in FACE_CACHE_CONNECTIONS.values():
+			connection.close()
+		FACE_CACHE_CONNECTIONS.clear()
+
+
+def pack_faces(faces : List[Face]) -> Tuple[str, bytes]:
+	face_metadata = []
+	face_arrays = {}
+
+	for index, face in enumerate(faces):
+		face_metadata.append(
+		{
+			'score_set': { key: float(value) for key, value in face.score_set.items() },
+			'landmark_keys': list(face.landmark_set.keys()),
+			'angle': int(face.angle),
+			'gender': face.gender,
+			'age': [ face.age.start, face.age.stop ],
+			'race': face.race
+		})
+		face_arrays[str(index) + '.bounding_box'] = face.bounding_box
+		face_arrays[str(index) + '.embedding'] = face.embedding
+		face_arrays[str(index) + '.normed_embedding'] = face.normed_embedding
+
+		for landmark_index, face_landmark in enumerate(face.landmark_set.values()):
+			face_arrays[str(index) + '.landmark.' + str(landmark_index)] = face_landmark
+
+	face_buffer = io.BytesIO()
+	numpy.savez(face_buffer, **face_arrays)
+	return json.dumps(face_metadata), face_buffer.getvalue()
+
+
+def unpack_faces(face_metadata : str, face_arrays : bytes) -> List[Face]:
+	faces = []
+
+	with numpy.load(io.BytesIO(face_arrays), allow_pickle = False) as face_array_set:
+		for index, face_values in enumerate(json.loads(face_metadata)):
+			faces.append(Face(
+				bounding_box = face_array_set[str(index) + '.bounding_box'],
+				score_set = face_values.get('score_set'),
+				landmark_set = { landmark_key: face_array_set[str(index) + '.landmark.' + str(landmark_index)] for landmark_index, landmark_key in enumerate(face_values.get('landmark_keys')) },
+				angle = face_values.get('angle'),
+				embedding = face_array_set[str(index) + '.embedding'],
+				normed_embedding = face_array_set[str(index) + '.normed_embedding'],
+				gender = face_values.get('gender'),
+				age = range(*face_values.get('age')),
+				race = face_values.get('race')
+			))
+	return faces
+
+
+def pack_source_identity(source_identity : SourceIdentity) -> Tuple[str, bytes, bytes]:
+	source_face = source_identity.get('source_face')
+	face_metadata, face_arrays = pack_faces([ source_face ] if source_face else [])
+	embedding_buffer = io.BytesIO()
+	numpy.savez(embedding_buffer, **source_identity.get('source_embeddings')) #type:ignore[arg-type]
+	return face_metadata, face_arrays, embedding_buffer.getvalue()
+
+
+def unpack_source_identity(face_metadata : str, face_arrays : bytes, embedding_arrays : bytes) -> SourceIdentity:
+	source_faces = unpack_faces(face_metadata, face_arrays)
+
+	with numpy.load(io.BytesIO(embedding_arrays), allow_pickle = False) as embedding_array_set:
+		source_embeddings = { model_key: embedding_array_set[model_key] for model_key in embedding_array_set.files }
+	return\
+	{
+		'source_face': get_first(source_faces),
+		'source_embeddings': source_embeddings
+	}
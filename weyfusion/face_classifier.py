@@ -7,7 +7,7 @@ from weyfusion import inference_manager
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.face_helper import warp_face_by_face_landmark_5
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import conditional_thread_semaphore
+from weyfusion.inference_batcher import run_inference
 from weyfusion.typing import Age, DownloadScope, FaceLandmark5, Gender, InferencePool, ModelOptions, ModelSet, Race, VisionFrame
 
 
@@ -82,11 +82,10 @@ def classify_face(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandmar
 def forward(crop_vision_frame : VisionFrame) -> Tuple[List[int], List[int], List[int]]:
 	face_classifier = get_inference_pool().get('face_classifier')
 
-	with conditional_thread_semaphore():
-		race_id, gender_id, age_id = face_classifier.run(None,
-		{
-			'input': crop_vision_frame
-		})
+	race_id, gender_id, age_id = run_inference(face_classifier,
+	{
+		'input': crop_vision_frame
+	})
 
 	return gender_id, age_id, race_id
 
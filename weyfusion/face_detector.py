@@ -8,7 +8,6 @@ from weyfusion import inference_manager, state_manager
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.face_helper import create_rotated_matrix_and_size, create_static_anchors, distance_to_bounding_box, distance_to_face_landmark_5, normalize_bounding_box, transform_bounding_box, transform_points
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import thread_semaphore
 from weyfusion.typing import Angle, BoundingBox, Detection, DownloadScope, DownloadSet, FaceLandmark5, InferencePool, ModelSet, Score, VisionFrame
 from weyfusion.vision import resize_frame_resolution, unpack_resolution
 from weyfusion.model_helper import generate_model_file
@@ -110,6 +109,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def collect_model_downloads() -> Tuple[DownloadSet, DownloadSet]:
 	model_hashes = {}
 	model_sources = {}
@@ -293,26 +293,24 @@ def detect_with_yoloface(vision_frame : VisionFrame, face_detector_size : str) -
 	return bounding_boxes, face_scores, face_landmarks_5
 
 
-def forward_with_retinaface(detect_vision_frame : VisionFrame) -> Detection:
+def forward_with_retinaface(detect_vision_frame : VisionFrame) -> List[Detection]:
 	face_detector = get_inference_pool().get('retinaface')
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference_session(face_detector,
+	{
+		'input': detect_vision_frame
+	})
 
 	return detection
 
 
-def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
+def forward_with_scrfd(detect_vision_frame : VisionFrame) -> List[Detection]:
 	face_detector = get_inference_pool().get('scrfd')
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference_session(face_detector,
+	{
+		'input': detect_vision_frame
+	})
 
 	return detection
 
@@ -320,11 +318,10 @@ def forward_with_scrfd(detect_vision_frame : VisionFrame) -> Detection:
 def forward_with_yoloface(detect_vision_frame : VisionFrame) -> Detection:
 	face_detector = get_inference_pool().get('yoloface')
 
-	with thread_semaphore():
-		detection = face_detector.run(None,
-		{
-			'input': detect_vision_frame
-		})
+	detection = inference_manager.run_inference_session(face_detector,
+	{
+		'input': detect_vision_frame
+	})[0]
 
 	return detection
 
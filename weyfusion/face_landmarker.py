@@ -8,7 +8,7 @@ from weyfusion import inference_manager, state_manager
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.face_helper import create_rotated_matrix_and_size, estimate_matrix_by_face_landmark_5, transform_points, warp_face_by_translation
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import conditional_thread_semaphore
+from weyfusion.inference_batcher import run_inference
 from weyfusion.typing import Angle, BoundingBox, DownloadScope, DownloadSet, FaceLandmark5, FaceLandmark68, InferencePool, ModelSet, Prediction, Score, VisionFrame
 
 
@@ -87,6 +87,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def collect_model_downloads() -> Tuple[DownloadSet, DownloadSet]:
 	model_set = create_static_model_set('full')
 	model_hashes =\
@@ -189,23 +190,21 @@ def estimate_face_landmark_68_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark
 def forward_with_2dfan4(crop_vision_frame : VisionFrame) -> Tuple[Prediction, Prediction]:
 	face_landmarker = get_inference_pool().get('2dfan4')
 
-	with conditional_thread_semaphore():
-		prediction = face_landmarker.run(None,
-		{
-			'input': [ crop_vision_frame ]
-		})
+	face_landmark_68, face_heatmap = run_inference(face_landmarker,
+	{
+		'input': [ crop_vision_frame ]
+	})
 
-	return prediction
+	return face_landmark_68, face_heatmap
 
 
 def forward_with_peppa_wutz(crop_vision_frame : VisionFrame) -> Prediction:
 	face_landmarker = get_inference_pool().get('peppa_wutz')
 
-	with conditional_thread_semaphore():
-		prediction = face_landmarker.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	prediction = run_inference(face_landmarker,
+	{
+		'input': crop_vision_frame
+	})[0]
 
 	return prediction
 
@@ -213,10 +212,9 @@ def forward_with_peppa_wutz(crop_vision_frame : VisionFrame) -> Prediction:
 def forward_fan_68_5(face_landmark_5 : FaceLandmark5) -> FaceLandmark68:
 	face_landmarker = get_inference_pool().get('fan_68_5')
 
-	with conditional_thread_semaphore():
-		face_landmark_68_5 = face_landmarker.run(None,
-		{
-			'input': [ face_landmark_5 ]
-		})[0][0]
+	face_landmark_68_5 = run_inference(face_landmarker,
+	{
+		'input': [ face_landmark_5 ]
+	})[0][0]
 
 	return face_landmark_68_5
@@ -9,7 +9,6 @@ import weyfusion.choices
 from weyfusion import inference_manager, state_manager
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import conditional_thread_semaphore
 from weyfusion.typing import DownloadScope, DownloadSet, FaceLandmark68, FaceMaskRegion, InferencePool, Mask, ModelSet, Padding, VisionFrame
 
 
@@ -109,6 +108,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def collect_model_downloads() -> Tuple[DownloadSet, DownloadSet]:
 	model_hashes = {}
 	model_sources = {}
@@ -195,11 +195,10 @@ def forward_occlude_face(prepare_vision_frame : VisionFrame) -> Mask:
 	face_occluder_model = state_manager.get_item('face_occluder_model')
 	face_occluder = get_inference_pool().get(face_occluder_model)
 
-	with conditional_thread_semaphore():
-		occlusion_mask : Mask = face_occluder.run(None,
-		{
-			'input': prepare_vision_frame
-		})[0][0]
+	occlusion_mask : Mask = inference_manager.run_inference_session(face_occluder,
+	{
+		'input': prepare_vision_frame
+	})[0][0]
 
 	return occlusion_mask
 
@@ -208,10 +207,9 @@ def forward_parse_face(prepare_vision_frame : VisionFrame) -> Mask:
 	face_parser_model = state_manager.get_item('face_parser_model')
 	face_parser = get_inference_pool().get(face_parser_model)
 
-	with conditional_thread_semaphore():
-		region_mask : Mask = face_parser.run(None,
-		{
-			'input': prepare_vision_frame
-		})[0][0]
+	region_mask : Mask = inference_manager.run_inference_session(face_parser,
+	{
+		'input': prepare_vision_frame
+	})[0][0]
 
 	return region_mask
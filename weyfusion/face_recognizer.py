@@ -7,7 +7,7 @@ from weyfusion import inference_manager
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.face_helper import warp_face_by_face_landmark_5
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import conditional_thread_semaphore
+from weyfusion.inference_batcher import run_inference
 from weyfusion.typing import DownloadScope, Embedding, FaceLandmark5, InferencePool, ModelOptions, ModelSet, VisionFrame
 
 
@@ -75,10 +75,9 @@ def calc_embedding(temp_vision_frame : VisionFrame, face_landmark_5 : FaceLandma
 def forward(crop_vision_frame : VisionFrame) -> Embedding:
 	face_recognizer = get_inference_pool().get('face_recognizer')
 
-	with conditional_thread_semaphore():
-		embedding = face_recognizer.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	embedding = run_inference(face_recognizer,
+	{
+		'input': crop_vision_frame
+	})[0]
 
 	return embedding
@@ -1,14 +1,27 @@
 import hashlib
+import os
+import threading
+from collections import OrderedDict
 from typing import List, Optional
 
 import numpy
 
+from weyfusion import state_manager
+from weyfusion.face_cache import create_cache_key
 from weyfusion.typing import Face, FaceSet, FaceStore, VisionFrame
 
+FACE_STORE_LOCK : threading.Lock = threading.Lock()
 FACE_STORE : FaceStore =\
 {
-	'static_faces': {},
-	'reference_faces': {}
+	'static_faces': OrderedDict(),
+	'static_face_counts':
+	{
+		'hits': 0,
+		'misses': 0,
+		'evictions': 0
+	},
+	'reference_faces': {},
+	'source_faces': {}
 }
 
 
@@ -18,23 +31,53 @@ def get_face_store() -> FaceStore:
 
 def get_static_faces(vision_frame : VisionFrame) -> Optional[List[Face]]:
 	frame_hash = create_frame_hash(vision_frame)
-	if frame_hash in FACE_STORE['static_faces']:
-		return FACE_STORE['static_faces'][frame_hash]
+
+	with FACE_STORE_LOCK:
+		if frame_hash in FACE_STORE['static_faces']:
+			FACE_STORE['static_faces'].move_to_end(frame_hash)
+			FACE_STORE['static_face_counts']['hits'] += 1
+			return FACE_STORE['static_faces'][frame_hash]
+		FACE_STORE['static_face_counts']['misses'] += 1
 	return None
 
 
 def set_static_faces(vision_frame : VisionFrame, faces : List[Face]) -> None:
 	frame_hash = create_frame_hash(vision_frame)
+	face_store_limit = state_manager.get_item('face_store_limit')
+
 	if frame_hash:
-		FACE_STORE['static_faces'][frame_hash] = faces
+		with FACE_STORE_LOCK:
+			FACE_STORE['static_faces'][frame_hash] = faces
+			FACE_STORE['static_faces'].move_to_end(frame_hash)
+
+			while face_store_limit and len(FACE_STORE['static_faces']) > face_store_limit:
+				FACE_STORE['static_faces'].popitem(last = False)
+				FACE_STORE['static_face_counts']['evictions'] += 1
 
 
 def clear_static_faces() -> None:
-	FACE_STORE['static_faces'] = {}
+	with FACE_STORE_LOCK:
+		FACE_STORE['static_faces'] = OrderedDict()
+		FACE_STORE['static_face_counts'] =\
+		{
+			'hits': 0,
+			'misses': 0,
+			'evictions': 0
+		}
 
 
 def create_frame_hash(vision_frame : VisionFrame) -> Optional[str]:
-	return hashlib.sha1(vision_frame.tobytes()).hexdigest() if numpy.any(vision_frame) else None
+	cache_key = create_cache_key(vision_frame)
+
+	if cache_key:
+		return cache_key
+	sample_vision_frame = numpy.ascontiguousarray(vision_frame[::4, ::4])
+
+	if numpy.any(sample_vision_frame):
+		frame_hash = hashlib.sha1(str(vision_frame.shape).encode())
+		frame_hash.update(sample_vision_frame.data)
+		return frame_hash.hexdigest()
+	return None
 
 
 def get_reference_faces() -> Optional[FaceSet]:
@@ -51,3 +94,33 @@ def append_reference_face(name : str, face : Face) -> None:
 
 def clear_reference_faces() -> None:
 	FACE_STORE['reference_faces'] = {}
+
+
+def get_source_face(source_path : str) -> Optional[Face]:
+	source_face_key = create_source_face_key(source_path)
+
+	with FACE_STORE_LOCK:
+		return FACE_STORE['source_faces'].get(source_face_key)
+
+
+def set_source_face(source_path : str, face : Face) -> None:
+	source_face_key = create_source_face_key(source_path)
+
+	with FACE_STORE_LOCK:
+		FACE_STORE['source_faces'][source_face_key] = face
+
+
+def create_source_face_key(source_path : str) -> str:
+	source_face_values =\
+	[
+		source_path,
+		os.path.getsize(source_path),
+		os.path.getmtime(source_path),
+		state_manager.get_item('face_detector_model'),
+		state_manager.get_item('face_detector_size'),
+		state_manager.get_item('face_detector_angles'),
+		state_manager.get_item('face_detector_score'),
+		state_manager.get_item('face_landmarker_model'),
+		state_manager.get_item('face_landmarker_score')
+	]
+	return hashlib.sha1(str(source_face_values).encode()).hexdigest()
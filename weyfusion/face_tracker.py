@@ -0,0 +1,127 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import cv2
+import numpy
+
+from weyfusion import state_manager
+from weyfusion.face_helper import convert_to_face_landmark_5, transform_bounding_box, transform_points
+from weyfusion.typing import Face, FaceTrackerAnchor, VisionFrame
+
+FACE_TRACKER_LOCK : threading.Lock = threading.Lock()
+FACE_TRACKER_ANCHORS : 'OrderedDict[int, FaceTrackerAnchor]' = OrderedDict()
+FACE_TRACKER_ANCHOR_LIMIT = 32
+FACE_TRACKER_FRAME_SIZE = 640
+FACE_TRACKER_SCENE_SCORE = 0.9
+FACE_TRACKER_POINT_SCORE = 0.8
+
+
+def track_faces(vision_frame : VisionFrame, frame_number : int) -> Optional[List[Face]]:
+	face_tracker_anchor = find_face_tracker_anchor(frame_number)
+
+	if face_tracker_anchor:
+		frame_scale = get_frame_scale(vision_frame)
+		gray_frame = create_gray_frame(vision_frame, frame_scale)
+		histogram = create_histogram(gray_frame)
+
+		if face_tracker_anchor.get('gray_frame').shape == gray_frame.shape and cv2.compareHist(face_tracker_anchor.get('histogram'), histogram, cv2.HISTCMP_CORREL) > FACE_TRACKER_SCENE_SCORE:
+			faces = [ track_face(face_tracker_anchor.get('gray_frame'), gray_frame, frame_scale, face) for face in face_tracker_anchor.get('faces') ]
+
+			if None not in faces:
+				return faces
+	return None
+
+
+def track_face(anchor_gray_frame : VisionFrame, gray_frame : VisionFrame, frame_scale : float, face : Face) -> Optional[Face]:
+	face_landmark_68 = face.landmark_set.get('68').astype(numpy.float32)
+	track_points, track_status, _ = cv2.calcOpticalFlowPyrLK(anchor_gray_frame, gray_frame, (face_landmark_68 * frame_scale).reshape(-1, 1, 2), None, winSize = (21, 21), maxLevel = 3) #type:ignore[call-overload]
+	track_points = track_points.reshape(-1, 2) / frame_scale
+	track_status = track_status.ravel() == 1
+
+	if numpy.mean(track_status) >= FACE_TRACKER_POINT_SCORE:
+		affine_matrix, _ = cv2.estimateAffinePartial2D(face_landmark_68[track_status], track_points[track_status], method = cv2.LMEDS)
+
+		if affine_matrix is not None:
+			if not numpy.all(track_status):
+				track_points[~track_status] = transform_points(face_landmark_68[~track_status], affine_matrix)
+			landmark_set =\
+			{
+				'5': transform_points(face.landmark_set.get('5'), affine_matrix),
+				'5/68': convert_to_face_landmark_5(track_points),
+				'68': track_points,
+				'68/5': transform_points(face.landmark_set.get('68/5'), affine_matrix)
+			}
+			if numpy.array_equal(face.landmark_set.get('5/68'), face.landmark_set.get('5')):
+				landmark_set['5/68'] = landmark_set.get('5')
+			return face._replace(
+				bounding_box = transform_bounding_box(face.bounding_box, affine_matrix),
+				landmark_set = landmark_set
+			)
+	return None
+
+
+def find_face_tracker_anchor(frame_number : int) -> Optional[FaceTrackerAnchor]:
+	face_detector_interval = state_manager.get_item('face_detector_interval') or 1
+
+	for anchor_frame_number in range(frame_number - 1, frame_number - face_detector_interval, -1):
+		face_tracker_anchor = get_face_tracker_anchor(anchor_frame_number)
+
+		if face_tracker_anchor:
+			return face_tracker_anchor
+	return None
+
+
+def get_face_tracker_anchor(frame_number : int) -> Optional[FaceTrackerAnchor]:
+	with FACE_TRACKER_LOCK:
+		face_tracker_anchor = FACE_TRACKER_ANCHORS.get(frame_number)
+
+	if face_tracker_anchor and face_tracker_anchor.get('target_path') == state_manager.get_item('target_path'):
+		return face_tracker_anchor
+	return None
+
+
+def set_face_tracker_anchor(frame_number : int, gray_frame : VisionFrame, histogram : VisionFrame, faces : List[Face]) -> None:
+	with FACE_TRACKER_LOCK:
+		FACE_TRACKER_ANCHORS[frame_number] =\
+		{
+			'target_path': state_manager.get_item('target_path'),
+			'frame_number': frame_number,
+			'gray_frame': gray_frame,
+			'histogram': histogram,
+			'faces': faces
+		}
+		FACE_TRACKER_ANCHORS.move_to_end(frame_number)
+
+		while len(FACE_TRACKER_ANCHORS) > FACE_TRACKER_ANCHOR_LIMIT:
+			FACE_TRACKER_ANCHORS.popitem(last = False)
+
+
+def detect_face_tracker_anchor(vision_frame : VisionFrame, frame_number : int, faces : List[Face]) -> None:
+	face_detector_interval = state_manager.get_item('face_detector_interval') or 1
+
+	if face_detector_interval > 1:
+		gray_frame = create_gray_frame(vision_frame, get_frame_scale(vision_frame))
+		set_face_tracker_anchor(frame_number, gray_frame, create_histogram(gray_frame), faces)
+
+
+def get_frame_scale(vision_frame : VisionFrame) -> float:
+	return min(1.0, FACE_TRACKER_FRAME_SIZE / max(vision_frame.shape[:2]))
+
+
+def create_gray_frame(vision_frame : VisionFrame, frame_scale : float) -> VisionFrame:
+	gray_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY)
+
+	if frame_scale < 1:
+		gray_frame = cv2.resize(gray_frame, None, fx = frame_scale, fy = frame_scale, interpolation = cv2.INTER_AREA)
+	return gray_frame
+
+
+def create_histogram(gray_frame : VisionFrame) -> VisionFrame:
+	histogram = cv2.calcHist([ gray_frame ], [ 0 ], None, [ 32 ], [ 0, 256 ])
+	return cv2.normalize(histogram, histogram)
+
+
+def clear_face_tracker_anchors() -> None:
+	with FACE_TRACKER_LOCK:
+		FACE_TRACKER_ANCHORS.clear()
@@ -2,16 +2,17 @@ import os
 import shutil
 import subprocess
 import tempfile
-from typing import List, Optional
+from typing import Generator, List, Optional
 
 import filetype
+import numpy
 from tqdm import tqdm
 
 from weyfusion import logger, process_manager, state_manager, wording
 from weyfusion.filesystem import remove_file
 from weyfusion.temp_helper import get_temp_file_path, get_temp_frame_paths, get_temp_frames_pattern
-from weyfusion.typing import AudioBuffer, Fps, OutputVideoPreset, UpdateProgress
-from weyfusion.vision import count_trim_frame_total, detect_video_duration, restrict_video_fps
+from weyfusion.typing import AudioBuffer, Fps, OutputVideoPreset, UpdateProgress, VisionFrame
+from weyfusion.vision import count_trim_frame_total, detect_video_duration, detect_video_fps, restrict_video_fps, unpack_resolution
 
 
 def run_ffmpeg_with_progress(args: List[str], update_progress : UpdateProgress) -> subprocess.Popen[bytes]:
@@ -78,36 +79,60 @@ def log_debug(process : subprocess.Popen[bytes]) -> None:
 def extract_frames(target_path : str, temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> bool:
 	extract_frame_total = count_trim_frame_total(target_path, trim_frame_start, trim_frame_end)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
-	commands = [ '-i', target_path, '-s', str(temp_video_resolution), '-q:v', '0' ]
-
-	if isinstance(trim_frame_start, int) and isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_start, int):
-		commands.extend([ '-vf', 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps) ])
-	elif isinstance(trim_frame_end, int):
-		commands.extend([ '-vf', 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps) ])
-	else:
-		commands.extend([ '-vf', 'fps=' + str(temp_video_fps) ])
-	commands.extend([ '-vsync', '0', temp_frames_pattern ])
+	commands = create_extract_commands(target_path, temp_video_fps, trim_frame_start, trim_frame_end)
+	commands.extend([ '-s', str(temp_video_resolution), '-q:v', '0', '-vsync', '0', temp_frames_pattern ])
 
 	with tqdm(total = extract_frame_total, desc = wording.get('extracting'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
 		process = run_ffmpeg_with_progress(commands, lambda frame_number: progress.update(frame_number - progress.n))
 		return process.returncode == 0
 
 
+def create_extract_commands(target_path : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> List[str]:
+	video_fps = detect_video_fps(target_path)
+	commands = []
+
+	if state_manager.get_item('video_segment_size') and isinstance(trim_frame_start, int) and trim_frame_start > 0 and video_fps:
+		commands.extend([ '-ss', str((trim_frame_start - 0.5) / video_fps) ])
+		if isinstance(trim_frame_end, int):
+			trim_frame_end -= trim_frame_start
+		trim_frame_start = 0
+	commands.extend([ '-i', target_path, '-vf', create_extract_filter(temp_video_fps, trim_frame_start, trim_frame_end) ])
+	return commands
+
+
+def create_extract_filter(temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> str:
+	if isinstance(trim_frame_start, int) and isinstance(trim_frame_end, int):
+		return 'trim=start_frame=' + str(trim_frame_start) + ':end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps)
+	if isinstance(trim_frame_start, int):
+		return 'trim=start_frame=' + str(trim_frame_start) + ',fps=' + str(temp_video_fps)
+	if isinstance(trim_frame_end, int):
+		return 'trim=end_frame=' + str(trim_frame_end) + ',fps=' + str(temp_video_fps)
+	return 'fps=' + str(temp_video_fps)
+
+
 def merge_video(target_path : str, output_video_resolution : str, output_video_fps: Fps) -> bool:
-	output_video_encoder = state_manager.get_item('output_video_encoder')
-	output_video_quality = state_manager.get_item('output_video_quality')
-	output_video_preset = state_manager.get_item('output_video_preset')
 	merge_frame_total = len(get_temp_frame_paths(target_path))
 	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
 	temp_file_path = get_temp_file_path(target_path)
 	temp_frames_pattern = get_temp_frames_pattern(target_path, '%08d')
+	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern ]
+	commands.extend(create_encode_commands(target_path, output_video_resolution, output_video_fps))
+	commands.extend([ '-y', temp_file_path ])
+
+	with tqdm(total = merge_frame_total, desc = wording.get('merging'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		process = run_ffmpeg_with_progress(commands, lambda frame_number: progress.update(frame_number - progress.n))
+		return process.returncode == 0
+
+
+def create_encode_commands(target_path : str, output_video_resolution : str, output_video_fps : Fps) -> List[str]:
+	output_video_encoder = state_manager.get_item('output_video_encoder')
+	output_video_quality = state_manager.get_item('output_video_quality')
+	output_video_preset = state_manager.get_item('output_video_preset')
 	is_webm = filetype.guess_mime(target_path) == 'video/webm'
 
 	if is_webm:
 		output_video_encoder = 'libvpx-vp9'
-	commands = [ '-r', str(temp_video_fps), '-i', temp_frames_pattern, '-s', str(output_video_resolution), '-c:v', output_video_encoder ]
+	commands = [ '-s', str(output_video_resolution), '-c:v', output_video_encoder ]
 	if output_video_encoder in [ 'libx264', 'libx265' ]:
 		output_video_compression = round(51 - (output_video_quality * 0.51))
 		commands.extend([ '-crf', str(output_video_compression), '-preset', output_video_preset ])
@@ -122,11 +147,48 @@ def merge_video(target_path : str, output_video_resolution : str, output_video_f
 		commands.extend([ '-qp_i', str(output_video_compression), '-qp_p', str(output_video_compression), '-quality', map_amf_preset(output_video_preset) ])
 	if output_video_encoder in [ 'h264_videotoolbox', 'hevc_videotoolbox' ]:
 		commands.extend([ '-q:v', str(output_video_quality) ])
-	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709', '-y', temp_file_path ])
+	commands.extend([ '-vf', 'framerate=fps=' + str(output_video_fps), '-pix_fmt', 'yuv420p', '-colorspace', 'bt709' ])
+	return commands
 
-	with tqdm(total = merge_frame_total, desc = wording.get('merging'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		process = run_ffmpeg_with_progress(commands, lambda frame_number: progress.update(frame_number - progress.n))
-		return process.returncode == 0
+
+def open_extract_stream(target_path : str, temp_video_resolution : str, temp_video_fps : Fps, trim_frame_start : int, trim_frame_end : int) -> subprocess.Popen[bytes]:
+	commands = create_extract_commands(target_path, temp_video_fps, trim_frame_start, trim_frame_end)
+	commands.extend([ '-s', str(temp_video_resolution), '-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-' ])
+	return open_ffmpeg(commands)
+
+
+def open_merge_stream(target_path : str, temp_video_resolution : str, output_video_resolution : str, output_video_fps : Fps) -> subprocess.Popen[bytes]:
+	temp_video_fps = restrict_video_fps(target_path, output_video_fps)
+	temp_file_path = get_temp_file_path(target_path)
+	commands = [ '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', str(temp_video_resolution), '-r', str(temp_video_fps), '-i', '-' ]
+	commands.extend(create_encode_commands(target_path, output_video_resolution, output_video_fps))
+	commands.extend([ '-y', temp_file_path ])
+	return open_ffmpeg(commands)
+
+
+def read_stream_frames(process : subprocess.Popen[bytes], temp_video_resolution : str) -> Generator[VisionFrame, None, None]:
+	temp_width, temp_height = unpack_resolution(temp_video_resolution)
+	vision_frame = numpy.empty((temp_height, temp_width, 3), dtype = numpy.uint8)
+
+	while process.stdout.readinto(memoryview(vision_frame).cast('B')) == vision_frame.nbytes: #type:ignore[attr-defined, arg-type]
+		yield vision_frame
+		vision_frame = numpy.empty((temp_height, temp_width, 3), dtype = numpy.uint8)
+
+
+def write_stream_frame(process : subprocess.Popen[bytes], vision_frame : VisionFrame) -> bool:
+	try:
+		process.stdin.write(numpy.ascontiguousarray(vision_frame, dtype = numpy.uint8).data.cast('B'))
+		return True
+	except OSError:
+		return False
+
+
+def close_stream(process : subprocess.Popen[bytes]) -> bool:
+	if process.poll() is None:
+		process.stdin.close()
+		process.stdout.close()
+		process.wait()
+	return process.returncode == 0
 
 
 def concat_video(output_path : str, temp_output_paths : List[str]) -> bool:
@@ -0,0 +1,23 @@
+import json
+import shutil
+import subprocess
+from typing import List, Optional
+
+from weyfusion.typing import Content
+
+
+def run_ffprobe(args : List[str]) -> subprocess.Popen[bytes]:
+	commands = [ shutil.which('ffprobe'), '-hide_banner', '-loglevel', 'error' ]
+	commands.extend(args)
+	return subprocess.Popen(commands, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+
+
+def probe_media(media_path : str) -> Optional[Content]:
+	if shutil.which('ffprobe'):
+		output, _ = run_ffprobe([ '-print_format', 'json', '-show_format', '-show_streams', media_path ]).communicate()
+
+		try:
+			return json.loads(output)
+		except ValueError:
+			pass
+	return None
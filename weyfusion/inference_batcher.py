@@ -0,0 +1,121 @@
+import threading
+from time import time
+from typing import Any, List
+from weakref import WeakKeyDictionary
+
+import numpy
+from onnxruntime import InferenceSession
+
+from weyfusion import inference_manager, state_manager
+from weyfusion.typing import BatchContext, BatchRequest, InferenceInputs, InferenceOutputs
+
+BATCH_LOCK : threading.Lock = threading.Lock()
+BATCH_CONTEXTS : 'WeakKeyDictionary[InferenceSession, BatchContext]' = WeakKeyDictionary()
+
+
+def run_inference(inference_session : InferenceSession, inference_inputs : InferenceInputs) -> InferenceOutputs:
+	batch_size = min(state_manager.get_item('execution_batch_size') or 1, state_manager.get_item('execution_thread_count') or 1)
+	batch_context = get_batch_context(inference_session)
+
+	if inference_manager.has_inference_queue():
+		return inference_manager.submit_inference_task(inference_session, inference_inputs, batch_size if batch_context.get('is_batchable') else 1).result()
+	if batch_size > 1 and batch_context.get('is_batchable'):
+		return run_batch_inference(inference_session, inference_inputs, batch_size)
+	return inference_manager.run_inference_session(inference_session, inference_inputs)
+
+
+def run_batch_inference(inference_session : InferenceSession, inference_inputs : InferenceInputs, batch_size : int) -> InferenceOutputs:
+	batch_context = get_batch_context(inference_session)
+	batch_condition = batch_context.get('condition')
+	batch_requests = batch_context.get('requests')
+	batch_deadline = time() + (state_manager.get_item('execution_batch_latency') or 0) / 1000
+	batch_request : BatchRequest =\
+	{
+		'inputs': inference_inputs,
+		'outputs': None,
+		'exception': None
+	}
+
+	with batch_condition:
+		batch_requests.append(batch_request)
+		batch_condition.notify_all()
+
+		while batch_request.get('outputs') is None and batch_request.get('exception') is None:
+			if batch_requests and batch_requests[0] is batch_request and (len(batch_requests) >= batch_size or time() >= batch_deadline):
+				current_requests = batch_requests[:batch_size]
+				del batch_requests[:batch_size]
+				batch_condition.notify_all()
+				batch_condition.release()
+
+				try:
+					with inference_manager.checkout_inference_session(inference_session) as checkout_session:
+						scatter_batch_outputs(current_requests, checkout_session)
+				finally:
+					batch_condition.acquire()
+					batch_condition.notify_all()
+			elif batch_requests and batch_requests[0] is batch_request:
+				batch_condition.wait(max(batch_deadline - time(), 0))
+			else:
+				batch_condition.wait()
+
+	if batch_request.get('exception'):
+		raise batch_request.get('exception')
+	return batch_request.get('outputs')
+
+
+def scatter_batch_outputs(batch_requests : List[BatchRequest], inference_session : InferenceSession) -> None:
+	try:
+		if has_uniform_inputs(batch_requests):
+			inference_inputs = gather_batch_inputs(batch_requests)
+			inference_outputs = inference_session.run(None, inference_inputs)
+			batch_offset = 0
+
+			for batch_request in batch_requests:
+				batch_length = get_batch_length(batch_request)
+				batch_request['outputs'] = [ inference_output[batch_offset:batch_offset + batch_length] for inference_output in inference_outputs ]
+				batch_offset += batch_length
+		else:
+			for batch_request in batch_requests:
+				batch_request['outputs'] = inference_session.run(None, batch_request.get('inputs'))
+	except Exception as exception:
+		for batch_request in batch_requests:
+			batch_request['exception'] = exception
+
+
+def gather_batch_inputs(batch_requests : List[BatchRequest]) -> InferenceInputs:
+	inference_inputs = {}
+
+	for input_name in batch_requests[0].get('inputs').keys():
+		inference_inputs[input_name] = numpy.concatenate([ numpy.asarray(batch_request.get('inputs').get(input_name)) for batch_request in batch_requests ])
+	return inference_inputs
+
+
+def get_batch_length(batch_request : BatchRequest) -> int:
+	input_value = next(iter(batch_request.get('inputs').values()))
+	return numpy.shape(input_value)[0]
+
+
+def has_uniform_inputs(batch_requests : List[BatchRequest]) -> bool:
+	input_signatures = set()
+
+	for batch_request in batch_requests:
+		input_signature = tuple((input_name, numpy.shape(input_value), numpy.asarray(input_value).dtype.str) for input_name, input_value in batch_request.get('inputs').items())
+		input_signatures.add(input_signature)
+	return len(input_signatures) == 1
+
+
+def get_batch_context(inference_session : InferenceSession) -> BatchContext:
+	with BATCH_LOCK:
+		if inference_session not in BATCH_CONTEXTS:
+			BATCH_CONTEXTS[inference_session] =\
+			{
+				'condition': threading.Condition(),
+				'requests': [],
+				'is_batchable': is_batchable(inference_session)
+			}
+		return BATCH_CONTEXTS[inference_session]
+
+
+def is_batchable(inference_session : InferenceSession) -> bool:
+	inference_nodes : List[Any] = inference_session.get_inputs() + inference_session.get_outputs()
+	return all(inference_node.shape and not isinstance(inference_node.shape[0], int) for inference_node in inference_nodes)
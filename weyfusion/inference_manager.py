@@ -1,19 +1,34 @@
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from queue import Queue
 from time import sleep
-from typing import List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from onnxruntime import InferenceSession
+from onnxruntime import GraphOptimizationLevel, InferenceSession, SessionOptions
 
-from weyfusion import process_manager, state_manager
+from weyfusion import inference_batcher, process_manager, state_manager
 from weyfusion.app_context import detect_app_context
-from weyfusion.execution import create_inference_execution_providers
+from weyfusion.common_helper import get_first
+from weyfusion.execution import create_inference_execution_providers, has_execution_provider
+from weyfusion.normalizer import normalize_session_limits
 from weyfusion.thread_helper import thread_lock
-from weyfusion.typing import DownloadSet, ExecutionProvider, InferencePool, InferencePoolSet
+from weyfusion.typing import AppContext, BatchRequest, DownloadSet, ExecutionGraphOptimization, ExecutionProvider, InferenceInputs, InferenceOutputs, InferencePool, InferencePoolSet, InferenceQueue, InferenceSessionPool, InferenceTask
 
 INFERENCE_POOLS : InferencePoolSet =\
 {
 	'cli': {}, #type:ignore[typeddict-item]
 	'ui': {} #type:ignore[typeddict-item]
 }
+INFERENCE_POOL_RETENTION : bool = False
+RETAINED_INFERENCE_CONTEXTS : Set[Tuple[AppContext, str]] = set()
+USED_INFERENCE_CONTEXTS : Set[Tuple[AppContext, str]] = set()
+INFERENCE_SESSION_POOLS : Dict[InferenceSession, InferenceSessionPool] = {}
+INFERENCE_QUEUES : Dict[str, InferenceQueue] = {}
+INFERENCE_DISPATCHERS : Dict[str, threading.Thread] = {}
+EXECUTION_DEVICE_CONTEXT : ContextVar[Optional[str]] = ContextVar('execution_device_context', default = None)
 
 
 def get_inference_pool(model_context : str, model_sources : DownloadSet) -> InferencePool:
@@ -23,41 +38,258 @@ def get_inference_pool(model_context : str, model_sources : DownloadSet) -> Infe
 		while process_manager.is_checking():
 			sleep(0.5)
 		app_context = detect_app_context()
-		inference_context = get_inference_context(model_context)
+		execution_device_id = get_execution_device_id()
+		inference_context = get_inference_context(model_context, execution_device_id)
 
 		if app_context == 'cli' and INFERENCE_POOLS.get('ui').get(inference_context):
 			INFERENCE_POOLS['cli'][inference_context] = INFERENCE_POOLS.get('ui').get(inference_context)
 		if app_context == 'ui' and INFERENCE_POOLS.get('cli').get(inference_context):
 			INFERENCE_POOLS['ui'][inference_context] = INFERENCE_POOLS.get('cli').get(inference_context)
 		if not INFERENCE_POOLS.get(app_context).get(inference_context):
-			INFERENCE_POOLS[app_context][inference_context] = create_inference_pool(model_sources, state_manager.get_item('execution_device_id'), state_manager.get_item('execution_providers'))
+			INFERENCE_POOLS[app_context][inference_context] = create_inference_pool(model_sources, get_session_limit(model_context), execution_device_id, state_manager.get_item('execution_providers'))
+		if INFERENCE_POOL_RETENTION:
+			USED_INFERENCE_CONTEXTS.add((app_context, inference_context))
 
 		return INFERENCE_POOLS.get(app_context).get(inference_context)
 
 
-def create_inference_pool(model_sources : DownloadSet, execution_device_id : str, execution_providers : List[ExecutionProvider]) -> InferencePool:
+def create_inference_pool(model_sources : DownloadSet, session_limit : int, execution_device_id : str, execution_providers : List[ExecutionProvider]) -> InferencePool:
 	inference_pool : InferencePool = {}
 
 	for model_name in model_sources.keys():
-		inference_pool[model_name] = create_inference_session(model_sources.get(model_name).get('path'), execution_device_id, execution_providers)
+		model_path = model_sources.get(model_name).get('path')
+		inference_pool[model_name] = create_inference_session(model_path, execution_device_id, execution_providers)
+
+		if session_limit > 0:
+			INFERENCE_SESSION_POOLS[inference_pool.get(model_name)] = create_inference_session_pool(inference_pool.get(model_name), model_path, session_limit, execution_device_id, execution_providers)
 	return inference_pool
 
 
+def create_inference_session_pool(inference_session : InferenceSession, model_path : str, session_limit : int, execution_device_id : str, execution_providers : List[ExecutionProvider]) -> InferenceSessionPool:
+	inference_session_pool : InferenceSessionPool = Queue()
+	inference_session_pool.put(inference_session)
+
+	for _ in range(session_limit - 1):
+		inference_session_pool.put(create_inference_session(model_path, execution_device_id, execution_providers))
+	return inference_session_pool
+
+
+def run_inference_session(inference_session : InferenceSession, inference_inputs : InferenceInputs) -> InferenceOutputs:
+	if has_inference_queue():
+		return submit_inference_task(inference_session, inference_inputs, 1).result()
+	with checkout_inference_session(inference_session) as checkout_session:
+		return checkout_session.run(None, inference_inputs)
+
+
+def submit_inference_task(inference_session : InferenceSession, inference_inputs : InferenceInputs, batch_size : int) -> Future[InferenceOutputs]:
+	inference_task : InferenceTask =\
+	{
+		'inference_session': inference_session,
+		'inputs': inference_inputs,
+		'batch_size': batch_size,
+		'future': Future()
+	}
+	get_inference_queue(get_execution_device_id()).put(inference_task)
+	return inference_task.get('future')
+
+
+def get_inference_queue(execution_device_id : str) -> InferenceQueue:
+	with thread_lock():
+		if execution_device_id not in INFERENCE_QUEUES:
+			INFERENCE_QUEUES[execution_device_id] = Queue()
+		if execution_device_id not in INFERENCE_DISPATCHERS or not INFERENCE_DISPATCHERS.get(execution_device_id).is_alive():
+			INFERENCE_DISPATCHERS[execution_device_id] = threading.Thread(target = dispatch_inference_tasks, args = (INFERENCE_QUEUES.get(execution_device_id),), daemon = True)
+			INFERENCE_DISPATCHERS.get(execution_device_id).start()
+		return INFERENCE_QUEUES.get(execution_device_id)
+
+
+def dispatch_inference_tasks(inference_queue : InferenceQueue) -> None:
+	while True:
+		inference_tasks = [ inference_queue.get() ]
+
+		while not inference_queue.empty():
+			inference_tasks.append(inference_queue.get_nowait())
+
+		try:
+			for inference_task_group in group_inference_tasks(inference_tasks):
+				run_inference_tasks(inference_task_group)
+		except Exception as exception:
+			for inference_task in inference_tasks:
+				resolve_inference_task(inference_task, None, exception)
+
+
+def group_inference_tasks(inference_tasks : List[InferenceTask]) -> List[List[InferenceTask]]:
+	inference_task_groups : List[List[InferenceTask]] = []
+
+	for inference_task in inference_tasks:
+		inference_task_group = next((inference_task_group for inference_task_group in inference_task_groups if inference_task_group[0].get('inference_session') is inference_task.get('inference_session') and len(inference_task_group) < inference_task.get('batch_size')), None)
+
+		if inference_task_group:
+			inference_task_group.append(inference_task)
+		else:
+			inference_task_groups.append([ inference_task ])
+	return inference_task_groups
+
+
+def run_inference_tasks(inference_tasks : List[InferenceTask]) -> None:
+	inference_session = inference_tasks[0].get('inference_session')
+	batch_requests : List[BatchRequest] =\
+	[
+		{
+			'inputs': inference_task.get('inputs'),
+			'outputs': None,
+			'exception': None
+		} for inference_task in inference_tasks
+	]
+
+	if len(batch_requests) > 1:
+		inference_batcher.scatter_batch_outputs(batch_requests, inference_session)
+	else:
+		try:
+			batch_requests[0]['outputs'] = inference_session.run(None, batch_requests[0].get('inputs'))
+		except Exception as exception:
+			batch_requests[0]['exception'] = exception
+
+	for inference_task, batch_request in zip(inference_tasks, batch_requests):
+		resolve_inference_task(inference_task, batch_request.get('outputs'), batch_request.get('exception'))
+
+
+def resolve_inference_task(inference_task : InferenceTask, inference_outputs : Optional[InferenceOutputs], exception : Optional[Exception]) -> None:
+	inference_future = inference_task.get('future')
+
+	if not inference_future.done():
+		if exception:
+			inference_future.set_exception(exception)
+		else:
+			inference_future.set_result(inference_outputs)
+
+
+def has_inference_queue() -> bool:
+	return has_execution_provider('directml') or has_execution_provider('rocm')
+
+
+@contextmanager
+def checkout_inference_session(inference_session : InferenceSession) -> Iterator[InferenceSession]:
+	inference_session_pool = INFERENCE_SESSION_POOLS.get(inference_session)
+
+	if inference_session_pool:
+		checkout_session = inference_session_pool.get()
+
+		try:
+			yield checkout_session
+		finally:
+			inference_session_pool.put(checkout_session)
+	else:
+		yield inference_session
+
+
 def clear_inference_pool(model_context : str) -> None:
 	global INFERENCE_POOLS
 
 	app_context = detect_app_context()
-	inference_context = get_inference_context(model_context)
 
-	if INFERENCE_POOLS.get(app_context).get(inference_context):
-		del INFERENCE_POOLS[app_context][inference_context]
+	for execution_device_id in get_execution_device_ids():
+		inference_context = get_inference_context(model_context, execution_device_id)
+
+		if INFERENCE_POOL_RETENTION:
+			RETAINED_INFERENCE_CONTEXTS.add((app_context, inference_context))
+		elif INFERENCE_POOLS.get(app_context).get(inference_context):
+			drop_inference_pool(app_context, inference_context)
+
+
+def retain_inference_pools() -> None:
+	global INFERENCE_POOL_RETENTION
+
+	with thread_lock():
+		INFERENCE_POOL_RETENTION = True
+		USED_INFERENCE_CONTEXTS.clear()
+
+
+def release_inference_pools(keep_used : bool) -> None:
+	global INFERENCE_POOL_RETENTION
+
+	with thread_lock():
+		for app_context, inference_context in list(RETAINED_INFERENCE_CONTEXTS):
+			if not keep_used or (app_context, inference_context) not in USED_INFERENCE_CONTEXTS:
+				drop_inference_pool(app_context, inference_context)
+				RETAINED_INFERENCE_CONTEXTS.discard((app_context, inference_context))
+		INFERENCE_POOL_RETENTION = keep_used
+
+
+def drop_inference_pool(app_context : AppContext, inference_context : str) -> None:
+	inference_pool = INFERENCE_POOLS.get(app_context).pop(inference_context, None)
+
+	if inference_pool and not any(INFERENCE_POOLS.get(other_context).get(inference_context) is inference_pool for other_context in INFERENCE_POOLS):
+		for inference_session in inference_pool.values():
+			INFERENCE_SESSION_POOLS.pop(inference_session, None)
 
 
 def create_inference_session(model_path : str, execution_device_id : str, execution_providers : List[ExecutionProvider]) -> InferenceSession:
-	inference_execution_providers = create_inference_execution_providers(execution_device_id, execution_providers)
-	return InferenceSession(model_path, providers = inference_execution_providers)
+	inference_execution_providers = create_inference_execution_providers(execution_device_id, execution_providers, state_manager.get_item('execution_memory_arena'))
+	return InferenceSession(model_path, sess_options = create_session_options(execution_providers), providers = inference_execution_providers)
+
+
+def create_session_options(execution_providers : List[ExecutionProvider]) -> SessionOptions:
+	session_options = SessionOptions()
+	session_options.intra_op_num_threads = resolve_intra_op_thread_count()
+	session_options.inter_op_num_threads = resolve_inter_op_thread_count()
+	session_options.graph_optimization_level = resolve_graph_optimization_level(state_manager.get_item('execution_graph_optimization'))
+	session_options.enable_cpu_mem_arena = state_manager.get_item('execution_memory_arena') != 'disable'
+	session_options.enable_mem_pattern = not state_manager.get_item('execution_skip_memory_pattern') and 'directml' not in execution_providers
+	return session_options
+
+
+def resolve_intra_op_thread_count() -> int:
+	if state_manager.get_item('execution_intra_op_thread_count'):
+		return state_manager.get_item('execution_intra_op_thread_count')
+	return max(1, (os.cpu_count() or 1) // (state_manager.get_item('execution_thread_count') or 1))
 
 
-def get_inference_context(model_context : str) -> str:
-	inference_context = model_context + '.' + '_'.join(state_manager.get_item('execution_providers'))
+def resolve_inter_op_thread_count() -> int:
+	if state_manager.get_item('execution_inter_op_thread_count'):
+		return state_manager.get_item('execution_inter_op_thread_count')
+	return 1
+
+
+def resolve_graph_optimization_level(execution_graph_optimization : ExecutionGraphOptimization) -> GraphOptimizationLevel:
+	if execution_graph_optimization == 'disable':
+		return GraphOptimizationLevel.ORT_DISABLE_ALL
+	if execution_graph_optimization == 'basic':
+		return GraphOptimizationLevel.ORT_ENABLE_BASIC
+	if execution_graph_optimization == 'extended':
+		return GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+	return GraphOptimizationLevel.ORT_ENABLE_ALL
+
+
+def get_inference_context(model_context : str, execution_device_id : str) -> str:
+	inference_context = model_context + '.' + execution_device_id + '.' + '_'.join(state_manager.get_item('execution_providers'))
+	session_limit = get_session_limit(model_context)
+
+	if session_limit > 0:
+		inference_context += '.' + str(session_limit)
 	return inference_context
+
+
+def get_session_limit(model_context : str) -> int:
+	session_limits = normalize_session_limits(state_manager.get_item('execution_session_limits'))
+	model_name = model_context.split('.')[-1]
+
+	if model_name in session_limits:
+		return session_limits.get(model_name)
+	return 0
+
+
+def set_execution_device_context(execution_device_id : str) -> Token[Optional[str]]:
+	return EXECUTION_DEVICE_CONTEXT.set(execution_device_id)
+
+
+def reset_execution_device_context(token : Token[Optional[str]]) -> None:
+	EXECUTION_DEVICE_CONTEXT.reset(token)
+
+
+def get_execution_device_id() -> str:
+	return EXECUTION_DEVICE_CONTEXT.get() or get_first(get_execution_device_ids())
+
+
+def get_execution_device_ids() -> List[str]:
+	return state_manager.get_item('execution_device_ids') or [ '0' ]
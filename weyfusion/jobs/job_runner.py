@@ -1,18 +1,29 @@
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Set
+
+from weyfusion import logger, state_manager
+from weyfusion.app_context import reset_app_context, set_app_context
 from weyfusion.ffmpeg import concat_video
 from weyfusion.filesystem import is_image, is_video, move_file, remove_file
 from weyfusion.jobs import job_helper, job_manager
-from weyfusion.typing import JobOutputSet, JobStep, ProcessStep
+from weyfusion.temp_helper import get_temp_directory_path
+from weyfusion.typing import JobOutputSet, JobStep, ProcessStep, State
 
 
 def run_job(job_id : str, process_step : ProcessStep) -> bool:
+	app_context_token = set_app_context('cli')
 	queued_job_ids = job_manager.find_job_ids('queued')
 
-	if job_id in queued_job_ids:
-		if run_steps(job_id, process_step) and finalize_steps(job_id):
+	try:
+		if job_id in queued_job_ids:
+			if run_steps(job_id, process_step) and finalize_steps(job_id):
+				clean_steps(job_id)
+				return job_manager.move_job_file(job_id, 'completed')
 			clean_steps(job_id)
-			return job_manager.move_job_file(job_id, 'completed')
-		clean_steps(job_id)
-		job_manager.move_job_file(job_id, 'failed')
+			job_manager.move_job_file(job_id, 'failed')
+	finally:
+		reset_app_context(app_context_token)
 	return False
 
 
@@ -47,14 +58,20 @@ def retry_jobs(process_step : ProcessStep) -> bool:
 
 
 def run_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
+	if job_manager.set_step_status(job_id, step_index, 'started') and process_job_step(job_id, step_index, step, process_step):
+		return job_manager.set_step_status(job_id, step_index, 'completed')
+	job_manager.set_step_status(job_id, step_index, 'failed')
+	return False
+
+
+def process_job_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
 	step_args = step.get('args')
 
-	if job_manager.set_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
+	if process_step(job_id, step_index, step_args):
 		output_path = step_args.get('output_path')
 		step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
 
-		return move_file(output_path, step_output_path) and job_manager.set_step_status(job_id, step_index, 'completed')
-	job_manager.set_step_status(job_id, step_index, 'failed')
+		return move_file(output_path, step_output_path)
 	return False
 
 
@@ -62,6 +79,8 @@ def run_steps(job_id : str, process_step : ProcessStep) -> bool:
 	steps = job_manager.get_steps(job_id)
 
 	if steps:
+		if state_manager.get_item('job_step_concurrency') and state_manager.get_item('job_step_concurrency') > 1 and len(steps) > 1:
+			return run_concurrent_steps(job_id, steps, process_step)
 		for index, step in enumerate(steps):
 			if not run_step(job_id, index, step, process_step):
 				return False
@@ -69,6 +88,69 @@ def run_steps(job_id : str, process_step : ProcessStep) -> bool:
 	return False
 
 
+def run_concurrent_steps(job_id : str, steps : List[JobStep], process_step : ProcessStep) -> bool:
+	step_dependencies = create_step_dependencies(job_id, steps)
+	step_concurrency = min(state_manager.get_item('job_step_concurrency'), len(steps))
+	pending_step_indices = list(range(len(steps)))
+	completed_step_indices : Set[int] = set()
+	step_futures : Dict[Future[bool], int] = {}
+	step_state = True
+
+	with ProcessPoolExecutor(max_workers = step_concurrency, mp_context = multiprocessing.get_context('spawn'), initializer = init_step_worker, initargs = (dict(state_manager.get_state()), job_manager.JOBS_PATH)) as executor: #type:ignore[arg-type]
+		while step_futures or step_state and pending_step_indices:
+			for step_index in list(pending_step_indices):
+				if step_state and len(step_futures) < step_concurrency and completed_step_indices.issuperset(step_dependencies[step_index]):
+					if not job_manager.set_step_status(job_id, step_index, 'started'):
+						step_state = False
+						break
+					step_future = executor.submit(process_job_step, job_id, step_index, steps[step_index], process_step)
+					step_futures[step_future] = step_index
+					pending_step_indices.remove(step_index)
+
+			done_step_futures, _ = wait(step_futures, return_when = FIRST_COMPLETED)
+
+			for step_future in done_step_futures:
+				step_index = step_futures.pop(step_future)
+
+				if resolve_step_future(step_future) and job_manager.set_step_status(job_id, step_index, 'completed'):
+					completed_step_indices.add(step_index)
+				else:
+					job_manager.set_step_status(job_id, step_index, 'failed')
+					step_state = False
+	return step_state
+
+
+def resolve_step_future(step_future : Future[bool]) -> bool:
+	try:
+		return step_future.result()
+	except Exception:
+		return False
+
+
+def init_step_worker(state : State, jobs_path : str) -> None:
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	logger.init(state_manager.get_item('log_level'))
+	job_manager.init_jobs(jobs_path)
+
+
+def create_step_dependencies(job_id : str, steps : List[JobStep]) -> List[List[int]]:
+	step_dependencies : List[List[int]] = []
+
+	for index, step in enumerate(steps):
+		step_args = step.get('args')
+		step_input_paths = (step_args.get('source_paths') or []) + [ step_args.get('target_path') ]
+		step_dependencies.append([])
+
+		for previous_index, previous_step in enumerate(steps[:index]):
+			previous_step_args = previous_step.get('args')
+			previous_step_output_path = job_helper.get_step_output_path(job_id, previous_index, previous_step_args.get('output_path'))
+
+			if previous_step_output_path in step_input_paths or step_args.get('output_path') == previous_step_args.get('output_path') or get_temp_directory_path(step_args.get('target_path')) == get_temp_directory_path(previous_step_args.get('target_path')):
+				step_dependencies[index].append(previous_index)
+	return step_dependencies
+
+
 def finalize_steps(job_id : str) -> bool:
 	output_set = collect_output_set(job_id)
 
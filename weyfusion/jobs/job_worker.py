@@ -0,0 +1,276 @@
+import os
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
+from weyfusion import state_manager
+from weyfusion.filesystem import create_directory, is_directory, is_file, move_file, remove_directory, remove_file
+from weyfusion.jobs import job_helper, job_manager, job_runner
+from weyfusion.typing import JobStep, JobStepStatus, ProcessStep
+
+HEARTBEAT_EVENT : threading.Event = threading.Event()
+HEARTBEAT_THREAD : Optional[threading.Thread] = None
+WORKER_POLL_INTERVAL : float = 1.0
+LOCK_POLL_INTERVAL : float = 0.1
+
+
+def get_worker_id() -> str:
+	return socket.gethostname() + '-' + str(os.getpid())
+
+
+def init_worker() -> bool:
+	lease_directory_path = get_lease_directory_path()
+	heartbeat_directory_path = get_heartbeat_directory_path()
+
+	create_directory(lease_directory_path)
+	create_directory(heartbeat_directory_path)
+	return is_directory(lease_directory_path) and is_directory(heartbeat_directory_path)
+
+
+def run_worker(process_step : ProcessStep) -> bool:
+	worker_state = True
+
+	if init_worker() and start_heartbeat():
+		try:
+			while True:
+				queued_job_ids = job_manager.find_job_ids('queued')
+
+				if not queued_job_ids:
+					break
+				if not run_worker_cycle(queued_job_ids, process_step):
+					worker_state = False
+		finally:
+			stop_heartbeat()
+		return worker_state
+	return False
+
+
+def run_worker_cycle(queued_job_ids : List[str], process_step : ProcessStep) -> bool:
+	for job_id in queued_job_ids:
+		steps = job_manager.get_steps(job_id)
+		step_index = find_pending_step_index(steps)
+
+		if steps and step_index is None:
+			return conclude_job(job_id)
+		if steps and step_index is not None and claim_step(job_id, step_index):
+			step = job_manager.get_steps(job_id)[step_index]
+
+			if step.get('status') in [ 'queued', 'started' ]:
+				step_state = run_worker_step(job_id, step_index, step, process_step)
+				release_lease(get_step_lease_name(job_id, step_index))
+				return conclude_job(job_id) and step_state
+			release_lease(get_step_lease_name(job_id, step_index))
+	time.sleep(WORKER_POLL_INTERVAL)
+	return True
+
+
+def find_pending_step_index(steps : List[JobStep]) -> Optional[int]:
+	for index, step in enumerate(steps):
+		if step.get('status') == 'failed':
+			return None
+		if step.get('status') != 'completed':
+			return index
+	return None
+
+
+def claim_step(job_id : str, step_index : int) -> bool:
+	lease_name = get_step_lease_name(job_id, step_index)
+	return claim_lease(lease_name) or reclaim_lease(lease_name) and claim_lease(lease_name)
+
+
+def run_worker_step(job_id : str, step_index : int, step : JobStep, process_step : ProcessStep) -> bool:
+	step_args = step.get('args')
+
+	if set_worker_step_status(job_id, step_index, 'started') and process_step(job_id, step_index, step_args):
+		output_path = step_args.get('output_path')
+		step_output_path = job_helper.get_step_output_path(job_id, step_index, output_path)
+
+		return move_file(output_path, step_output_path) and set_worker_step_status(job_id, step_index, 'completed')
+	set_worker_step_status(job_id, step_index, 'failed')
+	return False
+
+
+def set_worker_step_status(job_id : str, step_index : int, step_status : JobStepStatus) -> bool:
+	if lock_job(job_id):
+		step_state = job_manager.set_step_status(job_id, step_index, step_status)
+		release_lease(get_job_lease_name(job_id))
+		return step_state
+	return False
+
+
+def conclude_job(job_id : str) -> bool:
+	if lock_job(job_id):
+		job_state = True
+		steps = job_manager.get_steps(job_id)
+
+		if job_id in job_manager.find_job_ids('queued') and steps:
+			if all(step.get('status') == 'completed' for step in steps):
+				job_state = job_runner.finalize_steps(job_id)
+				job_runner.clean_steps(job_id)
+				job_manager.move_job_file(job_id, 'completed' if job_state else 'failed')
+			if any(step.get('status') == 'failed' for step in steps):
+				job_state = False
+				job_runner.clean_steps(job_id)
+				job_manager.move_job_file(job_id, 'failed')
+		release_lease(get_job_lease_name(job_id))
+		return job_state
+	return False
+
+
+def lock_job(job_id : str) -> bool:
+	lease_name = get_job_lease_name(job_id)
+	lock_time = time.time()
+
+	while time.time() - lock_time < state_manager.get_item('job_lease_timeout'):
+		if claim_lease(lease_name) or reclaim_lease(lease_name) and claim_lease(lease_name):
+			return True
+		time.sleep(LOCK_POLL_INTERVAL)
+	return False
+
+
+def claim_lease(lease_name : str) -> bool:
+	lease_path = get_lease_path(lease_name)
+	claim_path = lease_path + '.' + get_worker_id() + '.claim'
+
+	if create_directory(claim_path):
+		with open(os.path.join(claim_path, 'owner'), 'w') as owner_file:
+			owner_file.write(get_worker_id())
+
+		try:
+			os.rename(claim_path, lease_path)
+			return True
+		except OSError:
+			remove_directory(claim_path)
+	return False
+
+
+def reclaim_lease(lease_name : str) -> bool:
+	lease_path = get_lease_path(lease_name)
+
+	if is_directory(lease_path) and is_lease_expired(lease_path):
+		return discard_lease(lease_path, is_owner_expired)
+	return False
+
+
+def release_lease(lease_name : str) -> bool:
+	lease_path = get_lease_path(lease_name)
+
+	if is_worker_owner(read_lease_owner(lease_path)):
+		return discard_lease(lease_path, is_worker_owner)
+	return False
+
+
+def discard_lease(lease_path : str, is_discardable : Callable[[Optional[str]], bool]) -> bool:
+	discard_path = lease_path + '.' + get_worker_id() + '.' + str(time.time_ns()) + '.discard'
+
+	try:
+		os.rename(lease_path, discard_path)
+	except OSError:
+		return False
+	if is_discardable(read_lease_owner(discard_path)):
+		return remove_directory(discard_path)
+	restore_lease(discard_path, lease_path)
+	return False
+
+
+def restore_lease(discard_path : str, lease_path : str) -> bool:
+	try:
+		os.rename(discard_path, lease_path)
+	except OSError:
+		return False
+	return True
+
+
+def read_lease_owner(lease_path : str) -> Optional[str]:
+	owner_path = os.path.join(lease_path, 'owner')
+
+	try:
+		with open(owner_path) as owner_file:
+			return owner_file.read()
+	except OSError:
+		return None
+
+
+def is_worker_owner(lease_owner : Optional[str]) -> bool:
+	return lease_owner == get_worker_id()
+
+
+def is_lease_expired(lease_path : str) -> bool:
+	return is_owner_expired(read_lease_owner(lease_path))
+
+
+def is_owner_expired(lease_owner : Optional[str]) -> bool:
+	heartbeat_path = get_heartbeat_path(get_worker_id())
+
+	if lease_owner and touch_heartbeat():
+		owner_heartbeat_path = get_heartbeat_path(lease_owner)
+
+		try:
+			return os.path.getmtime(heartbeat_path) - os.path.getmtime(owner_heartbeat_path) > state_manager.get_item('job_lease_timeout')
+		except OSError:
+			return True
+	return False
+
+
+def start_heartbeat() -> bool:
+	global HEARTBEAT_THREAD
+
+	HEARTBEAT_EVENT.clear()
+
+	if touch_heartbeat():
+		HEARTBEAT_THREAD = threading.Thread(target = beat_heartbeat, args = (HEARTBEAT_EVENT, get_worker_id()), daemon = True)
+		HEARTBEAT_THREAD.start()
+		return True
+	return False
+
+
+def beat_heartbeat(heartbeat_event : threading.Event, worker_id : str) -> None:
+	while not heartbeat_event.wait(state_manager.get_item('job_lease_timeout') / 4):
+		touch_heartbeat(worker_id)
+
+
+def stop_heartbeat() -> bool:
+	global HEARTBEAT_THREAD
+
+	HEARTBEAT_EVENT.set()
+
+	if HEARTBEAT_THREAD:
+		HEARTBEAT_THREAD.join()
+		HEARTBEAT_THREAD = None
+	return remove_file(get_heartbeat_path(get_worker_id()))
+
+
+def touch_heartbeat(worker_id : Optional[str] = None) -> bool:
+	heartbeat_path = get_heartbeat_path(worker_id or get_worker_id())
+
+	try:
+		with open(heartbeat_path, 'a'):
+			os.utime(heartbeat_path)
+	except OSError:
+		return False
+	return is_file(heartbeat_path)
+
+
+def get_job_lease_name(job_id : str) -> str:
+	return job_id + '.lock'
+
+
+def get_step_lease_name(job_id : str, step_index : int) -> str:
+	return job_id + '.' + str(step_index) + '.lease'
+
+
+def get_lease_path(lease_name : str) -> str:
+	return os.path.join(get_lease_directory_path(), lease_name)
+
+
+def get_heartbeat_path(worker_id : str) -> str:
+	return os.path.join(get_heartbeat_directory_path(), worker_id)
+
+
+def get_lease_directory_path() -> str:
+	return os.path.join(job_manager.JOBS_PATH, 'leases')
+
+
+def get_heartbeat_directory_path() -> str:
+	return os.path.join(job_manager.JOBS_PATH, 'heartbeats')
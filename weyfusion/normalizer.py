@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from weyfusion.typing import Fps, Padding
+from weyfusion.typing import ExecutionSessionLimits, Fps, Padding
 
 
 def normalize_padding(padding : Optional[List[int]]) -> Optional[Padding]:
@@ -19,3 +19,14 @@ def normalize_fps(fps : Optional[float]) -> Optional[Fps]:
 	if isinstance(fps, (int, float)):
 		return max(1.0, min(fps, 60.0))
 	return None
+
+
+def normalize_session_limits(session_limits : Optional[List[str]]) -> ExecutionSessionLimits:
+	execution_session_limits : ExecutionSessionLimits = {}
+
+	for session_limit in session_limits or []:
+		model_name, _, model_limit = session_limit.partition(':')
+
+		if model_name and model_limit.isdigit():
+			execution_session_limits[model_name] = min(int(model_limit), 16)
+	return execution_session_limits
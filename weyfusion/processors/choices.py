@@ -183,6 +183,7 @@ face_swapper_set : FaceSwapperSet =\
 	'uniface_256': [ '256x256', '512x512', '768x768', '1024x1024' ]
 }
 face_swapper_models : List[FaceSwapperModel] = list(face_swapper_set.keys())
+face_swapper_pixel_boosts : List[str] = [ '128x128', '256x256', '384x384', '512x512', '768x768', '1024x1024' ]
 frame_colorizer_models : List[FrameColorizerModel] = [ 'ddcolor', 'ddcolor_artistic', 'deoldify', 'deoldify_artistic', 'deoldify_stable' ]
 frame_colorizer_sizes : List[str] = [ '192x192', '256x256', '384x384', '512x512' ]
 frame_enhancer_models : List[FrameEnhancerModel] = [ 'clear_reality_x4', 'lsdir_x4', 'nomos8k_sc_x4', 'real_esrgan_x2', 'real_esrgan_x2_fp16', 'real_esrgan_x4', 'real_esrgan_x4_fp16', 'real_esrgan_x8', 'real_esrgan_x8_fp16', 'real_hatgan_x4', 'real_web_photo_x4', 'realistic_rescaler_x4', 'remacri_x4', 'siax_x4', 'span_kendata_x4', 'swin2_sr_x4', 'ultra_sharp_x4' ]
@@ -209,3 +210,4 @@ face_enhancer_blend_range : Sequence[int] = create_int_range(0, 100, 1)
 face_enhancer_weight_range : Sequence[float] = create_float_range(0.0, 1.0, 0.05)
 frame_colorizer_blend_range : Sequence[int] = create_int_range(0, 100, 1)
 frame_enhancer_blend_range : Sequence[int] = create_int_range(0, 100, 1)
+frame_enhancer_tile_batch_range : Sequence[int] = create_int_range(1, 32, 1)
@@ -1,31 +1,49 @@
 import importlib
+import multiprocessing
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
 from queue import Queue
 from types import ModuleType
-from typing import Any, List
+from typing import Any, Deque, Dict, Generator, Iterator, List, Optional, Tuple, Union
 
+import numpy
 from tqdm import tqdm
 
-from weyfusion import logger, state_manager, wording
+from weyfusion import inference_manager, logger, process_manager, state_manager, wording
+from weyfusion.app_context import set_app_context
+from weyfusion.audio import create_empty_audio_frame, get_voice_frame
+from weyfusion.common_helper import get_first
+from weyfusion.execution import detect_execution_devices
 from weyfusion.exit_helper import hard_exit
-from weyfusion.typing import ProcessFrames, QueuePayload
+from weyfusion.face_cache import reset_face_cache_context, set_face_cache_context
+from weyfusion.face_classifier import classify_face
+from weyfusion.face_recognizer import calc_embedding
+from weyfusion.face_store import get_reference_faces, get_static_faces, set_static_faces
+from weyfusion.filesystem import filter_audio_paths, is_video
+from weyfusion.processors.registry import get_processor_face_forward
+from weyfusion.source_identity import get_source_identity_face
+from weyfusion.typing import AudioFrame, Face, FaceLandmarkSet, FaceSet, Fps, FramePayload, QueuePayload, RunConfig, SharedFrame, State, UpdateProgress, VisionFrame
+from weyfusion.vision import detect_video_fps, get_video_frame, read_image, restrict_trim_frame, restrict_video_fps, write_image
 
 PROCESSORS_METHODS =\
 [
 	'get_inference_pool',
 	'clear_inference_pool',
-	'register_args',
-	'apply_args',
 	'pre_check',
 	'pre_process',
 	'post_process',
 	'get_reference_frame',
 	'process_frame',
-	'process_frames',
-	'process_image',
-	'process_video'
+	'process_image'
 ]
+EXECUTION_DEVICE_UTILIZATIONS : Dict[str, str] = {}
+EXECUTION_DEVICE_WATCH_INTERVAL : float = 2.0
+PROCESS_WORKER_FACES : Dict[str, Any] = {}
 
 
 def load_processor_module(processor : str) -> Any:
@@ -53,36 +71,349 @@ def get_processors_modules(processors : List[str]) -> List[ModuleType]:
 	return processor_modules
 
 
-def multi_process_frames(source_paths : List[str], temp_frame_paths : List[str], process_frames : ProcessFrames) -> None:
+def calc_stage_queue_limit() -> int:
+	return state_manager.get_item('execution_thread_count') * state_manager.get_item('execution_queue_count')
+
+
+def pick_execution_device_id(index : int) -> str:
+	execution_device_ids = inference_manager.get_execution_device_ids()
+	return execution_device_ids[index % len(execution_device_ids)]
+
+
+def multi_process_stream(source_paths : List[str], target_vision_frames : Iterator[VisionFrame], frame_total : int, frame_offset : int) -> Generator[VisionFrame, None, None]:
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_face = get_source_face(source_paths)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	future_limit = calc_stage_queue_limit() * 2
+
+	with tqdm(total = frame_total, desc = wording.get('streaming'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(create_progress_postfix())
+		with watch_execution_devices(progress), create_process_pool(reference_faces, source_face) as process_pool, ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), initializer = init_thread_worker, initargs = (state_manager.get_run_config(),)) as executor:
+			futures : Deque[Future[VisionFrame]] = deque()
+
+			for frame_number, target_vision_frame in enumerate(target_vision_frames, frame_offset):
+				if not process_manager.is_processing():
+					break
+				source_audio_frame = get_source_audio_frame(source_audio_path, temp_video_fps, frame_number)
+				source_vision_frame = get_source_vision_frame(temp_video_fps, frame_number)
+				future = executor.submit(dispatch_vision_frame, process_pool, pick_execution_device_id(frame_number), processor_modules, reference_faces, source_face, source_audio_frame, source_vision_frame, frame_number, target_vision_frame)
+				futures.append(future)
+
+				if len(futures) >= future_limit:
+					progress.update()
+					yield futures.popleft().result()
+
+			while futures and process_manager.is_processing():
+				progress.update()
+				yield futures.popleft().result()
+
+
+def multi_process_fused_frames(source_paths : List[str], temp_frame_paths : List[str], frame_offset : int) -> None:
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
+	source_face = get_source_face(source_paths)
+	source_audio_path = get_first(filter_audio_paths(source_paths))
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
 	queue_payloads = create_queue_payloads(temp_frame_paths)
+	execution_thread_count = state_manager.get_item('execution_thread_count')
+	queue_limit = calc_stage_queue_limit()
+	read_queue : Queue[Optional[FramePayload]] = Queue(queue_limit)
+	write_queue : Queue[Optional[FramePayload]] = Queue(queue_limit)
+
 	with tqdm(total = len(queue_payloads), desc = wording.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
-		progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
-		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
-			futures = []
-			queue : Queue[QueuePayload] = create_queue(queue_payloads)
-			queue_per_future = max(len(queue_payloads) // state_manager.get_item('execution_thread_count') * state_manager.get_item('execution_queue_count'), 1)
-
-			while not queue.empty():
-				future = executor.submit(process_frames, source_paths, pick_queue(queue, queue_per_future), progress.update)
+		progress.set_postfix(create_progress_postfix())
+		update_progress = partial(update_fused_progress, progress, read_queue, write_queue)
+
+		with watch_execution_devices(progress), create_process_pool(reference_faces, source_face) as process_pool, ThreadPoolExecutor(max_workers = execution_thread_count + 2, initializer = init_thread_worker, initargs = (state_manager.get_run_config(),)) as executor:
+			futures = [ executor.submit(read_fused_frames, queue_payloads, frame_offset, temp_video_fps, read_queue, execution_thread_count) ]
+
+			for index in range(execution_thread_count):
+				future = executor.submit(infer_fused_frames, process_pool, pick_execution_device_id(index), processor_modules, reference_faces, source_face, source_audio_path, temp_video_fps, read_queue, write_queue)
 				futures.append(future)
+			futures.append(executor.submit(write_fused_frames, write_queue, execution_thread_count, update_progress))
 
 			for future_done in as_completed(futures):
 				future_done.result()
 
 
-def create_queue(queue_payloads : List[QueuePayload]) -> Queue[QueuePayload]:
-	queue : Queue[QueuePayload] = Queue()
-	for queue_payload in queue_payloads:
-		queue.put(queue_payload)
-	return queue
+def create_progress_postfix() -> Dict[str, Any]:
+	progress_postfix : Dict[str, Any] =\
+	{
+		'execution_providers': state_manager.get_item('execution_providers')
+	}
+
+	if EXECUTION_DEVICE_UTILIZATIONS:
+		progress_postfix['execution_devices'] = ' '.join(execution_device_id + ':' + execution_device_utilization for execution_device_id, execution_device_utilization in EXECUTION_DEVICE_UTILIZATIONS.items())
+	return progress_postfix
+
+
+@contextmanager
+def watch_execution_devices(progress : tqdm) -> Iterator[None]:
+	watch_event = threading.Event()
+	watch_thread = threading.Thread(target = sample_execution_devices, args = (progress, watch_event), daemon = True)
+
+	if len(inference_manager.get_execution_device_ids()) > 1:
+		watch_thread.start()
+	try:
+		yield
+	finally:
+		watch_event.set()
+
+		if watch_thread.is_alive():
+			watch_thread.join()
+		EXECUTION_DEVICE_UTILIZATIONS.clear()
+
+
+def sample_execution_devices(progress : tqdm, watch_event : threading.Event) -> None:
+	set_app_context('cli')
+	execution_device_ids = inference_manager.get_execution_device_ids()
+
+	while not watch_event.is_set():
+		for execution_device in detect_execution_devices():
+			execution_device_utilization = execution_device.get('utilization').get('gpu')
+
+			if execution_device.get('id') in execution_device_ids and execution_device_utilization:
+				EXECUTION_DEVICE_UTILIZATIONS[execution_device.get('id')] = str(execution_device_utilization.get('value')) + execution_device_utilization.get('unit')
+		if EXECUTION_DEVICE_UTILIZATIONS and not watch_event.is_set():
+			progress.set_postfix(create_progress_postfix())
+		watch_event.wait(EXECUTION_DEVICE_WATCH_INTERVAL)
+
+
+def update_fused_progress(progress : tqdm, read_queue : Queue[Optional[FramePayload]], write_queue : Queue[Optional[FramePayload]], frame_total : int) -> None:
+	progress.set_postfix(create_progress_postfix(), read_queue = read_queue.qsize(), write_queue = write_queue.qsize(), refresh = False)
+	progress.update(frame_total)
+
+
+def read_fused_frames(queue_payloads : List[QueuePayload], frame_offset : int, temp_video_fps : Fps, read_queue : Queue[Optional[FramePayload]], consumer_total : int) -> None:
+	try:
+		for queue_payload in process_manager.manage(queue_payloads):
+			frame_number = frame_offset + queue_payload.get('frame_number')
+			read_queue.put(
+			{
+				'frame_number': frame_number,
+				'frame_path': queue_payload.get('frame_path'),
+				'source_vision_frame': get_source_vision_frame(temp_video_fps, frame_number),
+				'vision_frame': read_image(queue_payload.get('frame_path'))
+			})
+	finally:
+		for _ in range(consumer_total):
+			read_queue.put(None)
+
+
+def infer_fused_frames(process_pool : Optional[ProcessPoolExecutor], execution_device_id : str, processor_modules : List[ModuleType], reference_faces : FaceSet, source_face : Face, source_audio_path : str, temp_video_fps : Fps, read_queue : Queue[Optional[FramePayload]], write_queue : Queue[Optional[FramePayload]]) -> None:
+	frame_payload = read_queue.get()
+
+	try:
+		while frame_payload:
+			source_audio_frame = get_source_audio_frame(source_audio_path, temp_video_fps, frame_payload.get('frame_number'))
+			frame_payload['vision_frame'] = dispatch_vision_frame(process_pool, execution_device_id, processor_modules, reference_faces, source_face, source_audio_frame, frame_payload.get('source_vision_frame'), frame_payload.get('frame_number'), frame_payload.get('vision_frame'))
+			write_queue.put(frame_payload)
+			frame_payload = read_queue.get()
+	finally:
+		while frame_payload:
+			frame_payload = read_queue.get()
+		write_queue.put(None)
+
+
+def write_fused_frames(write_queue : Queue[Optional[FramePayload]], producer_total : int, update_progress : UpdateProgress) -> None:
+	frame_payload = write_queue.get()
+
+	try:
+		while producer_total:
+			if frame_payload:
+				write_image(frame_payload.get('frame_path'), frame_payload.get('vision_frame'))
+				update_progress(1)
+			else:
+				producer_total -= 1
+			if producer_total:
+				frame_payload = write_queue.get()
+	finally:
+		while producer_total:
+			if not write_queue.get():
+				producer_total -= 1
+
+
+def dispatch_vision_frame(process_pool : Optional[ProcessPoolExecutor], execution_device_id : str, processor_modules : List[ModuleType], reference_faces : FaceSet, source_face : Face, source_audio_frame : AudioFrame, source_vision_frame : Optional[VisionFrame], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	if process_pool:
+		shared_memories = []
+		source_shared_frame = None
+
+		try:
+			if source_vision_frame is not None:
+				source_shared_memory, source_shared_frame = create_shared_frame(source_vision_frame)
+				shared_memories.append(source_shared_memory)
+			target_shared_memory, target_shared_frame = create_shared_frame(target_vision_frame)
+			shared_memories.append(target_shared_memory)
+			output_shared_frame = process_pool.submit(process_shared_frame, execution_device_id, source_audio_frame, source_shared_frame, frame_number, target_shared_frame).result()
+		finally:
+			for shared_memory in shared_memories:
+				shared_memory.close()
+				shared_memory.unlink()
+		return pop_shared_frame(output_shared_frame)
+	return process_vision_frame(execution_device_id, processor_modules, reference_faces, source_face, source_audio_frame, source_vision_frame, frame_number, target_vision_frame)
+
+
+def process_shared_frame(execution_device_id : str, source_audio_frame : AudioFrame, source_shared_frame : Optional[SharedFrame], frame_number : int, target_shared_frame : SharedFrame) -> SharedFrame:
+	processor_modules = get_processors_modules(state_manager.get_item('processors'))
+	reference_faces = PROCESS_WORKER_FACES.get('reference_faces')
+	source_face = PROCESS_WORKER_FACES.get('source_face')
+	source_vision_frame = read_shared_frame(source_shared_frame) if source_shared_frame else None
+	target_vision_frame = read_shared_frame(target_shared_frame)
+	output_vision_frame = process_vision_frame(execution_device_id, processor_modules, reference_faces, source_face, source_audio_frame, source_vision_frame, frame_number, target_vision_frame)
+	output_shared_memory, output_shared_frame = create_shared_frame(output_vision_frame)
+	output_shared_memory.close()
+	return output_shared_frame
+
+
+def create_process_pool(reference_faces : FaceSet, source_face : Face) -> Union[ProcessPoolExecutor, nullcontext[None]]:
+	if state_manager.get_item('execution_backend') == 'process':
+		run_config = state_manager.get_run_config()
+		worker_state = dict(run_config.state) if run_config else dict(state_manager.get_state())
+		return ProcessPoolExecutor(max_workers = state_manager.get_item('execution_thread_count'), mp_context = multiprocessing.get_context('spawn'), initializer = init_process_worker, initargs = (worker_state, reference_faces, source_face)) #type:ignore[arg-type]
+	return nullcontext()
+
+
+def init_thread_worker(run_config : Optional[RunConfig]) -> None:
+	set_app_context('cli')
+	state_manager.set_run_config(run_config)
+
+
+def init_process_worker(state : State, reference_faces : FaceSet, source_face : Face) -> None:
+	for key, value in state.items():
+		state_manager.init_item(key, value) #type:ignore[arg-type]
+	PROCESS_WORKER_FACES['reference_faces'] = reference_faces
+	PROCESS_WORKER_FACES['source_face'] = source_face
+	state_manager.init_item('execution_batch_size', 1)
+	state_manager.set_run_config(state_manager.create_run_config())
+	logger.init(state_manager.get_item('log_level'))
+
+
+def create_shared_frame(vision_frame : VisionFrame) -> Tuple[SharedMemory, SharedFrame]:
+	shared_memory = SharedMemory(create = True, size = max(vision_frame.nbytes, 1))
+	shared_vision_frame : VisionFrame = numpy.ndarray(vision_frame.shape, dtype = numpy.uint8, buffer = shared_memory.buf)
+	shared_vision_frame[:] = vision_frame
+	shared_frame : SharedFrame =\
+	{
+		'name': shared_memory.name,
+		'shape': vision_frame.shape
+	}
+	return shared_memory, shared_frame
+
+
+def read_shared_frame(shared_frame : SharedFrame) -> VisionFrame:
+	shared_memory = SharedMemory(name = shared_frame.get('name'))
+	vision_frame : VisionFrame = numpy.ndarray(shared_frame.get('shape'), dtype = numpy.uint8, buffer = shared_memory.buf).copy()
+	shared_memory.close()
+	return vision_frame
+
+
+def pop_shared_frame(shared_frame : SharedFrame) -> VisionFrame:
+	shared_memory = SharedMemory(name = shared_frame.get('name'))
+
+	try:
+		vision_frame : VisionFrame = numpy.ndarray(shared_frame.get('shape'), dtype = numpy.uint8, buffer = shared_memory.buf).copy()
+	finally:
+		shared_memory.close()
+		shared_memory.unlink()
+	return vision_frame
+
+
+def process_vision_frame(execution_device_id : str, processor_modules : List[ModuleType], reference_faces : FaceSet, source_face : Face, source_audio_frame : AudioFrame, source_vision_frame : Optional[VisionFrame], frame_number : int, target_vision_frame : VisionFrame) -> VisionFrame:
+	if source_vision_frame is None:
+		source_vision_frame = target_vision_frame.copy()
+	execution_device_token = inference_manager.set_execution_device_context(execution_device_id)
+	face_cache_token = set_face_cache_context(frame_number, target_vision_frame)
+
+	try:
+		for processor_module in processor_modules:
+			output_vision_frame = processor_module.process_frame(
+			{
+				'reference_faces': reference_faces,
+				'source_face': source_face,
+				'source_audio_frame': source_audio_frame,
+				'source_vision_frame': source_vision_frame,
+				'target_vision_frame': target_vision_frame
+			})
+			forward_static_faces(processor_module, target_vision_frame, output_vision_frame)
+			target_vision_frame = output_vision_frame
+	finally:
+		reset_face_cache_context(face_cache_token)
+		inference_manager.reset_execution_device_context(execution_device_token)
+	return target_vision_frame
+
+
+def forward_static_faces(processor_module : ModuleType, target_vision_frame : VisionFrame, output_vision_frame : VisionFrame) -> None:
+	face_forward = get_processor_face_forward(processor_module.__name__.split('.')[-1])
+	frame_scale = get_frame_scale(target_vision_frame, output_vision_frame)
+
+	if face_forward and frame_scale:
+		static_faces = get_static_faces(target_vision_frame)
+
+		if static_faces:
+			static_faces = [ scale_face(static_face, frame_scale) for static_face in static_faces ]
+			if face_forward == 'geometry':
+				static_faces = [ refresh_face(output_vision_frame, static_face) for static_face in static_faces ]
+			set_static_faces(output_vision_frame, static_faces)
+
+
+def get_frame_scale(target_vision_frame : VisionFrame, output_vision_frame : VisionFrame) -> Optional[float]:
+	target_height, target_width = target_vision_frame.shape[:2]
+	output_height, output_width = output_vision_frame.shape[:2]
+
+	if target_height and target_width and output_height * target_width == output_width * target_height:
+		return output_height / target_height
+	return None
+
+
+def scale_face(face : Face, frame_scale : float) -> Face:
+	if frame_scale == 1:
+		return face
+	landmark_set : FaceLandmarkSet =\
+	{
+		'5': face.landmark_set.get('5') * frame_scale,
+		'5/68': face.landmark_set.get('5/68') * frame_scale,
+		'68': face.landmark_set.get('68') * frame_scale,
+		'68/5': face.landmark_set.get('68/5') * frame_scale
+	}
+	return face._replace(
+		bounding_box = face.bounding_box * frame_scale,
+		landmark_set = landmark_set
+	)
+
+
+def refresh_face(vision_frame : VisionFrame, face : Face) -> Face:
+	embedding, normed_embedding = calc_embedding(vision_frame, face.landmark_set.get('5/68'))
+	gender, age, race = classify_face(vision_frame, face.landmark_set.get('5/68'))
+	return face._replace(
+		embedding = embedding,
+		normed_embedding = normed_embedding,
+		gender = gender,
+		age = age,
+		race = race
+	)
+
+
+def get_source_audio_frame(source_audio_path : str, temp_video_fps : Fps, frame_number : int) -> AudioFrame:
+	source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
+	if not numpy.any(source_audio_frame):
+		source_audio_frame = create_empty_audio_frame()
+	return source_audio_frame
+
+
+def get_source_vision_frame(temp_video_fps : Fps, frame_number : int) -> Optional[VisionFrame]:
+	target_path = state_manager.get_item('target_path')
+
+	if 'expression_restorer' in state_manager.get_item('processors') and is_video(target_path):
+		trim_frame_start, _ = restrict_trim_frame(target_path, state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+		video_frame_number = trim_frame_start + round(frame_number * detect_video_fps(target_path) / temp_video_fps)
+		return get_video_frame(target_path, video_frame_number + 1)
+	return None
 
 
-def pick_queue(queue : Queue[QueuePayload], queue_per_future : int) -> List[QueuePayload]:
-	queues = []
-	for _ in range(queue_per_future):
-		if not queue.empty():
-			queues.append(queue.get())
-	return queues
+def get_source_face(source_paths : List[str]) -> Face:
+	return get_source_identity_face(source_paths)
 
 
 def create_queue_payloads(temp_frame_paths : List[str]) -> List[QueuePayload]:
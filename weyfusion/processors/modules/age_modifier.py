@@ -1,16 +1,10 @@
-from argparse import ArgumentParser
 from functools import lru_cache
-from typing import List
 
 import cv2
 import numpy
 
 import weyfusion.choices
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, wording
-from weyfusion.common_helper import create_int_metavar
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, wording
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.execution import has_execution_provider
 from weyfusion.face_analyser import get_many_faces, get_one_face
@@ -19,12 +13,9 @@ from weyfusion.face_masker import create_occlusion_mask, create_static_box_mask
 from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces
 from weyfusion.face_store import get_reference_faces
 from weyfusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from weyfusion.processors import choices as processors_choices
 from weyfusion.processors.typing import AgeModifierDirection, AgeModifierInputs
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import match_frame_color, read_image, read_static_image, write_image
+from weyfusion.typing import DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import match_frame_color, read_static_image, write_image
 
 
 @lru_cache(maxsize = None)
@@ -72,24 +63,12 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	age_modifier_model = state_manager.get_item('age_modifier_model')
 	return create_static_model_set('full').get(age_modifier_model)
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--age-modifier-model', help = wording.get('help.age_modifier_model'), default = config.get_str_value('processors.age_modifier_model', 'styleganex_age'), choices = processors_choices.age_modifier_models)
-		group_processors.add_argument('--age-modifier-direction', help = wording.get('help.age_modifier_direction'), type = int, default = config.get_int_value('processors.age_modifier_direction', '0'), choices = processors_choices.age_modifier_direction_range, metavar = create_int_metavar(processors_choices.age_modifier_direction_range))
-		weyfusion.jobs.job_store.register_step_keys([ 'age_modifier_model', 'age_modifier_direction' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('age_modifier_model', args.get('age_modifier_model'))
-	apply_state_item('age_modifier_direction', args.get('age_modifier_direction'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -171,8 +150,7 @@ def forward(crop_vision_frame : VisionFrame, extend_vision_frame : VisionFrame,
 		if age_modifier_input.name == 'direction':
 			age_modifier_inputs[age_modifier_input.name] = age_modifier_direction
 
-	with thread_semaphore():
-		crop_vision_frame = age_modifier.run(None, age_modifier_inputs)[0][0]
+	crop_vision_frame = inference_manager.run_inference_session(age_modifier, age_modifier_inputs)[0][0]
 
 	return crop_vision_frame
 
@@ -220,21 +198,6 @@ def process_frame(inputs : AgeModifierInputs) -> VisionFrame:
 	return target_vision_frame
 
 
-def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	target_vision_frame = read_static_image(target_path)
@@ -244,7 +207,3 @@ def process_image(source_path : str, target_path : str, output_path : str) -> No
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(None, temp_frame_paths, process_frames)
@@ -1,16 +1,11 @@
-from argparse import ArgumentParser
 from functools import lru_cache
-from typing import List, Tuple
+from typing import Tuple
 
 import cv2
 import numpy
 from cv2.typing import Size
 
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, wording
-from weyfusion.common_helper import create_int_metavar
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, wording
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url_by_provider
 from weyfusion.face_analyser import get_many_faces, get_one_face
 from weyfusion.face_helper import paste_back, warp_face_by_face_landmark_5
@@ -18,12 +13,9 @@ from weyfusion.face_masker import create_occlusion_mask, create_region_mask, cre
 from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces
 from weyfusion.face_store import get_reference_faces
 from weyfusion.filesystem import in_directory, is_image, is_video, list_directory, resolve_relative_path, same_file_extension
-from weyfusion.processors import choices as processors_choices
 from weyfusion.processors.typing import DeepSwapperInputs, DeepSwapperMorph
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import conditional_match_frame_color, read_image, read_static_image, write_image
+from weyfusion.typing import DownloadScope, Face, InferencePool, Mask, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import conditional_match_frame_color, read_static_image, write_image
 
 
 @lru_cache(maxsize = None)
@@ -247,6 +239,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	deep_swapper_model = state_manager.get_item('deep_swapper_model')
 	return create_static_model_set('full').get(deep_swapper_model)
@@ -261,19 +254,6 @@ def get_model_size() -> Size:
 	return 0, 0
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--deep-swapper-model', help = wording.get('help.deep_swapper_model'), default = config.get_str_value('processors.deep_swapper_model', 'iperov/elon_musk_224'), choices = processors_choices.deep_swapper_models)
-		group_processors.add_argument('--deep-swapper-morph', help = wording.get('help.deep_swapper_morph'), type = int, default = config.get_int_value('processors.deep_swapper_morph', '80'), choices = processors_choices.deep_swapper_morph_range, metavar = create_int_metavar(processors_choices.deep_swapper_morph_range))
-		weyfusion.jobs.job_store.register_step_keys([ 'deep_swapper_model', 'deep_swapper_morph' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('deep_swapper_model', args.get('deep_swapper_model'))
-	apply_state_item('deep_swapper_morph', args.get('deep_swapper_morph'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -350,8 +330,7 @@ def forward(crop_vision_frame : VisionFrame, deep_swapper_morph : DeepSwapperMor
 		if deep_swapper_input.name == 'morph_value:0':
 			deep_swapper_inputs[deep_swapper_input.name] = deep_swapper_morph
 
-	with thread_semaphore():
-		crop_target_mask, crop_vision_frame, crop_source_mask = deep_swapper.run(None, deep_swapper_inputs)
+	crop_target_mask, crop_vision_frame, crop_source_mask = inference_manager.run_inference_session(deep_swapper, deep_swapper_inputs)
 
 	return crop_vision_frame[0], crop_source_mask[0], crop_target_mask[0]
 
@@ -414,21 +393,6 @@ def process_frame(inputs : DeepSwapperInputs) -> VisionFrame:
 	return target_vision_frame
 
 
-def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	target_vision_frame = read_static_image(target_path)
@@ -438,7 +402,3 @@ def process_image(source_path : str, target_path : str, output_path : str) -> No
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(None, temp_frame_paths, process_frames)
@@ -1,15 +1,10 @@
-from argparse import ArgumentParser
 from functools import lru_cache
-from typing import List, Tuple
+from typing import Tuple
 
 import cv2
 import numpy
 
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, wording
-from weyfusion.common_helper import create_int_metavar
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, wording
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.face_analyser import get_many_faces, get_one_face
 from weyfusion.face_helper import paste_back, warp_face_by_face_landmark_5
@@ -17,14 +12,11 @@ from weyfusion.face_masker import create_occlusion_mask, create_static_box_mask
 from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces
 from weyfusion.face_store import get_reference_faces
 from weyfusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from weyfusion.processors import choices as processors_choices
 from weyfusion.processors.live_portrait import create_rotation, limit_expression
 from weyfusion.processors.typing import ExpressionRestorerInputs
 from weyfusion.processors.typing import LivePortraitExpression, LivePortraitFeatureVolume, LivePortraitMotionPoints, LivePortraitPitch, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitYaw
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import conditional_thread_semaphore, thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import get_video_frame, read_image, read_static_image, write_image
+from weyfusion.typing import DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import clear_video_frame_readers, read_static_image, write_image
 
 
 @lru_cache(maxsize = None)
@@ -84,24 +76,12 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	expression_restorer_model = state_manager.get_item('expression_restorer_model')
 	return create_static_model_set('full').get(expression_restorer_model)
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--expression-restorer-model', help = wording.get('help.expression_restorer_model'), default = config.get_str_value('processors.expression_restorer_model', 'live_portrait'), choices = processors_choices.expression_restorer_models)
-		group_processors.add_argument('--expression-restorer-factor', help = wording.get('help.expression_restorer_factor'), type = int, default = config.get_int_value('processors.expression_restorer_factor', '80'), choices = processors_choices.expression_restorer_factor_range, metavar = create_int_metavar(processors_choices.expression_restorer_factor_range))
-		weyfusion.jobs.job_store.register_step_keys([ 'expression_restorer_model','expression_restorer_factor' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('expression_restorer_model', args.get('expression_restorer_model'))
-	apply_state_item('expression_restorer_factor', args.get('expression_restorer_factor'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -127,6 +107,7 @@ def pre_process(mode : ProcessMode) -> bool:
 
 def post_process() -> None:
 	read_static_image.cache_clear()
+	clear_video_frame_readers()
 	if state_manager.get_item('video_memory_strategy') in [ 'strict', 'moderate' ]:
 		clear_inference_pool()
 	if state_manager.get_item('video_memory_strategy') == 'strict':
@@ -181,11 +162,10 @@ def apply_restore(source_crop_vision_frame : VisionFrame, target_crop_vision_fra
 def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeatureVolume:
 	feature_extractor = get_inference_pool().get('feature_extractor')
 
-	with conditional_thread_semaphore():
-		feature_volume = feature_extractor.run(None,
-		{
-			'input': crop_vision_frame
-		})[0]
+	feature_volume = inference_manager.run_inference_session(feature_extractor,
+	{
+		'input': crop_vision_frame
+	})[0]
 
 	return feature_volume
 
@@ -193,11 +173,10 @@ def forward_extract_feature(crop_vision_frame : VisionFrame) -> LivePortraitFeat
 def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortraitPitch, LivePortraitYaw, LivePortraitRoll, LivePortraitScale, LivePortraitTranslation, LivePortraitExpression, LivePortraitMotionPoints]:
 	motion_extractor = get_inference_pool().get('motion_extractor')
 
-	with conditional_thread_semaphore():
-		pitch, yaw, roll, scale, translation, expression, motion_points = motion_extractor.run(None,
-		{
-			'input': crop_vision_frame
-		})
+	pitch, yaw, roll, scale, translation, expression, motion_points = inference_manager.run_inference_session(motion_extractor,
+	{
+		'input': crop_vision_frame
+	})
 
 	return pitch, yaw, roll, scale, translation, expression, motion_points
 
@@ -205,13 +184,12 @@ def forward_extract_motion(crop_vision_frame : VisionFrame) -> Tuple[LivePortrai
 def forward_generate_frame(feature_volume : LivePortraitFeatureVolume, source_motion_points : LivePortraitMotionPoints, target_motion_points : LivePortraitMotionPoints) -> VisionFrame:
 	generator = get_inference_pool().get('generator')
 
-	with thread_semaphore():
-		crop_vision_frame = generator.run(None,
-		{
-			'feature_volume': feature_volume,
-			'source': source_motion_points,
-			'target': target_motion_points
-		})[0][0]
+	crop_vision_frame = inference_manager.run_inference_session(generator,
+	{
+		'feature_volume': feature_volume,
+		'source': source_motion_points,
+		'target': target_motion_points
+	})[0][0]
 
 	return crop_vision_frame
 
@@ -258,26 +236,6 @@ def process_frame(inputs : ExpressionRestorerInputs) -> VisionFrame:
 	return target_vision_frame
 
 
-def process_frames(source_path : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		frame_number = queue_payload.get('frame_number')
-		if state_manager.get_item('trim_frame_start'):
-			frame_number += state_manager.get_item('trim_frame_start')
-		source_vision_frame = get_video_frame(state_manager.get_item('target_path'), frame_number)
-		target_vision_path = queue_payload.get('frame_path')
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_vision_frame': source_vision_frame,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_path : str, target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	source_vision_frame = read_static_image(state_manager.get_item('target_path'))
@@ -289,7 +247,3 @@ def process_image(source_path : str, target_path : str, output_path : str) -> No
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(None, temp_frame_paths, process_frames)
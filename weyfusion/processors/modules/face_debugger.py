@@ -1,24 +1,18 @@
-from argparse import ArgumentParser
 from typing import List
 
 import cv2
 import numpy
 
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, logger, process_manager, state_manager, wording
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, logger, state_manager, wording
 from weyfusion.face_analyser import get_many_faces, get_one_face
 from weyfusion.face_helper import warp_face_by_face_landmark_5
 from weyfusion.face_masker import create_occlusion_mask, create_region_mask, create_static_box_mask
 from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces
 from weyfusion.face_store import get_reference_faces
 from weyfusion.filesystem import in_directory, same_file_extension
-from weyfusion.processors import choices as processors_choices
 from weyfusion.processors.typing import FaceDebuggerInputs
-from weyfusion.program_helper import find_argument_group
-from weyfusion.typing import ApplyStateItem, Args, Face, InferencePool, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import read_image, read_static_image, write_image
+from weyfusion.typing import Face, InferencePool, ProcessMode, VisionFrame
+from weyfusion.vision import read_static_image, write_image
 
 
 def get_inference_pool() -> InferencePool:
@@ -29,17 +23,6 @@ def clear_inference_pool() -> None:
 	pass
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--face-debugger-items', help = wording.get('help.face_debugger_items').format(choices = ', '.join(processors_choices.face_debugger_items)), default = config.get_str_list('processors.face_debugger_items', 'face-landmark-5/68 face-mask'), choices = processors_choices.face_debugger_items, nargs = '+', metavar = 'FACE_DEBUGGER_ITEMS')
-		weyfusion.jobs.job_store.register_step_keys([ 'face_debugger_items' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('face_debugger_items', args.get('face_debugger_items'))
-
-
 def pre_check() -> bool:
 	return True
 
@@ -192,21 +175,6 @@ def process_frame(inputs : FaceDebuggerInputs) -> VisionFrame:
 	return target_vision_frame
 
 
-def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	target_vision_frame = read_static_image(target_path)
@@ -216,7 +184,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(source_paths, temp_frame_paths, process_frames)
@@ -1,31 +1,27 @@
-from argparse import ArgumentParser
+import os
 from functools import lru_cache
 from typing import List, Tuple
 
 import numpy
 
 import weyfusion.choices
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, wording
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, wording
 from weyfusion.common_helper import get_first
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.execution import has_execution_provider
-from weyfusion.face_analyser import get_average_face, get_many_faces, get_one_face
+from weyfusion.face_analyser import get_many_faces, get_one_face
 from weyfusion.face_helper import paste_back, warp_face_by_face_landmark_5
 from weyfusion.face_masker import create_occlusion_mask, create_region_mask, create_static_box_mask
-from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces, sort_faces_by_order
+from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces
 from weyfusion.face_store import get_reference_faces
 from weyfusion.filesystem import filter_image_paths, has_image, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
+from weyfusion.inference_batcher import run_inference
 from weyfusion.model_helper import get_static_model_initializer, generate_model_file
-from weyfusion.processors import choices as processors_choices
 from weyfusion.processors.pixel_boost import explode_pixel_boost, implode_pixel_boost
 from weyfusion.processors.typing import FaceSwapperInputs
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import conditional_thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, DownloadScope, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import read_image, read_static_image, read_static_images, unpack_resolution, write_image
+from weyfusion.source_identity import get_source_identity_embedding, get_source_identity_face
+from weyfusion.typing import DownloadScope, Embedding, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import read_static_image, read_static_images, unpack_resolution, write_image
 
 
 @lru_cache(maxsize = None)
@@ -143,6 +139,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	face_swapper_model = state_manager.get_item('face_swapper_model')
 
@@ -151,21 +148,6 @@ def get_model_options() -> ModelOptions:
 	return create_static_model_set('full').get(face_swapper_model)
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--face-swapper-model', help = wording.get('help.face_swapper_model'), default = config.get_str_value('processors.face_swapper_model', 'inswapper_128_fp16'), choices = processors_choices.face_swapper_models)
-		known_args, _ = program.parse_known_args()
-		face_swapper_pixel_boost_choices = processors_choices.face_swapper_set.get(known_args.face_swapper_model)
-		group_processors.add_argument('--face-swapper-pixel-boost', help = wording.get('help.face_swapper_pixel_boost'), default = config.get_str_value('processors.face_swapper_pixel_boost', get_first(face_swapper_pixel_boost_choices)), choices = face_swapper_pixel_boost_choices)
-		weyfusion.jobs.job_store.register_step_keys([ 'face_swapper_model', 'face_swapper_pixel_boost' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('face_swapper_model', args.get('face_swapper_model'))
-	apply_state_item('face_swapper_pixel_boost', args.get('face_swapper_pixel_boost'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -260,8 +242,7 @@ def forward_swap_face(source_face : Face, crop_vision_frame : VisionFrame) -> Vi
 		if face_swapper_input.name == 'target':
 			face_swapper_inputs[face_swapper_input.name] = crop_vision_frame
 
-	with conditional_thread_semaphore():
-		crop_vision_frame = face_swapper.run(None, face_swapper_inputs)[0][0]
+	crop_vision_frame = run_inference(face_swapper, face_swapper_inputs)[0][0]
 
 	return crop_vision_frame
 
@@ -269,11 +250,10 @@ def forward_swap_face(source_face : Face, crop_vision_frame : VisionFrame) -> Vi
 def forward_convert_embedding(embedding : Embedding) -> Embedding:
 	embedding_converter = get_inference_pool().get('embedding_converter')
 
-	with conditional_thread_semaphore():
-		embedding = embedding_converter.run(None,
-		{
-			'input': embedding
-		})[0]
+	embedding = inference_manager.run_inference_session(embedding_converter,
+	{
+		'input': embedding
+	})[0]
 
 	return embedding
 
@@ -293,6 +273,11 @@ def prepare_source_frame(source_face : Face) -> VisionFrame:
 
 
 def prepare_source_embedding(source_face : Face) -> Embedding:
+	model_key = os.path.basename(get_model_options().get('sources').get('face_swapper').get('path'))
+	return get_source_identity_embedding(state_manager.get_item('source_paths'), source_face, model_key, create_source_embedding)
+
+
+def create_source_embedding(source_face : Face) -> Embedding:
 	model_type = get_model_options().get('type')
 
 	if model_type == 'ghost':
@@ -367,42 +352,9 @@ def process_frame(inputs : FaceSwapperInputs) -> VisionFrame:
 	return target_vision_frame
 
 
-def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(source_paths)
-	source_faces = []
-
-	for source_frame in source_frames:
-		temp_faces = get_many_faces([ source_frame ])
-		temp_faces = sort_faces_by_order(temp_faces, 'large-small')
-		if temp_faces:
-			source_faces.append(get_first(temp_faces))
-	source_face = get_average_face(source_faces)
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_face': source_face,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(source_paths)
-	source_faces = []
-
-	for source_frame in source_frames:
-		temp_faces = get_many_faces([ source_frame ])
-		temp_faces = sort_faces_by_order(temp_faces, 'large-small')
-		if temp_faces:
-			source_faces.append(get_first(temp_faces))
-	source_face = get_average_face(source_faces)
+	source_face = get_source_identity_face(source_paths)
 	target_vision_frame = read_static_image(target_path)
 	output_vision_frame = process_frame(
 	{
@@ -411,7 +363,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(source_paths, temp_frame_paths, process_frames)
@@ -1,23 +1,15 @@
-from argparse import ArgumentParser
 from functools import lru_cache
 from typing import List
 
 import cv2
 import numpy
 
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, inference_manager, logger, process_manager, state_manager, wording
-from weyfusion.common_helper import create_int_metavar
+from weyfusion import content_analyser, inference_manager, logger, state_manager, wording
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from weyfusion.processors import choices as processors_choices
 from weyfusion.processors.typing import FrameColorizerInputs
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import read_image, read_static_image, unpack_resolution, write_image
+from weyfusion.typing import DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import read_static_image, unpack_resolution, write_image
 
 
 @lru_cache(maxsize = None)
@@ -136,26 +128,12 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	frame_colorizer_model = state_manager.get_item('frame_colorizer_model')
 	return create_static_model_set('full').get(frame_colorizer_model)
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--frame-colorizer-model', help = wording.get('help.frame_colorizer_model'), default = config.get_str_value('processors.frame_colorizer_model', 'ddcolor'), choices = processors_choices.frame_colorizer_models)
-		group_processors.add_argument('--frame-colorizer-size', help = wording.get('help.frame_colorizer_size'), type = str, default = config.get_str_value('processors.frame_colorizer_size', '256x256'), choices = processors_choices.frame_colorizer_sizes)
-		group_processors.add_argument('--frame-colorizer-blend', help = wording.get('help.frame_colorizer_blend'), type = int, default = config.get_int_value('processors.frame_colorizer_blend', '100'), choices = processors_choices.frame_colorizer_blend_range, metavar = create_int_metavar(processors_choices.frame_colorizer_blend_range))
-		weyfusion.jobs.job_store.register_step_keys([ 'frame_colorizer_model', 'frame_colorizer_blend', 'frame_colorizer_size' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('frame_colorizer_model', args.get('frame_colorizer_model'))
-	apply_state_item('frame_colorizer_blend', args.get('frame_colorizer_blend'))
-	apply_state_item('frame_colorizer_size', args.get('frame_colorizer_size'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -195,11 +173,10 @@ def colorize_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 def forward(color_vision_frame : VisionFrame) -> VisionFrame:
 	frame_colorizer = get_inference_pool().get('frame_colorizer')
 
-	with thread_semaphore():
-		color_vision_frame = frame_colorizer.run(None,
-		{
-			'input': color_vision_frame
-		})[0][0]
+	color_vision_frame = inference_manager.run_inference_session(frame_colorizer,
+	{
+		'input': color_vision_frame
+	})[0][0]
 
 	return color_vision_frame
 
@@ -259,18 +236,6 @@ def process_frame(inputs : FrameColorizerInputs) -> VisionFrame:
 	return colorize_frame(target_vision_frame)
 
 
-def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	target_vision_frame = read_static_image(target_path)
 	output_vision_frame = process_frame(
@@ -278,7 +243,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(None, temp_frame_paths, process_frames)
@@ -1,24 +1,20 @@
-from argparse import ArgumentParser
+import threading
 from functools import lru_cache
 from typing import List
 
 import cv2
 import numpy
 
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, inference_manager, logger, process_manager, state_manager, wording
-from weyfusion.common_helper import create_int_metavar
+from weyfusion import content_analyser, inference_manager, logger, state_manager, wording
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.execution import has_execution_provider
 from weyfusion.filesystem import in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from weyfusion.processors import choices as processors_choices
+from weyfusion.inference_batcher import get_batch_context
 from weyfusion.processors.typing import FrameEnhancerInputs
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import conditional_thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import create_tile_frames, merge_tile_frames, read_image, read_static_image, write_image
+from weyfusion.typing import DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import create_tile_frames, merge_tile_frames, read_static_image, write_image
+
+MERGE_VISION_FRAMES : threading.local = threading.local()
 
 
 @lru_cache(maxsize = None)
@@ -394,6 +390,7 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	frame_enhancer_model = state_manager.get_item('frame_enhancer_model')
 
@@ -407,19 +404,6 @@ def get_model_options() -> ModelOptions:
 	return create_static_model_set('full').get(frame_enhancer_model)
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--frame-enhancer-model', help = wording.get('help.frame_enhancer_model'), default = config.get_str_value('processors.frame_enhancer_model', 'span_kendata_x4'), choices = processors_choices.frame_enhancer_models)
-		group_processors.add_argument('--frame-enhancer-blend', help = wording.get('help.frame_enhancer_blend'), type = int, default = config.get_int_value('processors.frame_enhancer_blend', '80'), choices = processors_choices.frame_enhancer_blend_range, metavar = create_int_metavar(processors_choices.frame_enhancer_blend_range))
-		weyfusion.jobs.job_store.register_step_keys([ 'frame_enhancer_model', 'frame_enhancer_blend' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('frame_enhancer_model', args.get('frame_enhancer_model'))
-	apply_state_item('frame_enhancer_blend', args.get('frame_enhancer_blend'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -451,27 +435,47 @@ def post_process() -> None:
 def enhance_frame(temp_vision_frame : VisionFrame) -> VisionFrame:
 	model_size = get_model_options().get('size')
 	model_scale = get_model_options().get('scale')
+	frame_enhancer_tile_batch = get_frame_enhancer_tile_batch()
 	temp_height, temp_width = temp_vision_frame.shape[:2]
 	tile_vision_frames, pad_width, pad_height = create_tile_frames(temp_vision_frame, model_size)
 
-	for index, tile_vision_frame in enumerate(tile_vision_frames):
-		tile_vision_frame = prepare_tile_frame(tile_vision_frame)
-		tile_vision_frame = forward(tile_vision_frame)
-		tile_vision_frames[index] = normalize_tile_frame(tile_vision_frame)
+	for index in range(0, len(tile_vision_frames), frame_enhancer_tile_batch):
+		tile_batch_frame = numpy.concatenate([ prepare_tile_frame(tile_vision_frame) for tile_vision_frame in tile_vision_frames[index:index + frame_enhancer_tile_batch] ])
+		tile_batch_frame = forward(tile_batch_frame)
 
-	merge_vision_frame = merge_tile_frames(tile_vision_frames, temp_width * model_scale, temp_height * model_scale, pad_width * model_scale, pad_height * model_scale, (model_size[0] * model_scale, model_size[1] * model_scale, model_size[2] * model_scale))
+		for batch_index in range(len(tile_batch_frame)):
+			tile_vision_frames[index + batch_index] = normalize_tile_frame(tile_batch_frame[batch_index:batch_index + 1])
+
+	merge_vision_frame = get_merge_vision_frame(pad_width * model_scale, pad_height * model_scale)
+	merge_vision_frame = merge_tile_frames(tile_vision_frames, temp_width * model_scale, temp_height * model_scale, merge_vision_frame, (model_size[0] * model_scale, model_size[1] * model_scale, model_size[2] * model_scale))
 	temp_vision_frame = blend_frame(temp_vision_frame, merge_vision_frame)
 	return temp_vision_frame
 
 
+def get_frame_enhancer_tile_batch() -> int:
+	frame_enhancer = get_inference_pool().get('frame_enhancer')
+
+	if get_batch_context(frame_enhancer).get('is_batchable'):
+		return state_manager.get_item('frame_enhancer_tile_batch')
+	return 1
+
+
+def get_merge_vision_frame(pad_width : int, pad_height : int) -> VisionFrame:
+	merge_vision_frame = getattr(MERGE_VISION_FRAMES, 'vision_frame', None)
+
+	if merge_vision_frame is None or merge_vision_frame.shape != (pad_height, pad_width, 3):
+		merge_vision_frame = numpy.empty((pad_height, pad_width, 3), dtype = numpy.uint8)
+		MERGE_VISION_FRAMES.vision_frame = merge_vision_frame
+	return merge_vision_frame
+
+
 def forward(tile_vision_frame : VisionFrame) -> VisionFrame:
 	frame_enhancer = get_inference_pool().get('frame_enhancer')
 
-	with conditional_thread_semaphore():
-		tile_vision_frame = frame_enhancer.run(None,
-		{
-			'input': tile_vision_frame
-		})[0]
+	tile_vision_frame = inference_manager.run_inference_session(frame_enhancer,
+	{
+		'input': tile_vision_frame
+	})[0]
 
 	return tile_vision_frame
 
@@ -505,18 +509,6 @@ def process_frame(inputs : FrameEnhancerInputs) -> VisionFrame:
 	return enhance_frame(target_vision_frame)
 
 
-def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	for queue_payload in process_manager.manage(queue_payloads):
-		target_vision_path = queue_payload['frame_path']
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	target_vision_frame = read_static_image(target_path)
 	output_vision_frame = process_frame(
@@ -524,7 +516,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	processors.multi_process_frames(None, temp_frame_paths, process_frames)
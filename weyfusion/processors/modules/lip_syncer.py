@@ -1,29 +1,21 @@
-from argparse import ArgumentParser
 from functools import lru_cache
 from typing import List
 
 import cv2
 import numpy
 
-import weyfusion.jobs.job_manager
-import weyfusion.jobs.job_store
-import weyfusion.processors.core as processors
-from weyfusion import config, content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, process_manager, state_manager, voice_extractor, wording
-from weyfusion.audio import create_empty_audio_frame, get_voice_frame, read_static_voice
-from weyfusion.common_helper import get_first
+from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, inference_manager, logger, state_manager, voice_extractor, wording
+from weyfusion.audio import create_empty_audio_frame, read_static_voice
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.face_analyser import get_many_faces, get_one_face
 from weyfusion.face_helper import create_bounding_box, paste_back, warp_face_by_bounding_box, warp_face_by_face_landmark_5
 from weyfusion.face_masker import create_mouth_mask, create_occlusion_mask, create_static_box_mask
 from weyfusion.face_selector import find_similar_faces, sort_and_filter_faces
 from weyfusion.face_store import get_reference_faces
-from weyfusion.filesystem import filter_audio_paths, has_audio, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
-from weyfusion.processors import choices as processors_choices
+from weyfusion.filesystem import has_audio, in_directory, is_image, is_video, resolve_relative_path, same_file_extension
 from weyfusion.processors.typing import LipSyncerInputs
-from weyfusion.program_helper import find_argument_group
-from weyfusion.thread_helper import conditional_thread_semaphore
-from weyfusion.typing import ApplyStateItem, Args, AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, QueuePayload, UpdateProgress, VisionFrame
-from weyfusion.vision import read_image, read_static_image, restrict_video_fps, write_image
+from weyfusion.typing import AudioFrame, DownloadScope, Face, InferencePool, ModelOptions, ModelSet, ProcessMode, VisionFrame
+from weyfusion.vision import read_static_image, write_image
 
 
 @lru_cache(maxsize = None)
@@ -82,22 +74,12 @@ def clear_inference_pool() -> None:
 	inference_manager.clear_inference_pool(__name__)
 
 
+@state_manager.cache_run_value
 def get_model_options() -> ModelOptions:
 	lip_syncer_model = state_manager.get_item('lip_syncer_model')
 	return create_static_model_set('full').get(lip_syncer_model)
 
 
-def register_args(program : ArgumentParser) -> None:
-	group_processors = find_argument_group(program, 'processors')
-	if group_processors:
-		group_processors.add_argument('--lip-syncer-model', help = wording.get('help.lip_syncer_model'), default = config.get_str_value('processors.lip_syncer_model', 'wav2lip_gan_96'), choices = processors_choices.lip_syncer_models)
-		weyfusion.jobs.job_store.register_step_keys([ 'lip_syncer_model' ])
-
-
-def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
-	apply_state_item('lip_syncer_model', args.get('lip_syncer_model'))
-
-
 def pre_check() -> bool:
 	model_hashes = get_model_options().get('hashes')
 	model_sources = get_model_options().get('sources')
@@ -168,12 +150,11 @@ def sync_lip(target_face : Face, temp_audio_frame : AudioFrame, temp_vision_fram
 def forward(temp_audio_frame : AudioFrame, close_vision_frame : VisionFrame) -> VisionFrame:
 	lip_syncer = get_inference_pool().get('lip_syncer')
 
-	with conditional_thread_semaphore():
-		close_vision_frame = lip_syncer.run(None,
-		{
-			'source': temp_audio_frame,
-			'target': close_vision_frame
-		})[0]
+	close_vision_frame = inference_manager.run_inference_session(lip_syncer,
+	{
+		'source': temp_audio_frame,
+		'target': close_vision_frame
+	})[0]
 
 	return close_vision_frame
 
@@ -228,28 +209,6 @@ def process_frame(inputs : LipSyncerInputs) -> VisionFrame:
 	return target_vision_frame
 
 
-def process_frames(source_paths : List[str], queue_payloads : List[QueuePayload], update_progress : UpdateProgress) -> None:
-	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_audio_path = get_first(filter_audio_paths(source_paths))
-	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-
-	for queue_payload in process_manager.manage(queue_payloads):
-		frame_number = queue_payload.get('frame_number')
-		target_vision_path = queue_payload.get('frame_path')
-		source_audio_frame = get_voice_frame(source_audio_path, temp_video_fps, frame_number)
-		if not numpy.any(source_audio_frame):
-			source_audio_frame = create_empty_audio_frame()
-		target_vision_frame = read_image(target_vision_path)
-		output_vision_frame = process_frame(
-		{
-			'reference_faces': reference_faces,
-			'source_audio_frame': source_audio_frame,
-			'target_vision_frame': target_vision_frame
-		})
-		write_image(target_vision_path, output_vision_frame)
-		update_progress(1)
-
-
 def process_image(source_paths : List[str], target_path : str, output_path : str) -> None:
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
 	source_audio_frame = create_empty_audio_frame()
@@ -261,11 +220,3 @@ def process_image(source_paths : List[str], target_path : str, output_path : str
 		'target_vision_frame': target_vision_frame
 	})
 	write_image(output_path, output_vision_frame)
-
-
-def process_video(source_paths : List[str], temp_frame_paths : List[str]) -> None:
-	source_audio_paths = filter_audio_paths(state_manager.get_item('source_paths'))
-	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	for source_audio_path in source_audio_paths:
-		read_static_voice(source_audio_path, temp_video_fps)
-	processors.multi_process_frames(source_paths, temp_frame_paths, process_frames)
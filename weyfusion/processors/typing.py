@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Literal, TypedDict
+from typing import Any, Dict, List, Literal, Optional, TYPE_CHECKING, TypeAlias, TypedDict
 
-from numpy._typing import NDArray
+if TYPE_CHECKING:
+	from numpy.typing import NDArray
 
 from weyfusion.typing import AppContext, AudioFrame, Face, FaceSet, VisionFrame
 
@@ -14,8 +15,15 @@ FaceSwapperModel = Literal['blendswap_256', 'ghost_1_256', 'ghost_2_256', 'ghost
 FrameColorizerModel = Literal['ddcolor', 'ddcolor_artistic', 'deoldify', 'deoldify_artistic', 'deoldify_stable']
 FrameEnhancerModel = Literal['clear_reality_x4', 'lsdir_x4', 'nomos8k_sc_x4', 'real_esrgan_x2', 'real_esrgan_x2_fp16', 'real_esrgan_x4', 'real_esrgan_x4_fp16', 'real_esrgan_x8', 'real_esrgan_x8_fp16', 'real_hatgan_x4', 'real_web_photo_x4', 'realistic_rescaler_x4', 'remacri_x4', 'siax_x4', 'span_kendata_x4', 'swin2_sr_x4', 'ultra_sharp_x4']
 LipSyncerModel = Literal['wav2lip_96', 'wav2lip_gan_96']
+FaceForward = Literal['faces', 'geometry']
 
 FaceSwapperSet = Dict[FaceSwapperModel, List[str]]
+ProcessorMetadata = TypedDict('ProcessorMetadata',
+{
+	'step_keys' : List[str],
+	'face_forward' : Optional[FaceForward]
+})
+ProcessorRegistry = Dict[str, ProcessorMetadata]
 
 AgeModifierInputs = TypedDict('AgeModifierInputs',
 {
@@ -103,6 +111,7 @@ ProcessorStateKey = Literal\
 	'frame_colorizer_blend',
 	'frame_enhancer_model',
 	'frame_enhancer_blend',
+	'frame_enhancer_tile_batch',
 	'lip_syncer_model'
 ]
 ProcessorState = TypedDict('ProcessorState',
@@ -139,19 +148,20 @@ ProcessorState = TypedDict('ProcessorState',
 	'frame_colorizer_blend' : int,
 	'frame_enhancer_model' : FrameEnhancerModel,
 	'frame_enhancer_blend' : int,
+	'frame_enhancer_tile_batch' : int,
 	'lip_syncer_model' : LipSyncerModel
 })
 ProcessorStateSet = Dict[AppContext, ProcessorState]
 
-AgeModifierDirection = NDArray[Any]
-DeepSwapperMorph = NDArray[Any]
-FaceEnhancerWeight = NDArray[Any]
+AgeModifierDirection : TypeAlias = 'NDArray[Any]'
+DeepSwapperMorph : TypeAlias = 'NDArray[Any]'
+FaceEnhancerWeight : TypeAlias = 'NDArray[Any]'
 LivePortraitPitch = float
 LivePortraitYaw = float
 LivePortraitRoll = float
-LivePortraitExpression = NDArray[Any]
-LivePortraitFeatureVolume = NDArray[Any]
-LivePortraitMotionPoints = NDArray[Any]
-LivePortraitRotation = NDArray[Any]
-LivePortraitScale = NDArray[Any]
-LivePortraitTranslation = NDArray[Any]
+LivePortraitExpression : TypeAlias = 'NDArray[Any]'
+LivePortraitFeatureVolume : TypeAlias = 'NDArray[Any]'
+LivePortraitMotionPoints : TypeAlias = 'NDArray[Any]'
+LivePortraitRotation : TypeAlias = 'NDArray[Any]'
+LivePortraitScale : TypeAlias = 'NDArray[Any]'
+LivePortraitTranslation : TypeAlias = 'NDArray[Any]'
@@ -1,13 +1,12 @@
 import tempfile
-from argparse import ArgumentParser, HelpFormatter
+from argparse import ArgumentParser, HelpFormatter, SUPPRESS
 
 import weyfusion.choices
 from weyfusion import config, metadata, state_manager, wording
 from weyfusion.common_helper import create_float_metavar, create_int_metavar, get_last
-from weyfusion.execution import get_available_execution_providers
-from weyfusion.filesystem import list_directory
+from weyfusion.filesystem import list_directory, resolve_relative_path
 from weyfusion.jobs import job_store
-from weyfusion.processors.core import get_processors_modules
+from weyfusion.processors import registry as processors_registry
 
 
 def create_help_formatter_small(prog : str) -> HelpFormatter:
@@ -43,6 +42,14 @@ def create_jobs_path_program() -> ArgumentParser:
 	return program
 
 
+def create_cache_path_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_paths = program.add_argument_group('paths')
+	group_paths.add_argument('--cache-path', help = wording.get('help.cache_path'), default = config.get_str_value('paths.cache_path', resolve_relative_path('../.caches')))
+	job_store.register_job_keys([ 'cache_path' ])
+	return program
+
+
 def create_source_paths_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
 	group_paths = program.add_argument_group('paths')
@@ -100,7 +107,8 @@ def create_face_detector_program() -> ArgumentParser:
 	group_face_detector.add_argument('--face-detector-size', help = wording.get('help.face_detector_size'), default = config.get_str_value('face_detector.face_detector_size', get_last(face_detector_size_choices)), choices = face_detector_size_choices)
 	group_face_detector.add_argument('--face-detector-angles', help = wording.get('help.face_detector_angles'), type = int, default = config.get_int_list('face_detector.face_detector_angles', '0'), choices = weyfusion.choices.face_detector_angles, nargs = '+', metavar = 'FACE_DETECTOR_ANGLES')
 	group_face_detector.add_argument('--face-detector-score', help = wording.get('help.face_detector_score'), type = float, default = config.get_float_value('face_detector.face_detector_score', '0.5'), choices = weyfusion.choices.face_detector_score_range, metavar = create_float_metavar(weyfusion.choices.face_detector_score_range))
-	job_store.register_step_keys([ 'face_detector_model', 'face_detector_angles', 'face_detector_size', 'face_detector_score' ])
+	group_face_detector.add_argument('--face-detector-interval', help = wording.get('help.face_detector_interval'), type = int, default = config.get_int_value('face_detector.face_detector_interval', '1'), choices = weyfusion.choices.face_detector_interval_range, metavar = create_int_metavar(weyfusion.choices.face_detector_interval_range))
+	job_store.register_step_keys([ 'face_detector_model', 'face_detector_angles', 'face_detector_size', 'face_detector_score', 'face_detector_interval' ])
 	return program
 
 
@@ -148,8 +156,10 @@ def create_frame_extraction_program() -> ArgumentParser:
 	group_frame_extraction.add_argument('--trim-frame-start', help = wording.get('help.trim_frame_start'), type = int, default = weyfusion.config.get_int_value('frame_extraction.trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end',	help = wording.get('help.trim_frame_end'), type = int, default = weyfusion.config.get_int_value('frame_extraction.trim_frame_end'))
 	group_frame_extraction.add_argument('--temp-frame-format', help = wording.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction.temp_frame_format', 'png'), choices = weyfusion.choices.temp_frame_formats)
+	group_frame_extraction.add_argument('--frame-extraction-mode', help = wording.get('help.frame_extraction_mode'), default = config.get_str_value('frame_extraction.frame_extraction_mode', 'disk'), choices = weyfusion.choices.frame_extraction_modes)
+	group_frame_extraction.add_argument('--video-segment-size', help = wording.get('help.video_segment_size'), type = int, default = config.get_int_value('frame_extraction.video_segment_size', '0'), choices = weyfusion.choices.video_segment_size_range, metavar = create_int_metavar(weyfusion.choices.video_segment_size_range))
 	group_frame_extraction.add_argument('--keep-temp', help = wording.get('help.keep_temp'), action = 'store_true',	default = config.get_bool_value('frame_extraction.keep_temp'))
-	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'keep_temp' ])
+	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'frame_extraction_mode', 'video_segment_size', 'keep_temp' ])
 	return program
 
 
@@ -171,12 +181,11 @@ def create_output_creation_program() -> ArgumentParser:
 
 def create_processors_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
-	available_processors = [ file.get('name') for file in list_directory('weyfusion/processors/modules') ]
+	available_processors = processors_registry.get_available_processors()
 	group_processors = program.add_argument_group('processors')
 	group_processors.add_argument('--processors', help = wording.get('help.processors').format(choices = ', '.join(available_processors)), default = config.get_str_list('processors.processors', 'face_swapper'), nargs = '+')
 	job_store.register_step_keys([ 'processors' ])
-	for processor_module in get_processors_modules(available_processors):
-		processor_module.register_args(program)
+	processors_registry.register_args(program)
 	return program
 
 
@@ -192,13 +201,22 @@ def create_uis_program() -> ArgumentParser:
 
 def create_execution_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
-	available_execution_providers = get_available_execution_providers()
 	group_execution = program.add_argument_group('execution')
-	group_execution.add_argument('--execution-device-id', help = wording.get('help.execution_device_id'), default = config.get_str_value('execution.execution_device_id', '0'))
-	group_execution.add_argument('--execution-providers', help = wording.get('help.execution_providers').format(choices = ', '.join(available_execution_providers)), default = config.get_str_list('execution.execution_providers', 'cpu'), choices = available_execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
+	group_execution.add_argument('--execution-device-id', help = SUPPRESS)
+	group_execution.add_argument('--execution-device-ids', help = wording.get('help.execution_device_ids'), default = config.get_str_list('execution.execution_device_ids', config.get_str_value('execution.execution_device_id', '0')), nargs = '+', metavar = 'EXECUTION_DEVICE_IDS')
+	group_execution.add_argument('--execution-providers', help = wording.get('help.execution_providers').format(choices = ', '.join(weyfusion.choices.execution_providers)), default = config.get_str_list('execution.execution_providers', 'cpu'), choices = weyfusion.choices.execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
 	group_execution.add_argument('--execution-thread-count', help = wording.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution.execution_thread_count', '4'), choices = weyfusion.choices.execution_thread_count_range, metavar = create_int_metavar(weyfusion.choices.execution_thread_count_range))
+	group_execution.add_argument('--execution-backend', help = wording.get('help.execution_backend'), default = config.get_str_value('execution.execution_backend', 'thread'), choices = weyfusion.choices.execution_backends)
 	group_execution.add_argument('--execution-queue-count', help = wording.get('help.execution_queue_count'), type = int, default = config.get_int_value('execution.execution_queue_count', '1'), choices = weyfusion.choices.execution_queue_count_range, metavar = create_int_metavar(weyfusion.choices.execution_queue_count_range))
-	job_store.register_job_keys([ 'execution_device_id', 'execution_providers', 'execution_thread_count', 'execution_queue_count' ])
+	group_execution.add_argument('--execution-batch-size', help = wording.get('help.execution_batch_size'), type = int, default = config.get_int_value('execution.execution_batch_size', '4'), choices = weyfusion.choices.execution_batch_size_range, metavar = create_int_metavar(weyfusion.choices.execution_batch_size_range))
+	group_execution.add_argument('--execution-batch-latency', help = wording.get('help.execution_batch_latency'), type = int, default = config.get_int_value('execution.execution_batch_latency', '0'), choices = weyfusion.choices.execution_batch_latency_range, metavar = create_int_metavar(weyfusion.choices.execution_batch_latency_range))
+	group_execution.add_argument('--execution-session-limits', help = wording.get('help.execution_session_limits'), default = config.get_str_list('execution.execution_session_limits'), nargs = '+', metavar = 'EXECUTION_SESSION_LIMITS')
+	group_execution.add_argument('--execution-intra-op-thread-count', help = wording.get('help.execution_intra_op_thread_count'), type = int, default = config.get_int_value('execution.execution_intra_op_thread_count', '0'), choices = weyfusion.choices.execution_intra_op_thread_count_range, metavar = create_int_metavar(weyfusion.choices.execution_intra_op_thread_count_range))
+	group_execution.add_argument('--execution-inter-op-thread-count', help = wording.get('help.execution_inter_op_thread_count'), type = int, default = config.get_int_value('execution.execution_inter_op_thread_count', '0'), choices = weyfusion.choices.execution_inter_op_thread_count_range, metavar = create_int_metavar(weyfusion.choices.execution_inter_op_thread_count_range))
+	group_execution.add_argument('--execution-graph-optimization', help = wording.get('help.execution_graph_optimization'), default = config.get_str_value('execution.execution_graph_optimization', 'all'), choices = weyfusion.choices.execution_graph_optimizations)
+	group_execution.add_argument('--execution-memory-arena', help = wording.get('help.execution_memory_arena'), default = config.get_str_value('execution.execution_memory_arena', 'next_power_of_two'), choices = weyfusion.choices.execution_memory_arenas)
+	group_execution.add_argument('--execution-skip-memory-pattern', help = wording.get('help.execution_skip_memory_pattern'), action = 'store_true', default = config.get_bool_value('execution.execution_skip_memory_pattern'))
+	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count', 'execution_backend', 'execution_queue_count', 'execution_batch_size', 'execution_batch_latency', 'execution_session_limits', 'execution_intra_op_thread_count', 'execution_inter_op_thread_count', 'execution_graph_optimization', 'execution_memory_arena', 'execution_skip_memory_pattern' ])
 	return program
 
 
@@ -224,7 +242,8 @@ def create_memory_program() -> ArgumentParser:
 	group_memory = program.add_argument_group('memory')
 	group_memory.add_argument('--video-memory-strategy', help = wording.get('help.video_memory_strategy'), default = config.get_str_value('memory.video_memory_strategy', 'strict'), choices = weyfusion.choices.video_memory_strategies)
 	group_memory.add_argument('--system-memory-limit', help = wording.get('help.system_memory_limit'), type = int, default = config.get_int_value('memory.system_memory_limit', '0'), choices = weyfusion.choices.system_memory_limit_range, metavar = create_int_metavar(weyfusion.choices.system_memory_limit_range))
-	job_store.register_job_keys([ 'video_memory_strategy', 'system_memory_limit' ])
+	group_memory.add_argument('--face-store-limit', help = wording.get('help.face_store_limit'), type = int, default = config.get_int_value('memory.face_store_limit', '4096'), choices = weyfusion.choices.face_store_limit_range, metavar = create_int_metavar(weyfusion.choices.face_store_limit_range))
+	job_store.register_job_keys([ 'video_memory_strategy', 'system_memory_limit', 'face_store_limit' ])
 	return program
 
 
@@ -250,6 +269,22 @@ def create_job_status_program() -> ArgumentParser:
 	return program
 
 
+def create_job_runner_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_jobs = program.add_argument_group('jobs')
+	group_jobs.add_argument('--job-step-concurrency', help = wording.get('help.job_step_concurrency'), type = int, default = config.get_int_value('jobs.job_step_concurrency', '1'), choices = weyfusion.choices.job_step_concurrency_range, metavar = create_int_metavar(weyfusion.choices.job_step_concurrency_range))
+	job_store.register_job_keys([ 'job_step_concurrency' ])
+	return program
+
+
+def create_job_worker_program() -> ArgumentParser:
+	program = ArgumentParser(add_help = False)
+	group_jobs = program.add_argument_group('jobs')
+	group_jobs.add_argument('--job-lease-timeout', help = wording.get('help.job_lease_timeout'), type = int, default = config.get_int_value('jobs.job_lease_timeout', '60'), choices = weyfusion.choices.job_lease_timeout_range, metavar = create_int_metavar(weyfusion.choices.job_lease_timeout_range))
+	job_store.register_job_keys([ 'job_lease_timeout' ])
+	return program
+
+
 def create_step_index_program() -> ArgumentParser:
 	program = ArgumentParser(add_help = False)
 	program.add_argument('step_index', help = wording.get('help.step_index'), type = int)
@@ -270,9 +305,9 @@ def create_program() -> ArgumentParser:
 	program.add_argument('-v', '--version', version = metadata.get('name') + ' ' + metadata.get('version'), action = 'version')
 	sub_program = program.add_subparsers(dest = 'command')
 	# general
-	sub_program.add_parser('run', help = wording.get('help.run'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_source_paths_program(), create_target_path_program(), create_output_path_program(), collect_step_program(), create_uis_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
-	sub_program.add_parser('headless-run', help = wording.get('help.headless_run'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_source_paths_program(), create_target_path_program(), create_output_path_program(), collect_step_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
-	sub_program.add_parser('batch-run', help = wording.get('help.batch_run'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_source_pattern_program(), create_target_pattern_program(), create_output_pattern_program(), collect_step_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('run', help = wording.get('help.run'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_source_paths_program(), create_target_path_program(), create_output_path_program(), collect_step_program(), create_uis_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('headless-run', help = wording.get('help.headless_run'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_source_paths_program(), create_target_path_program(), create_output_path_program(), collect_step_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('batch-run', help = wording.get('help.batch_run'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_source_pattern_program(), create_target_pattern_program(), create_output_pattern_program(), collect_step_program(), create_job_runner_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
 	sub_program.add_parser('force-download', help = wording.get('help.force_download'), parents = [ create_download_providers_program(), create_download_scope_program(), create_misc_program() ], formatter_class = create_help_formatter_large)
 	# job manager
 	sub_program.add_parser('job-list', help = wording.get('help.job_list'), parents = [ create_job_status_program(), create_jobs_path_program(), create_misc_program() ], formatter_class = create_help_formatter_large)
@@ -286,10 +321,11 @@ def create_program() -> ArgumentParser:
 	sub_program.add_parser('job-insert-step', help = wording.get('help.job_insert_step'), parents = [ create_job_id_program(), create_step_index_program(), create_config_path_program(), create_jobs_path_program(), create_source_paths_program(), create_target_path_program(), create_output_path_program(), collect_step_program(), create_misc_program() ], formatter_class = create_help_formatter_large)
 	sub_program.add_parser('job-remove-step', help = wording.get('help.job_remove_step'), parents = [ create_job_id_program(), create_step_index_program(), create_jobs_path_program(), create_misc_program() ], formatter_class = create_help_formatter_large)
 	# job runner
-	sub_program.add_parser('job-run', help = wording.get('help.job_run'), parents = [ create_job_id_program(), create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
-	sub_program.add_parser('job-run-all', help = wording.get('help.job_run_all'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
-	sub_program.add_parser('job-retry', help = wording.get('help.job_retry'), parents = [ create_job_id_program(), create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
-	sub_program.add_parser('job-retry-all', help = wording.get('help.job_retry_all'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('job-run', help = wording.get('help.job_run'), parents = [ create_job_id_program(), create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_job_runner_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('job-run-all', help = wording.get('help.job_run_all'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_job_runner_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('job-retry', help = wording.get('help.job_retry'), parents = [ create_job_id_program(), create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_job_runner_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('job-retry-all', help = wording.get('help.job_retry_all'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_job_runner_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
+	sub_program.add_parser('job-worker', help = wording.get('help.job_worker'), parents = [ create_config_path_program(), create_temp_path_program(), create_jobs_path_program(), create_cache_path_program(), create_job_worker_program(), collect_job_program() ], formatter_class = create_help_formatter_large)
 	return ArgumentParser(parents = [ program ], formatter_class = create_help_formatter_small, add_help = True)
 
 
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+from weyfusion import state_manager
+from weyfusion.args import collect_step_args
+from weyfusion.face_cache import create_target_fingerprint
+from weyfusion.filesystem import create_directory, is_file, remove_directory
+from weyfusion.json import read_json, write_json
+from weyfusion.temp_helper import get_temp_directory_path
+from weyfusion.typing import SegmentManifest, VideoSegment
+from weyfusion.video_index import get_keyframe_positions
+from weyfusion.vision import detect_video_fps
+
+
+def create_video_segments(target_path : str, trim_frame_start : int, trim_frame_end : int, video_segment_size : int) -> List[VideoSegment]:
+	keyframe_positions = get_keyframe_positions(target_path, detect_video_fps(target_path))
+	video_segments : List[VideoSegment] = []
+	frame_start = trim_frame_start
+
+	while frame_start < trim_frame_end:
+		frame_end = frame_start + video_segment_size
+
+		if keyframe_positions:
+			frame_end = next((keyframe_position for keyframe_position in keyframe_positions if keyframe_position >= frame_end), trim_frame_end)
+		frame_end = min(frame_end, trim_frame_end)
+		video_segments.append(
+		{
+			'frame_start': frame_start,
+			'frame_end': frame_end,
+			'is_completed': False
+		})
+		frame_start = frame_end
+	return video_segments
+
+
+def init_segment_manifest(target_path : str, video_segments : List[VideoSegment]) -> SegmentManifest:
+	segment_key = create_segment_key(target_path)
+	segment_manifest = read_segment_manifest(target_path)
+
+	if segment_manifest and segment_manifest.get('segment_key') == segment_key and [ (video_segment.get('frame_start'), video_segment.get('frame_end')) for video_segment in segment_manifest.get('segments') ] == [ (video_segment.get('frame_start'), video_segment.get('frame_end')) for video_segment in video_segments ]:
+		for index, video_segment in enumerate(segment_manifest.get('segments')):
+			video_segment['is_completed'] = video_segment.get('is_completed') and is_file(get_segment_path(target_path, index))
+		return segment_manifest
+
+	remove_directory(get_segments_directory_path(target_path))
+	create_directory(get_segments_directory_path(target_path))
+	segment_manifest =\
+	{
+		'segment_key': segment_key,
+		'segments': video_segments
+	}
+	write_segment_manifest(target_path, segment_manifest)
+	return segment_manifest
+
+
+def create_segment_key(target_path : str) -> str:
+	segment_values =\
+	{
+		'target_fingerprint': create_target_fingerprint(target_path, os.path.getsize(target_path), os.path.getmtime(target_path))
+	}
+	segment_values.update(collect_step_args([ 'output_path', 'keep_temp' ]))
+	return hashlib.sha1(json.dumps(segment_values, sort_keys = True, default = str).encode()).hexdigest()
+
+
+def read_segment_manifest(target_path : str) -> Optional[SegmentManifest]:
+	return read_json(get_segment_manifest_path(target_path)) #type:ignore[return-value]
+
+
+def write_segment_manifest(target_path : str, segment_manifest : SegmentManifest) -> bool:
+	segment_manifest_path = get_segment_manifest_path(target_path)
+
+	if write_json(segment_manifest_path + '.tmp', segment_manifest): #type:ignore[arg-type]
+		os.replace(segment_manifest_path + '.tmp', segment_manifest_path)
+		return True
+	return False
+
+
+def complete_video_segment(target_path : str, segment_manifest : SegmentManifest, index : int) -> bool:
+	segment_manifest.get('segments')[index]['is_completed'] = True
+	return write_segment_manifest(target_path, segment_manifest)
+
+
+def get_segments_directory_path(target_path : str) -> str:
+	return get_temp_directory_path(target_path) + '-segments'
+
+
+def get_segment_manifest_path(target_path : str) -> str:
+	return os.path.join(get_segments_directory_path(target_path), 'manifest.json')
+
+
+def get_segment_path(target_path : str, index : int) -> str:
+	_, target_extension = os.path.splitext(os.path.basename(target_path))
+	return os.path.join(get_segments_directory_path(target_path), str(index).zfill(4) + target_extension)
+
+
+def get_segment_paths(target_path : str, segment_manifest : SegmentManifest) -> List[str]:
+	return [ get_segment_path(target_path, index) for index, _ in enumerate(segment_manifest.get('segments')) ]
+
+
+def clear_segments_directory(target_path : str) -> bool:
+	if not state_manager.get_item('keep_temp'):
+		return remove_directory(get_segments_directory_path(target_path))
+	return True
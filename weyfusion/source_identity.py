@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy
+
+from weyfusion import state_manager
+from weyfusion.face_analyser import get_average_face, get_source_faces
+from weyfusion.face_cache import create_target_fingerprint, get_cached_source_identity, set_cached_source_identity
+from weyfusion.filesystem import filter_image_paths
+from weyfusion.typing import Embedding, Face, SourceIdentity
+
+SOURCE_IDENTITY_LOCK : threading.Lock = threading.Lock()
+SOURCE_IDENTITIES : Dict[str, SourceIdentity] = {}
+IDENTITY_KEYS : Dict[Tuple[Any, ...], str] = {}
+
+
+def get_source_identity(source_paths : List[str]) -> SourceIdentity:
+	identity_key = create_identity_key(source_paths)
+	return load_source_identity(identity_key, source_paths)
+
+
+def load_source_identity(identity_key : str, source_paths : List[str]) -> SourceIdentity:
+	with SOURCE_IDENTITY_LOCK:
+		if identity_key in SOURCE_IDENTITIES:
+			return SOURCE_IDENTITIES[identity_key]
+	source_identity = get_cached_source_identity(identity_key)
+
+	if not source_identity:
+		source_identity = create_source_identity(source_paths)
+		set_cached_source_identity(identity_key, source_identity)
+
+	with SOURCE_IDENTITY_LOCK:
+		return SOURCE_IDENTITIES.setdefault(identity_key, source_identity)
+
+
+def create_source_identity(source_paths : List[str]) -> SourceIdentity:
+	source_faces = get_source_faces(source_paths)
+	return\
+	{
+		'source_face': get_average_face(source_faces),
+		'source_embeddings': {}
+	}
+
+
+def get_source_identity_face(source_paths : List[str]) -> Optional[Face]:
+	return get_source_identity(source_paths).get('source_face')
+
+
+def get_source_identity_embedding(source_paths : List[str], source_face : Face, model_key : str, prepare_source_embedding : Callable[[Face], Embedding]) -> Embedding:
+	identity_key = create_identity_key(source_paths)
+	source_identity = load_source_identity(identity_key, source_paths)
+	source_identity_face = source_identity.get('source_face')
+
+	if not source_identity_face or not numpy.array_equal(source_identity_face.embedding, source_face.embedding):
+		return prepare_source_embedding(source_face)
+
+	with SOURCE_IDENTITY_LOCK:
+		if model_key in source_identity.get('source_embeddings'):
+			return source_identity.get('source_embeddings').get(model_key)
+	source_embedding = prepare_source_embedding(source_face)
+
+	with SOURCE_IDENTITY_LOCK:
+		if model_key not in source_identity.get('source_embeddings'):
+			source_identity['source_embeddings'][model_key] = source_embedding
+			set_cached_source_identity(identity_key, source_identity)
+		return source_identity.get('source_embeddings').get(model_key)
+
+
+def create_identity_key(source_paths : List[str]) -> str:
+	identity_values =\
+	(
+		tuple(source_paths),
+		state_manager.get_item('face_detector_model'),
+		state_manager.get_item('face_detector_size'),
+		tuple(state_manager.get_item('face_detector_angles') or []),
+		state_manager.get_item('face_detector_score'),
+		state_manager.get_item('face_landmarker_model'),
+		state_manager.get_item('face_landmarker_score')
+	)
+
+	with SOURCE_IDENTITY_LOCK:
+		if identity_values in IDENTITY_KEYS:
+			return IDENTITY_KEYS[identity_values]
+	source_fingerprints = [ create_target_fingerprint(source_path, os.path.getsize(source_path), os.path.getmtime(source_path)) for source_path in filter_image_paths(source_paths) ]
+	identity_key = hashlib.sha1(json.dumps([ source_fingerprints, *identity_values[1:] ]).encode()).hexdigest()
+
+	with SOURCE_IDENTITY_LOCK:
+		IDENTITY_KEYS[identity_values] = identity_key
+	return identity_key
+
+
+def clear_identity_keys() -> None:
+	with SOURCE_IDENTITY_LOCK:
+		IDENTITY_KEYS.clear()
+
+
+def clear_source_identities() -> None:
+	with SOURCE_IDENTITY_LOCK:
+		SOURCE_IDENTITIES.clear()
+		IDENTITY_KEYS.clear()
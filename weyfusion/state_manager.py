@@ -1,14 +1,19 @@
-from typing import Any, Union
+from contextvars import ContextVar, Token
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Optional, TypeVar, Union
 
 from weyfusion.app_context import detect_app_context
 from weyfusion.processors.typing import ProcessorState, ProcessorStateKey
-from weyfusion.typing import State, StateKey, StateSet
+from weyfusion.typing import RunConfig, State, StateKey, StateSet
 
 STATES : Union[StateSet, ProcessorState] =\
 {
 	'cli': {}, #type:ignore[typeddict-item]
 	'ui': {} #type:ignore[typeddict-item]
 }
+RUN_CONFIG : ContextVar[Optional[RunConfig]] = ContextVar('run_config', default = None)
+CachedValue = TypeVar('CachedValue')
 
 
 def get_state() -> Union[State, ProcessorState]:
@@ -22,12 +27,20 @@ def init_item(key : Union[StateKey, ProcessorStateKey], value : Any) -> None:
 
 
 def get_item(key : Union[StateKey, ProcessorStateKey]) -> Any:
+	run_config = RUN_CONFIG.get()
+
+	if run_config is not None:
+		return run_config.state.get(key)
 	return get_state().get(key) #type:ignore
 
 
 def set_item(key : Union[StateKey, ProcessorStateKey], value : Any) -> None:
 	app_context = detect_app_context()
 	STATES[app_context][key] = value #type:ignore
+	run_config = RUN_CONFIG.get()
+
+	if run_config is not None:
+		RUN_CONFIG.set(RunConfig(MappingProxyType({ **run_config.state, key: value }), {}))
 
 
 def sync_item(key : Union[StateKey, ProcessorStateKey]) -> None:
@@ -36,3 +49,35 @@ def sync_item(key : Union[StateKey, ProcessorStateKey]) -> None:
 
 def clear_item(key : Union[StateKey, ProcessorStateKey]) -> None:
 	set_item(key, None)
+
+
+def create_run_config() -> RunConfig:
+	return RunConfig(MappingProxyType(dict(get_state())), {})
+
+
+def get_run_config() -> Optional[RunConfig]:
+	return RUN_CONFIG.get()
+
+
+def set_run_config(run_config : Optional[RunConfig]) -> Token[Optional[RunConfig]]:
+	return RUN_CONFIG.set(run_config)
+
+
+def reset_run_config(token : Token[Optional[RunConfig]]) -> None:
+	RUN_CONFIG.reset(token)
+
+
+def cache_run_value(function : Callable[[], CachedValue]) -> Callable[[], CachedValue]:
+	cache_key = function.__module__ + '.' + function.__name__
+
+	@wraps(function)
+	def get_cached_value() -> CachedValue:
+		run_config = RUN_CONFIG.get()
+
+		if run_config is not None:
+			if cache_key not in run_config.cached_values:
+				run_config.cached_values[cache_key] = function()
+			return run_config.cached_values.get(cache_key)
+		return function()
+
+	return get_cached_value
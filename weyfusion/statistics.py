@@ -4,10 +4,10 @@ import numpy
 
 from weyfusion import logger, state_manager
 from weyfusion.face_store import get_face_store
-from weyfusion.typing import FaceSet
+from weyfusion.typing import StaticFaceCounts, StaticFaceSet
 
 
-def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
+def create_statistics(static_faces : StaticFaceSet, static_face_counts : StaticFaceCounts) -> Dict[str, Any]:
 	face_detector_scores = []
 	face_landmarker_scores = []
 	statistics =\
@@ -20,7 +20,10 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 		'average_face_landmarker_score': 0,
 		'total_face_landmark_5_fallbacks': 0,
 		'total_frames_with_faces': 0,
-		'total_faces': 0
+		'total_faces': 0,
+		'static_face_hits': static_face_counts.get('hits'),
+		'static_face_misses': static_face_counts.get('misses'),
+		'static_face_evictions': static_face_counts.get('evictions')
 	}
 
 	for faces in static_faces.values():
@@ -45,7 +48,7 @@ def create_statistics(static_faces : FaceSet) -> Dict[str, Any]:
 
 def conditional_log_statistics() -> None:
 	if state_manager.get_item('log_level') == 'debug':
-		statistics = create_statistics(get_face_store().get('static_faces'))
+		statistics = create_statistics(get_face_store().get('static_faces'), get_face_store().get('static_face_counts'))
 
 		for name, value in statistics.items():
 			logger.debug(str(name) + ': ' + str(value), __name__)
@@ -1,20 +1,27 @@
-from collections import namedtuple
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, TypedDict
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, TYPE_CHECKING, Tuple, TypeAlias, TypedDict
 
-import numpy
-from numpy.typing import NDArray
-from onnxruntime import InferenceSession
+if TYPE_CHECKING:
+	from concurrent.futures import Future
+	from queue import Queue
+	from types import MappingProxyType
+
+	import cv2
+	import numpy
+	from numpy.typing import NDArray
+	from onnxruntime import InferenceSession
 
 Scale = float
 Score = float
 Angle = int
 
-Detection = NDArray[Any]
-Prediction = NDArray[Any]
+Detection : TypeAlias = 'NDArray[Any]'
+Prediction : TypeAlias = 'NDArray[Any]'
 
-BoundingBox = NDArray[Any]
-FaceLandmark5 = NDArray[Any]
-FaceLandmark68 = NDArray[Any]
+BoundingBox : TypeAlias = 'NDArray[Any]'
+FaceLandmark5 : TypeAlias = 'NDArray[Any]'
+FaceLandmark68 : TypeAlias = 'NDArray[Any]'
 FaceLandmarkSet = TypedDict('FaceLandmarkSet',
 {
 	'5' : FaceLandmark5, #type:ignore[valid-type]
@@ -27,7 +34,7 @@ FaceScoreSet = TypedDict('FaceScoreSet',
 	'detector' : Score,
 	'landmarker' : Score
 })
-Embedding = NDArray[numpy.float64]
+Embedding : TypeAlias = 'NDArray[numpy.float64]'
 Gender = Literal['female', 'male']
 Age = range
 Race = Literal['white', 'black', 'latino', 'asian', 'indian', 'arabic']
@@ -44,27 +51,85 @@ Face = namedtuple('Face',
 	'race'
 ])
 FaceSet = Dict[str, List[Face]]
+StaticFaceSet = OrderedDict[str, List[Face]]
+StaticFaceCounts = TypedDict('StaticFaceCounts',
+{
+	'hits' : int,
+	'misses' : int,
+	'evictions' : int
+})
 FaceStore = TypedDict('FaceStore',
 {
-	'static_faces' : FaceSet,
-	'reference_faces' : FaceSet
+	'static_faces' : StaticFaceSet,
+	'static_face_counts' : StaticFaceCounts,
+	'reference_faces' : FaceSet,
+	'source_faces' : Dict[str, Face]
 })
 
-VisionFrame = NDArray[Any]
-Mask = NDArray[Any]
-Points = NDArray[Any]
-Distance = NDArray[Any]
-Matrix = NDArray[Any]
-Anchors = NDArray[Any]
-Translation = NDArray[Any]
+VisionFrame : TypeAlias = 'NDArray[Any]'
+Mask : TypeAlias = 'NDArray[Any]'
+Points : TypeAlias = 'NDArray[Any]'
+Distance : TypeAlias = 'NDArray[Any]'
+Matrix : TypeAlias = 'NDArray[Any]'
+Anchors : TypeAlias = 'NDArray[Any]'
+Translation : TypeAlias = 'NDArray[Any]'
+SourceIdentity = TypedDict('SourceIdentity',
+{
+	'source_face' : Optional[Face],
+	'source_embeddings' : Dict[str, Embedding]
+})
+FaceCacheContext = TypedDict('FaceCacheContext',
+{
+	'frame_number' : int,
+	'vision_frame' : VisionFrame
+})
+VideoProbe = TypedDict('VideoProbe',
+{
+	'video_fps' : float,
+	'video_frame_total' : int,
+	'video_resolution' : Tuple[int, int],
+	'video_codec' : Optional[str],
+	'video_pixel_format' : Optional[str],
+	'audio_codecs' : Optional[List[str]]
+})
+VideoSegment = TypedDict('VideoSegment',
+{
+	'frame_start' : int,
+	'frame_end' : int,
+	'is_completed' : bool
+})
+SegmentManifest = TypedDict('SegmentManifest',
+{
+	'segment_key' : str,
+	'segments' : List[VideoSegment]
+})
+VideoFrameReader = TypedDict('VideoFrameReader',
+{
+	'lock' : threading.Lock,
+	'video_path' : str,
+	'video_fps' : float,
+	'video_capture' : 'cv2.VideoCapture',
+	'frame_position' : int,
+	'frame_total' : int,
+	'keyframe_positions' : Optional[List[int]],
+	'vision_frames' : 'OrderedDict[int, VisionFrame]'
+})
+FaceTrackerAnchor = TypedDict('FaceTrackerAnchor',
+{
+	'target_path' : str,
+	'frame_number' : int,
+	'gray_frame' : VisionFrame,
+	'histogram' : 'NDArray[Any]',
+	'faces' : List[Face]
+})
 
 AudioBuffer = bytes
-Audio = NDArray[Any]
-AudioChunk = NDArray[Any]
-AudioFrame = NDArray[Any]
-Spectrogram = NDArray[Any]
-Mel = NDArray[Any]
-MelFilterBank = NDArray[Any]
+Audio : TypeAlias = 'NDArray[Any]'
+AudioChunk : TypeAlias = 'NDArray[Any]'
+AudioFrame : TypeAlias = 'NDArray[Any]'
+Spectrogram : TypeAlias = 'NDArray[Any]'
+Mel : TypeAlias = 'NDArray[Any]'
+MelFilterBank : TypeAlias = 'NDArray[Any]'
 
 Fps = float
 Duration = float
@@ -78,15 +143,26 @@ QueuePayload = TypedDict('QueuePayload',
 	'frame_number' : int,
 	'frame_path' : str
 })
+SharedFrame = TypedDict('SharedFrame',
+{
+	'name' : str,
+	'shape' : Tuple[int, ...]
+})
+FramePayload = TypedDict('FramePayload',
+{
+	'frame_number' : int,
+	'frame_path' : str,
+	'source_vision_frame' : Optional[VisionFrame],
+	'vision_frame' : VisionFrame
+})
 Args = Dict[str, Any]
 UpdateProgress = Callable[[int], None]
-ProcessFrames = Callable[[List[str], List[QueuePayload], UpdateProgress], None]
 ProcessStep = Callable[[str, int, Args], bool]
 
 Content = Dict[str, Any]
 
 WarpTemplate = Literal['arcface_112_v1', 'arcface_112_v2', 'arcface_128_v2', 'dfl_whole_face', 'ffhq_512', 'mtcnn_512', 'styleganex_384']
-WarpTemplateSet = Dict[WarpTemplate, NDArray[Any]]
+WarpTemplateSet = Dict[WarpTemplate, 'NDArray[Any]']
 ProcessMode = Literal['output', 'preview', 'stream']
 
 ErrorCode = Literal[0, 1, 2, 3, 4]
@@ -107,14 +183,19 @@ FaceMaskType = Literal['box', 'occlusion', 'region']
 FaceMaskRegion = Literal['skin', 'left-eyebrow', 'right-eyebrow', 'left-eye', 'right-eye', 'glasses', 'nose', 'mouth', 'upper-lip', 'lower-lip']
 FaceMaskRegionSet = Dict[FaceMaskRegion, int]
 TempFrameFormat = Literal['bmp', 'jpg', 'png']
+FrameExtractionMode = Literal['disk', 'stream']
 OutputAudioEncoder = Literal['aac', 'libmp3lame', 'libopus', 'libvorbis']
 OutputVideoEncoder = Literal['libx264', 'libx265', 'libvpx-vp9', 'h264_nvenc', 'hevc_nvenc', 'h264_amf', 'hevc_amf','h264_qsv', 'hevc_qsv', 'h264_videotoolbox', 'hevc_videotoolbox']
 OutputVideoPreset = Literal['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']
 
 ModelOptions = Dict[str, Any]
 ModelSet = Dict[str, ModelOptions]
-ModelInitializer = NDArray[Any]
+ModelInitializer : TypeAlias = 'NDArray[Any]'
 
+ExecutionBackend = Literal['thread', 'process']
+ExecutionSessionLimits = Dict[str, int]
+ExecutionGraphOptimization = Literal['disable', 'basic', 'extended', 'all']
+ExecutionMemoryArena = Literal['next_power_of_two', 'same_as_requested', 'disable']
 ExecutionProvider = Literal['cpu', 'coreml', 'cuda', 'directml', 'openvino', 'rocm', 'tensorrt']
 ExecutionProviderValue = Literal['CPUExecutionProvider', 'CoreMLExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider', 'OpenVINOExecutionProvider', 'ROCMExecutionProvider', 'TensorrtExecutionProvider']
 ExecutionProviderSet = Dict[ExecutionProvider, ExecutionProviderValue]
@@ -150,6 +231,7 @@ ExecutionDeviceUtilization = TypedDict('ExecutionDeviceUtilization',
 })
 ExecutionDevice = TypedDict('ExecutionDevice',
 {
+	'id' : Optional[str],
 	'driver_version' : str,
 	'framework' : ExecutionDeviceFramework,
 	'product' : ExecutionDeviceProduct,
@@ -184,8 +266,31 @@ File = TypedDict('File',
 
 AppContext = Literal['cli', 'ui']
 
-InferencePool = Dict[str, InferenceSession]
+InferencePool = Dict[str, 'InferenceSession']
 InferencePoolSet = Dict[AppContext, Dict[str, InferencePool]]
+InferenceSessionPool : TypeAlias = 'Queue[InferenceSession]'
+InferenceInputs = Dict[str, Any]
+InferenceOutputs = List[Any]
+BatchRequest = TypedDict('BatchRequest',
+{
+	'inputs' : InferenceInputs,
+	'outputs' : Optional[InferenceOutputs],
+	'exception' : Optional[Exception]
+})
+BatchContext = TypedDict('BatchContext',
+{
+	'condition' : threading.Condition,
+	'requests' : List[BatchRequest],
+	'is_batchable' : bool
+})
+InferenceTask = TypedDict('InferenceTask',
+{
+	'inference_session' : 'InferenceSession',
+	'inputs' : InferenceInputs,
+	'batch_size' : int,
+	'future' : 'Future[InferenceOutputs]'
+})
+InferenceQueue : TypeAlias = 'Queue[InferenceTask]'
 
 UiWorkflow = Literal['instant_runner', 'job_runner', 'job_manager']
 
@@ -218,6 +323,7 @@ StateKey = Literal\
 	'config_path',
 	'temp_path',
 	'jobs_path',
+	'cache_path',
 	'source_paths',
 	'target_path',
 	'output_path',
@@ -228,6 +334,7 @@ StateKey = Literal\
 	'face_detector_size',
 	'face_detector_angles',
 	'face_detector_score',
+	'face_detector_interval',
 	'face_landmarker_model',
 	'face_landmarker_score',
 	'face_selector_mode',
@@ -248,6 +355,8 @@ StateKey = Literal\
 	'trim_frame_start',
 	'trim_frame_end',
 	'temp_frame_format',
+	'frame_extraction_mode',
+	'video_segment_size',
 	'keep_temp',
 	'output_image_quality',
 	'output_image_resolution',
@@ -262,17 +371,29 @@ StateKey = Literal\
 	'open_browser',
 	'ui_layouts',
 	'ui_workflow',
-	'execution_device_id',
+	'execution_device_ids',
 	'execution_providers',
 	'execution_thread_count',
+	'execution_backend',
+	'execution_batch_size',
+	'execution_batch_latency',
+	'execution_session_limits',
+	'execution_intra_op_thread_count',
+	'execution_inter_op_thread_count',
+	'execution_graph_optimization',
+	'execution_memory_arena',
+	'execution_skip_memory_pattern',
 	'execution_queue_count',
 	'download_providers',
 	'download_scope',
 	'video_memory_strategy',
 	'system_memory_limit',
+	'face_store_limit',
 	'log_level',
 	'job_id',
 	'job_status',
+	'job_lease_timeout',
+	'job_step_concurrency',
 	'step_index'
 ]
 State = TypedDict('State',
@@ -281,6 +402,7 @@ State = TypedDict('State',
 	'config_path' : str,
 	'temp_path' : str,
 	'jobs_path' : str,
+	'cache_path' : str,
 	'source_paths' : List[str],
 	'target_path' : str,
 	'output_path' : str,
@@ -291,6 +413,7 @@ State = TypedDict('State',
 	'face_detector_size' : str,
 	'face_detector_angles' : List[Angle],
 	'face_detector_score' : Score,
+	'face_detector_interval' : int,
 	'face_landmarker_model' : FaceLandmarkerModel,
 	'face_landmarker_score' : Score,
 	'face_selector_mode' : FaceSelectorMode,
@@ -311,6 +434,8 @@ State = TypedDict('State',
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
+	'frame_extraction_mode' : FrameExtractionMode,
+	'video_segment_size' : int,
 	'keep_temp' : bool,
 	'output_image_quality' : int,
 	'output_image_resolution' : str,
@@ -325,17 +450,34 @@ State = TypedDict('State',
 	'open_browser' : bool,
 	'ui_layouts' : List[str],
 	'ui_workflow' : UiWorkflow,
-	'execution_device_id' : str,
+	'execution_device_ids' : List[str],
 	'execution_providers' : List[ExecutionProvider],
 	'execution_thread_count' : int,
+	'execution_backend' : ExecutionBackend,
+	'execution_batch_size' : int,
+	'execution_batch_latency' : int,
+	'execution_session_limits' : List[str],
+	'execution_intra_op_thread_count' : int,
+	'execution_inter_op_thread_count' : int,
+	'execution_graph_optimization' : ExecutionGraphOptimization,
+	'execution_memory_arena' : ExecutionMemoryArena,
+	'execution_skip_memory_pattern' : bool,
 	'execution_queue_count' : int,
 	'download_providers' : List[DownloadProvider],
 	'download_scope' : DownloadScope,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'system_memory_limit' : int,
+	'face_store_limit' : int,
 	'log_level' : LogLevel,
 	'job_id' : str,
 	'job_status' : JobStatus,
+	'job_lease_timeout' : int,
+	'job_step_concurrency' : int,
 	'step_index' : int
 })
 StateSet = Dict[AppContext, State]
+RunConfig = NamedTuple('RunConfig',
+[
+	('state', 'MappingProxyType[str, Any]'),
+	('cached_values', Dict[str, Any])
+])
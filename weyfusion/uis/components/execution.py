@@ -4,8 +4,8 @@ import gradio
 
 from weyfusion import content_analyser, face_classifier, face_detector, face_landmarker, face_masker, face_recognizer, state_manager, voice_extractor, wording
 from weyfusion.execution import get_available_execution_providers
-from weyfusion.filesystem import list_directory
 from weyfusion.processors.core import get_processors_modules
+from weyfusion.processors.registry import get_available_processors
 from weyfusion.typing import ExecutionProvider
 
 EXECUTION_PROVIDERS_CHECKBOX_GROUP : Optional[gradio.CheckboxGroup] = None
@@ -36,7 +36,7 @@ def update_execution_providers(execution_providers : List[ExecutionProvider]) ->
 		face_recognizer,
 		voice_extractor
 	]
-	available_processors = [ file.get('name') for file in list_directory('weyfusion/processors/modules') ]
+	available_processors = get_available_processors()
 	processor_modules = get_processors_modules(available_processors)
 
 	for module in common_modules + processor_modules:
@@ -10,15 +10,14 @@ from weyfusion.audio import create_empty_audio_frame, get_audio_frame
 from weyfusion.common_helper import get_first
 from weyfusion.content_analyser import analyse_frame
 from weyfusion.core import conditional_append_reference_faces
-from weyfusion.face_analyser import get_average_face, get_many_faces
-from weyfusion.face_selector import sort_faces_by_order
 from weyfusion.face_store import clear_reference_faces, clear_static_faces, get_reference_faces
 from weyfusion.filesystem import filter_audio_paths, is_image, is_video
 from weyfusion.processors.core import get_processors_modules
+from weyfusion.source_identity import get_source_identity_face
 from weyfusion.typing import AudioFrame, Face, FaceSet, VisionFrame
 from weyfusion.uis.core import get_ui_component, get_ui_components, register_ui_component
 from weyfusion.uis.typing import ComponentOptions
-from weyfusion.vision import count_video_frame_total, detect_frame_orientation, get_video_frame, normalize_frame_color, read_static_image, read_static_images, resize_frame_resolution
+from weyfusion.vision import count_video_frame_total, detect_frame_orientation, get_video_frame, normalize_frame_color, read_static_image, resize_frame_resolution
 
 PREVIEW_IMAGE : Optional[gradio.Image] = None
 PREVIEW_FRAME_SLIDER : Optional[gradio.Slider] = None
@@ -42,9 +41,7 @@ def render() -> None:
 	}
 	conditional_append_reference_faces()
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(state_manager.get_item('source_paths'))
-	source_faces = get_many_faces(source_frames)
-	source_face = get_average_face(source_faces)
+	source_face = get_source_identity_face(state_manager.get_item('source_paths'))
 	source_audio_path = get_first(filter_audio_paths(state_manager.get_item('source_paths')))
 	source_audio_frame = create_empty_audio_frame()
 
@@ -195,15 +192,7 @@ def update_preview_image(frame_number : int = 0) -> gradio.Image:
 		sleep(0.5)
 	conditional_append_reference_faces()
 	reference_faces = get_reference_faces() if 'reference' in state_manager.get_item('face_selector_mode') else None
-	source_frames = read_static_images(state_manager.get_item('source_paths'))
-	source_faces = []
-
-	for source_frame in source_frames:
-		temp_faces = get_many_faces([ source_frame ])
-		temp_faces = sort_faces_by_order(temp_faces, 'large-small')
-		if temp_faces:
-			source_faces.append(get_first(temp_faces))
-	source_face = get_average_face(source_faces)
+	source_face = get_source_identity_face(state_manager.get_item('source_paths'))
 	source_audio_path = get_first(filter_audio_paths(state_manager.get_item('source_paths')))
 	source_audio_frame = create_empty_audio_frame()
 
@@ -3,8 +3,8 @@ from typing import List, Optional
 import gradio
 
 from weyfusion import state_manager, wording
-from weyfusion.filesystem import list_directory
 from weyfusion.processors.core import get_processors_modules
+from weyfusion.processors.registry import get_available_processors
 from weyfusion.uis.core import register_ui_component
 
 PROCESSORS_CHECKBOX_GROUP : Optional[gradio.CheckboxGroup] = None
@@ -39,5 +39,5 @@ def update_processors(processors : List[str]) -> gradio.CheckboxGroup:
 
 
 def sort_processors(processors : List[str]) -> List[str]:
-	available_processors = [ file.get('name') for file in list_directory('weyfusion/processors/modules') ]
+	available_processors = get_available_processors()
 	return sorted(available_processors, key = lambda processor : processors.index(processor) if processor in processors else len(processors))
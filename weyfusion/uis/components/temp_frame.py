@@ -1,18 +1,23 @@
-from typing import Optional
+from typing import Optional, Tuple
 
 import gradio
 
 import weyfusion.choices
 from weyfusion import state_manager, wording
+from weyfusion.common_helper import calc_int_step
 from weyfusion.filesystem import is_video
-from weyfusion.typing import TempFrameFormat
+from weyfusion.typing import FrameExtractionMode, TempFrameFormat
 from weyfusion.uis.core import get_ui_component
 
 TEMP_FRAME_FORMAT_DROPDOWN : Optional[gradio.Dropdown] = None
+FRAME_EXTRACTION_MODE_DROPDOWN : Optional[gradio.Dropdown] = None
+VIDEO_SEGMENT_SIZE_SLIDER : Optional[gradio.Slider] = None
 
 
 def render() -> None:
 	global TEMP_FRAME_FORMAT_DROPDOWN
+	global FRAME_EXTRACTION_MODE_DROPDOWN
+	global VIDEO_SEGMENT_SIZE_SLIDER
 
 	TEMP_FRAME_FORMAT_DROPDOWN = gradio.Dropdown(
 		label = wording.get('uis.temp_frame_format_dropdown'),
@@ -20,23 +25,46 @@ def render() -> None:
 		value = state_manager.get_item('temp_frame_format'),
 		visible = is_video(state_manager.get_item('target_path'))
 	)
+	FRAME_EXTRACTION_MODE_DROPDOWN = gradio.Dropdown(
+		label = wording.get('uis.frame_extraction_mode_dropdown'),
+		choices = weyfusion.choices.frame_extraction_modes,
+		value = state_manager.get_item('frame_extraction_mode'),
+		visible = is_video(state_manager.get_item('target_path'))
+	)
+	VIDEO_SEGMENT_SIZE_SLIDER = gradio.Slider(
+		label = wording.get('uis.video_segment_size_slider'),
+		value = state_manager.get_item('video_segment_size'),
+		step = calc_int_step(weyfusion.choices.video_segment_size_range),
+		minimum = weyfusion.choices.video_segment_size_range[0],
+		maximum = weyfusion.choices.video_segment_size_range[-1],
+		visible = is_video(state_manager.get_item('target_path'))
+	)
 
 
 def listen() -> None:
 	TEMP_FRAME_FORMAT_DROPDOWN.change(update_temp_frame_format, inputs = TEMP_FRAME_FORMAT_DROPDOWN)
+	FRAME_EXTRACTION_MODE_DROPDOWN.change(update_frame_extraction_mode, inputs = FRAME_EXTRACTION_MODE_DROPDOWN)
+	VIDEO_SEGMENT_SIZE_SLIDER.release(update_video_segment_size, inputs = VIDEO_SEGMENT_SIZE_SLIDER)
 
 	target_video = get_ui_component('target_video')
 	if target_video:
 		for method in [ 'upload', 'change', 'clear' ]:
-			getattr(target_video, method)(remote_update, outputs = TEMP_FRAME_FORMAT_DROPDOWN)
+			getattr(target_video, method)(remote_update, outputs = [ TEMP_FRAME_FORMAT_DROPDOWN, FRAME_EXTRACTION_MODE_DROPDOWN, VIDEO_SEGMENT_SIZE_SLIDER ])
 
 
-def remote_update() -> gradio.Dropdown:
+def remote_update() -> Tuple[gradio.Dropdown, gradio.Dropdown, gradio.Slider]:
 	if is_video(state_manager.get_item('target_path')):
-		return gradio.Dropdown(visible = True)
-	return gradio.Dropdown(visible = False)
+		return gradio.Dropdown(visible = True), gradio.Dropdown(visible = True), gradio.Slider(visible = True)
+	return gradio.Dropdown(visible = False), gradio.Dropdown(visible = False), gradio.Slider(visible = False)
 
 
 def update_temp_frame_format(temp_frame_format : TempFrameFormat) -> None:
 	state_manager.set_item('temp_frame_format', temp_frame_format)
 
+
+def update_frame_extraction_mode(frame_extraction_mode : FrameExtractionMode) -> None:
+	state_manager.set_item('frame_extraction_mode', frame_extraction_mode)
+
+
+def update_video_segment_size(video_segment_size : float) -> None:
+	state_manager.set_item('video_segment_size', int(video_segment_size))
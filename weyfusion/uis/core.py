@@ -8,6 +8,7 @@ import gradio
 from gradio.themes import Size
 
 from weyfusion import logger, metadata, state_manager, wording
+from weyfusion.app_context import init_app_context
 from weyfusion.exit_helper import hard_exit
 from weyfusion.filesystem import resolve_relative_path
 from weyfusion.uis.typing import Component, ComponentName
@@ -70,6 +71,7 @@ def register_ui_component(component_name : ComponentName, component: Component)
 
 
 def init() -> None:
+	init_app_context('ui')
 	os.environ['GRADIO_ANALYTICS_ENABLED'] = '0'
 	os.environ['GRADIO_TEMP_DIR'] = os.path.join(state_manager.get_item('temp_path'), 'gradio')
 
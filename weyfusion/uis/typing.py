@@ -15,6 +15,7 @@ ComponentName = Literal\
 	'expression_restorer_model_dropdown',
 	'face_debugger_items_checkbox_group',
 	'face_detector_angles_checkbox_group',
+	'face_detector_interval_slider',
 	'face_detector_model_dropdown',
 	'face_detector_score_slider',
 	'face_detector_size_dropdown',
@@ -59,6 +60,7 @@ ComponentName = Literal\
 	'frame_colorizer_size_dropdown',
 	'frame_enhancer_blend_slider',
 	'frame_enhancer_model_dropdown',
+	'frame_enhancer_tile_batch_slider',
 	'job_list_job_status_checkbox_group',
 	'lip_syncer_model_dropdown',
 	'output_image',
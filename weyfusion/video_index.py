@@ -0,0 +1,59 @@
+import os
+import re
+import shutil
+import subprocess
+from typing import List, Optional
+
+from weyfusion import state_manager
+from weyfusion.json import read_json, write_json
+from weyfusion.temp_helper import get_temp_directory_path
+from weyfusion.typing import Fps
+
+
+def get_keyframe_positions(video_path : str, video_fps : Fps) -> List[int]:
+	keyframe_index_path = get_keyframe_index_path(video_path)
+	video_size = os.path.getsize(video_path)
+	video_mtime = os.path.getmtime(video_path)
+
+	if keyframe_index_path:
+		keyframe_index = read_json(keyframe_index_path)
+		if keyframe_index and keyframe_index.get('video_size') == video_size and keyframe_index.get('video_mtime') == video_mtime:
+			return keyframe_index.get('keyframe_positions')
+
+	keyframe_positions = detect_keyframe_positions(video_path, video_fps)
+
+	if keyframe_index_path and keyframe_positions:
+		keyframe_index =\
+		{
+			'video_size': video_size,
+			'video_mtime': video_mtime,
+			'keyframe_positions': keyframe_positions
+		}
+		os.makedirs(os.path.dirname(keyframe_index_path), exist_ok = True)
+		write_json(keyframe_index_path, keyframe_index)
+	return keyframe_positions
+
+
+def get_keyframe_index_path(video_path : str) -> Optional[str]:
+	if state_manager.get_item('temp_path'):
+		return get_temp_directory_path(video_path) + '-keyframes.json'
+	return None
+
+
+def run_keyframe_probe(video_path : str) -> subprocess.Popen[bytes]:
+	commands = [ shutil.which('ffmpeg'), '-hide_banner', '-nostats', '-skip_frame', 'nokey', '-i', video_path, '-map', '0:v:0', '-vf', 'showinfo', '-f', 'null', '-' ]
+	return subprocess.Popen(commands, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE)
+
+
+def detect_keyframe_positions(video_path : str, video_fps : Fps) -> List[int]:
+	keyframe_positions : List[int] = []
+
+	if shutil.which('ffmpeg') and video_fps:
+		_, stderr = run_keyframe_probe(video_path).communicate()
+		keyframe_times = [ float(keyframe_time) for keyframe_time in re.findall(r'pts_time:\s*(-?[0-9.]+).*?iskey:1', stderr.decode(errors = 'ignore')) ]
+
+		for keyframe_time in keyframe_times:
+			keyframe_position = round((keyframe_time - keyframe_times[0]) * video_fps)
+			if keyframe_position not in keyframe_positions:
+				keyframe_positions.append(keyframe_position)
+	return sorted(keyframe_positions)
@@ -1,3 +1,7 @@
+import bisect
+import os
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from typing import List, Optional, Tuple
 
@@ -6,9 +10,16 @@ import numpy
 from cv2.typing import Size
 
 import weyfusion.choices
-from weyfusion.common_helper import is_windows
+from weyfusion.common_helper import get_first, is_windows
+from weyfusion.ffprobe import probe_media
 from weyfusion.filesystem import is_image, is_video, sanitize_path_for_windows
-from weyfusion.typing import Duration, Fps, Orientation, Resolution, VisionFrame
+from weyfusion.typing import Content, Duration, Fps, Orientation, Resolution, VideoFrameReader, VideoProbe, VisionFrame
+from weyfusion.video_index import get_keyframe_positions
+
+VIDEO_FRAME_READER_LOCK : threading.Lock = threading.Lock()
+VIDEO_FRAME_READERS : 'OrderedDict[str, VideoFrameReader]' = OrderedDict()
+VIDEO_FRAME_READER_LIMIT = 32
+VIDEO_FRAME_READER_TOTAL = 4
 
 
 @lru_cache(maxsize = 128)
@@ -73,41 +84,192 @@ def create_image_resolutions(resolution : Resolution) -> List[str]:
 
 
 def get_video_frame(video_path : str, frame_number : int = 0) -> Optional[VisionFrame]:
+	vision_frame = read_video_frame(video_path, frame_number)
+
+	if vision_frame is not None:
+		return vision_frame.copy()
+	return None
+
+
+def read_video_frame(video_path : str, frame_number : int = 0) -> Optional[VisionFrame]:
+	video_frame_reader = get_video_frame_reader(video_path)
+
+	if video_frame_reader:
+		frame_position = max(min(video_frame_reader.get('frame_total'), frame_number - 1), 0)
+
+		if video_frame_reader.get('keyframe_positions') is None and not video_frame_reader.get('frame_position') <= frame_position < video_frame_reader.get('frame_position') + VIDEO_FRAME_READER_LIMIT:
+			video_frame_reader['keyframe_positions'] = get_keyframe_positions(video_frame_reader.get('video_path'), video_frame_reader.get('video_fps'))
+
+		with video_frame_reader.get('lock'):
+			video_capture = video_frame_reader.get('video_capture')
+			vision_frames = video_frame_reader.get('vision_frames')
+
+			if frame_position in vision_frames:
+				vision_frames.move_to_end(frame_position)
+				return vision_frames.get(frame_position)
+			if not video_frame_reader.get('frame_position') <= frame_position < video_frame_reader.get('frame_position') + VIDEO_FRAME_READER_LIMIT:
+				keyframe_position = find_keyframe_position(video_frame_reader.get('keyframe_positions') or [], frame_position)
+
+				if not keyframe_position <= video_frame_reader.get('frame_position') <= frame_position:
+					seek_position = max(keyframe_position, frame_position - VIDEO_FRAME_READER_LIMIT // 2)
+					video_capture.set(cv2.CAP_PROP_POS_FRAMES, seek_position)
+					video_frame_reader['frame_position'] = seek_position
+
+			while video_frame_reader.get('frame_position') <= frame_position:
+				has_vision_frame, vision_frame = video_capture.read()
+				if not has_vision_frame:
+					return None
+				vision_frames[video_frame_reader.get('frame_position')] = vision_frame
+				video_frame_reader['frame_position'] += 1
+
+				while len(vision_frames) > VIDEO_FRAME_READER_LIMIT:
+					vision_frames.popitem(last = False)
+			return vision_frames.get(frame_position)
+	return None
+
+
+def find_keyframe_position(keyframe_positions : List[int], frame_position : int) -> int:
+	keyframe_index = bisect.bisect_right(keyframe_positions, frame_position)
+
+	if keyframe_index > 0:
+		return keyframe_positions[keyframe_index - 1]
+	return frame_position
+
+
+def get_video_frame_reader(video_path : str) -> Optional[VideoFrameReader]:
 	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			frame_total = video_capture.get(cv2.CAP_PROP_FRAME_COUNT)
-			video_capture.set(cv2.CAP_PROP_POS_FRAMES, min(frame_total, frame_number - 1))
-			has_vision_frame, vision_frame = video_capture.read()
-			video_capture.release()
-			if has_vision_frame:
-				return vision_frame
+		with VIDEO_FRAME_READER_LOCK:
+			if video_path not in VIDEO_FRAME_READERS:
+				video_capture = cv2.VideoCapture(sanitize_path_for_windows(video_path) if is_windows() else video_path)
+				if not video_capture.isOpened():
+					return None
+				VIDEO_FRAME_READERS[video_path] =\
+				{
+					'lock': threading.Lock(),
+					'video_path': video_path,
+					'video_fps': video_capture.get(cv2.CAP_PROP_FPS),
+					'video_capture': video_capture,
+					'frame_position': 0,
+					'frame_total': int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+					'keyframe_positions': None,
+					'vision_frames': OrderedDict()
+				}
+			VIDEO_FRAME_READERS.move_to_end(video_path)
+
+			while len(VIDEO_FRAME_READERS) > VIDEO_FRAME_READER_TOTAL:
+				_, video_frame_reader = VIDEO_FRAME_READERS.popitem(last = False)
+				release_video_frame_reader(video_frame_reader)
+			return VIDEO_FRAME_READERS.get(video_path)
 	return None
 
 
-def count_video_frame_total(video_path : str) -> int:
+def release_video_frame_reader(video_frame_reader : VideoFrameReader) -> None:
+	with video_frame_reader.get('lock'):
+		video_frame_reader.get('video_capture').release()
+		video_frame_reader.get('vision_frames').clear()
+
+
+def clear_video_frame_readers() -> None:
+	with VIDEO_FRAME_READER_LOCK:
+		for video_frame_reader in VIDEO_FRAME_READERS.values():
+			release_video_frame_reader(video_frame_reader)
+		VIDEO_FRAME_READERS.clear()
+
+
+def probe_video(video_path : str) -> Optional[VideoProbe]:
 	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			video_frame_total = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-			video_capture.release()
-			return video_frame_total
+		return probe_static_video(video_path, os.path.getsize(video_path), os.path.getmtime(video_path))
+	return None
+
+
+@lru_cache(maxsize = 128)
+def probe_static_video(video_path : str, video_size : int, video_mtime : float) -> Optional[VideoProbe]:
+	return probe_video_streams(video_path) or probe_video_capture(video_path)
+
+
+def probe_video_streams(video_path : str) -> Optional[VideoProbe]:
+	media_probe = probe_media(video_path)
+
+	if media_probe:
+		media_streams = media_probe.get('streams', [])
+		video_stream = get_first([ media_stream for media_stream in media_streams if media_stream.get('codec_type') == 'video' ])
+
+		if video_stream:
+			video_fps = parse_frame_rate(video_stream.get('avg_frame_rate')) or parse_frame_rate(video_stream.get('r_frame_rate'))
+			video_duration = float(video_stream.get('duration') or media_probe.get('format', {}).get('duration') or 0)
+			video_frame_total = int(video_stream.get('nb_frames') or round(video_duration * video_fps))
+			video_resolution = int(video_stream.get('width')), int(video_stream.get('height'))
+
+			if abs(detect_stream_rotation(video_stream)) in [ 90, 270 ]:
+				video_resolution = video_resolution[::-1]
+			return\
+			{
+				'video_fps': video_fps,
+				'video_frame_total': video_frame_total,
+				'video_resolution': video_resolution,
+				'video_codec': video_stream.get('codec_name'),
+				'video_pixel_format': video_stream.get('pix_fmt'),
+				'audio_codecs': [ media_stream.get('codec_name') for media_stream in media_streams if media_stream.get('codec_type') == 'audio' ]
+			}
+	return None
+
+
+def probe_video_capture(video_path : str) -> Optional[VideoProbe]:
+	if is_windows():
+		video_path = sanitize_path_for_windows(video_path)
+	video_capture = cv2.VideoCapture(video_path)
+
+	if video_capture.isOpened():
+		video_probe : VideoProbe =\
+		{
+			'video_fps': video_capture.get(cv2.CAP_PROP_FPS),
+			'video_frame_total': int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT)),
+			'video_resolution': (int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+			'video_codec': decode_fourcc(video_capture.get(cv2.CAP_PROP_FOURCC)),
+			'video_pixel_format': decode_fourcc(video_capture.get(cv2.CAP_PROP_CODEC_PIXEL_FORMAT)),
+			'audio_codecs': None
+		}
+		video_capture.release()
+		return video_probe
+	return None
+
+
+def parse_frame_rate(frame_rate : Optional[str]) -> float:
+	if frame_rate:
+		numerator, _, denominator = frame_rate.partition('/')
+		if float(denominator or 1):
+			return float(numerator) / float(denominator or 1)
+	return 0.0
+
+
+def detect_stream_rotation(video_stream : Content) -> int:
+	for side_data in video_stream.get('side_data_list', []):
+		if 'rotation' in side_data:
+			return int(side_data.get('rotation'))
+	return int(video_stream.get('tags', {}).get('rotate', 0))
+
+
+def decode_fourcc(fourcc : float) -> Optional[str]:
+	fourcc_code = ''.join(chr((int(fourcc) >> 8 * index) & 0xFF) for index in range(4)).strip('\x00 ')
+
+	if fourcc_code.isprintable() and fourcc_code:
+		return fourcc_code
+	return None
+
+
+def count_video_frame_total(video_path : str) -> int:
+	video_probe = probe_video(video_path)
+
+	if video_probe:
+		return video_probe.get('video_frame_total')
 	return 0
 
 
 def detect_video_fps(video_path : str) -> Optional[float]:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			video_fps = video_capture.get(cv2.CAP_PROP_FPS)
-			video_capture.release()
-			return video_fps
+	video_probe = probe_video(video_path)
+
+	if video_probe:
+		return video_probe.get('video_fps')
 	return None
 
 
@@ -153,15 +315,10 @@ def restrict_trim_frame(video_path : str, trim_frame_start : Optional[int], trim
 
 
 def detect_video_resolution(video_path : str) -> Optional[Resolution]:
-	if is_video(video_path):
-		if is_windows():
-			video_path = sanitize_path_for_windows(video_path)
-		video_capture = cv2.VideoCapture(video_path)
-		if video_capture.isOpened():
-			width = video_capture.get(cv2.CAP_PROP_FRAME_WIDTH)
-			height = video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
-			video_capture.release()
-			return int(width), int(height)
+	video_probe = probe_video(video_path)
+
+	if video_probe:
+		return video_probe.get('video_resolution')
 	return None
 
 
@@ -292,8 +449,8 @@ def create_tile_frames(vision_frame : VisionFrame, size : Size) -> Tuple[List[Vi
 	return tile_vision_frames, pad_width, pad_height
 
 
-def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int, temp_height : int, pad_width : int, pad_height : int, size : Size) -> VisionFrame:
-	merge_vision_frame = numpy.zeros((pad_height, pad_width, 3)).astype(numpy.uint8)
+def merge_tile_frames(tile_vision_frames : List[VisionFrame], temp_width : int, temp_height : int, merge_vision_frame : VisionFrame, size : Size) -> VisionFrame:
+	pad_width = merge_vision_frame.shape[1]
 	tile_width = tile_vision_frames[0].shape[1] - 2 * size[2]
 	tiles_per_row = min(pad_width // tile_width, len(tile_vision_frames))
 
@@ -7,7 +7,6 @@ import scipy
 from weyfusion import inference_manager
 from weyfusion.download import conditional_download_hashes, conditional_download_sources, resolve_download_url
 from weyfusion.filesystem import resolve_relative_path
-from weyfusion.thread_helper import thread_semaphore
 from weyfusion.typing import Audio, AudioChunk, DownloadScope, InferencePool, ModelOptions, ModelSet
 
 
@@ -85,11 +84,10 @@ def extract_voice(temp_audio_chunk : AudioChunk) -> AudioChunk:
 def forward(temp_audio_chunk : AudioChunk) -> AudioChunk:
 	voice_extractor = get_inference_pool().get('voice_extractor')
 
-	with thread_semaphore():
-		temp_audio_chunk = voice_extractor.run(None,
-		{
-			'input': temp_audio_chunk
-		})[0]
+	temp_audio_chunk = inference_manager.run_inference_session(voice_extractor,
+	{
+		'input': temp_audio_chunk
+	})[0]
 
 	return temp_audio_chunk
 
@@ -6,10 +6,14 @@ WORDING : Dict[str, Any] =\
 	'python_not_supported': 'Python version is not supported, upgrade to {version} or higher',
 	'curl_not_installed': 'CURL is not installed',
 	'ffmpeg_not_installed': 'FFMpeg is not installed',
+	'execution_provider_not_available': 'Execution provider {execution_provider} is not available',
 	'creating_temp': 'Creating temporary resources',
 	'extracting_frames': 'Extracting frames with a resolution of {resolution} and {fps} frames per second',
 	'extracting_frames_succeed': 'Extracting frames succeed',
 	'extracting_frames_failed': 'Extracting frames failed',
+	'streaming_video': 'Streaming video with a resolution of {resolution} and {fps} frames per second',
+	'streaming_video_succeed': 'Streaming video succeed',
+	'streaming_video_failed': 'Streaming video failed',
 	'analysing': 'Analysing',
 	'extracting': 'Extracting',
 	'streaming': 'Streaming',
@@ -26,6 +30,11 @@ WORDING : Dict[str, Any] =\
 	'merging_video': 'Merging video with a resolution of {resolution} and {fps} frames per second',
 	'merging_video_succeed': 'Merging video succeed',
 	'merging_video_failed': 'Merging video failed',
+	'processing_segment': 'Processing segment {index} of {total} from frame {frame_start} to {frame_end}',
+	'skipping_segment': 'Skipping segment {index} of {total} as it is already completed',
+	'concating_segments': 'Concating {total} video segments',
+	'concating_segments_succeed': 'Concating video segments succeed',
+	'concating_segments_failed': 'Concating video segments failed',
 	'skipping_audio': 'Skipping audio',
 	'replacing_audio_succeed': 'Replacing audio succeed',
 	'replacing_audio_skipped': 'Replacing audio skipped',
@@ -76,6 +85,7 @@ WORDING : Dict[str, Any] =\
 	'processing_jobs_succeed': 'Processing of all job succeed',
 	'processing_job_failed': 'Processing of job {job_id} failed',
 	'processing_jobs_failed': 'Processing of all jobs failed',
+	'running_job_worker': 'Running queued jobs as worker {worker_id}',
 	'processing_step': 'Processing step {step_current} of {step_total}',
 	'validating_hash_succeed': 'Validating hash for {hash_file_name} succeed',
 	'validating_hash_failed': 'Validating hash for {hash_file_name} failed',
@@ -100,6 +110,7 @@ WORDING : Dict[str, Any] =\
 		'config_path': 'choose the config file to override defaults',
 		'temp_path': 'specify the directory for the temporary resources',
 		'jobs_path': 'specify the directory to store jobs',
+		'cache_path': 'specify the directory to cache the face analysis',
 		'source_paths': 'choose the image or audio paths',
 		'target_path': 'choose the image or video path',
 		'output_path': 'specify the image or video within a directory',
@@ -112,6 +123,7 @@ WORDING : Dict[str, Any] =\
 		'face_detector_size': 'specify the frame size provided to the face detector',
 		'face_detector_angles': 'specify the angles to rotate the frame before detecting faces',
 		'face_detector_score': 'filter the detected faces base on the confidence score',
+		'face_detector_interval': 'run the face detector every nth video frame and track the faces in between',
 		# face landmarker
 		'face_landmarker_model': 'choose the model responsible for detecting the face landmarks',
 		'face_landmarker_score': 'filter the detected face landmarks base on the confidence score',
@@ -136,6 +148,8 @@ WORDING : Dict[str, Any] =\
 		'trim_frame_start': 'specify the starting frame of the target video',
 		'trim_frame_end': 'specify the ending frame of the target video',
 		'temp_frame_format': 'specify the temporary resources format',
+		'frame_extraction_mode': 'extract the frames to disk or stream them through the processors in memory',
+		'video_segment_size': 'process the video in resumable segments of roughly this amount of frames (0 = disabled)',
 		'keep_temp': 'keep the temporary resources after processing',
 		# output creation
 		'output_image_quality': 'specify the image quality which translates to the compression factor',
@@ -181,22 +195,33 @@ WORDING : Dict[str, Any] =\
 		'frame_colorizer_blend': 'blend the colorized into the previous frame',
 		'frame_enhancer_model': 'choose the model responsible for enhancing the frame',
 		'frame_enhancer_blend': 'blend the enhanced into the previous frame',
+		'frame_enhancer_tile_batch': 'specify the amount of tiles that are enhanced in one batch',
 		'lip_syncer_model': 'choose the model responsible for syncing the lips',
 		# uis
 		'open_browser': 'open the browser once the program is ready',
 		'ui_layouts': 'launch a single or multiple UI layouts (choices: {choices}, ...)',
 		'ui_workflow': 'choose the ui workflow',
 		# execution
-		'execution_device_id': 'specify the device used for processing',
+		'execution_device_ids': 'specify the devices used for processing (e.g. 0 1 2 3)',
 		'execution_providers': 'inference using different providers (choices: {choices}, ...)',
 		'execution_thread_count': 'specify the amount of parallel threads while processing',
-		'execution_queue_count': 'specify the amount of frames each thread is processing',
+		'execution_backend': 'run the processors in parallel threads or in separate worker processes',
+		'execution_queue_count': 'specify the amount of frames per thread buffered in the read and write stage queues',
+		'execution_batch_size': 'specify the maximum amount of faces that are inferred in one batch',
+		'execution_batch_latency': 'specify the milliseconds to wait for a batch to fill up (0 = batch only the queued requests)',
+		'execution_session_limits': 'specify the amount of inference sessions per model that run in parallel (e.g. face_detector:2 face_swapper:4)',
+		'execution_intra_op_thread_count': 'specify the amount of threads each inference session uses within an operator (0 = auto)',
+		'execution_inter_op_thread_count': 'specify the amount of threads each inference session uses across operators (0 = auto)',
+		'execution_graph_optimization': 'choose the graph optimization level of the inference sessions',
+		'execution_memory_arena': 'choose how the memory arena of the inference sessions grows',
+		'execution_skip_memory_pattern': 'omit the memory pattern planning of the inference sessions',
 		# download
 		'download_providers': 'download using different providers (choices: {choices}, ...)',
 		'download_scope': 'specify the download scope',
 		# memory
 		'video_memory_strategy': 'balance fast processing and low VRAM usage',
 		'system_memory_limit': 'limit the available RAM that can be used while processing',
+		'face_store_limit': 'limit the amount of frames whose analysed faces are kept in memory',
 		# misc
 		'log_level': 'adjust the message severity displayed in the terminal',
 		# run
@@ -208,6 +233,8 @@ WORDING : Dict[str, Any] =\
 		'job_id': 'specify the job id',
 		'job_status': 'specify the job status',
 		'step_index': 'specify the step index',
+		'job_step_concurrency': 'specify the amount of independent job steps to process in parallel',
+		'job_lease_timeout': 'specify the seconds after which a lease of an unresponsive job worker expires',
 		# job manager
 		'job_list': 'list jobs by status',
 		'job_create': 'create a drafted job',
@@ -223,7 +250,8 @@ WORDING : Dict[str, Any] =\
 		'job_run': 'run a queued job',
 		'job_run_all': 'run all queued jobs',
 		'job_retry': 'retry a failed job',
-		'job_retry_all': 'retry all failed jobs'
+		'job_retry_all': 'retry all failed jobs',
+		'job_worker': 'run queued jobs as one of many workers sharing the jobs path'
 	},
 	'about':
 	{
@@ -250,6 +278,7 @@ WORDING : Dict[str, Any] =\
 		'expression_restorer_model_dropdown': 'EXPRESSION RESTORER MODEL',
 		'face_debugger_items_checkbox_group': 'FACE DEBUGGER ITEMS',
 		'face_detector_angles_checkbox_group': 'FACE DETECTOR ANGLES',
+		'face_detector_interval_slider': 'FACE DETECTOR INTERVAL',
 		'face_detector_model_dropdown': 'FACE DETECTOR MODEL',
 		'face_detector_score_slider': 'FACE DETECTOR SCORE',
 		'face_detector_size_dropdown': 'FACE DETECTOR SIZE',
@@ -294,6 +323,7 @@ WORDING : Dict[str, Any] =\
 		'frame_colorizer_size_dropdown': 'FRAME COLORIZER SIZE',
 		'frame_enhancer_blend_slider': 'FRAME ENHANCER BLEND',
 		'frame_enhancer_model_dropdown': 'FRAME ENHANCER MODEL',
+		'frame_enhancer_tile_batch_slider': 'FRAME ENHANCER TILE BATCH',
 		'job_list_status_checkbox_group': 'JOB STATUS',
 		'job_manager_job_action_dropdown': 'JOB_ACTION',
 		'job_manager_job_id_dropdown': 'JOB ID',
@@ -324,6 +354,8 @@ WORDING : Dict[str, Any] =\
 		'system_memory_limit_slider': 'SYSTEM MEMORY LIMIT',
 		'target_file': 'TARGET',
 		'temp_frame_format_dropdown': 'TEMP FRAME FORMAT',
+		'frame_extraction_mode_dropdown': 'FRAME EXTRACTION MODE',
+		'video_segment_size_slider': 'VIDEO SEGMENT SIZE',
 		'terminal_textbox': 'TERMINAL',
 		'trim_frame_slider': 'TRIM FRAME',
 		'ui_workflow': 'UI WORKFLOW',